@@ -1,6 +1,17 @@
 from app.api.routers.categories import router as category_router
+from app.api.routers.files import router as files_router
+from app.api.routers.health import router as health_router
+from app.api.routers.metrics import router as metrics_router
 from app.api.routers.products import router as product_router
 from app.api.routers.reviews import router as review_router
 from app.api.routers.users import router as user_router
 
-__all__ = ["category_router", "product_router", "review_router", "user_router"]
+__all__ = [
+    "category_router",
+    "files_router",
+    "health_router",
+    "metrics_router",
+    "product_router",
+    "review_router",
+    "user_router",
+]
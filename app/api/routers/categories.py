@@ -1,28 +1,74 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends, status, Path
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, Request, Response, status, Path, Query
 from pydantic import Field
-from app.schemas.categories import CategoryCreate, Category
+from app.schemas.categories import (
+    CategoryCreate,
+    CategoryUpdate,
+    Category,
+    CategoryBatch,
+)
 
-from app.core.dependencies.services import get_category_service
+from app.core.dependencies.services import (
+    get_category_read_service,
+    get_category_service,
+)
 from app.services.categories import CategoryService
+from app.core.responses import (
+    JSONBytesResponse,
+    cached_json_response,
+    version_etag,
+)
+from app.core.dependencies.preconditions import get_expected_version
+from app.core.rate_limit import catalog_rate_limit
 
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
+MAX_BATCH_IDS = 100
 
-@router.get("/", response_model=list[Category], status_code=status.HTTP_200_OK)
+
+@router.get(
+    "/",
+    response_model=list[Category],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(catalog_rate_limit)],
+)
 async def get_categories(
-    category_service: Annotated[CategoryService, Depends(get_category_service)],
-) -> list[Category]:
-    return await category_service.get_all_categories()
+    request: Request,
+    category_service: Annotated[CategoryService, Depends(get_category_read_service)],
+) -> Response:
+    return cached_json_response(request, await category_service.get_all_categories())
+
+
+@router.get(
+    "/batch",
+    response_model=CategoryBatch,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(catalog_rate_limit)],
+)
+async def get_categories_batch(
+    ids: Annotated[list[int], Query(min_length=1, max_length=MAX_BATCH_IDS)],
+    category_service: Annotated[CategoryService, Depends(get_category_read_service)],
+) -> JSONBytesResponse:
+    """Возвращает до 100 категорий по списку ID (?ids=1&ids=2) одним запросом к БД."""
+    return JSONBytesResponse(await category_service.get_categories_batch(ids))
 
 
-@router.get("/{category_id}", response_model=Category, status_code=status.HTTP_200_OK)
+@router.get(
+    "/{category_id}",
+    response_model=Category,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(catalog_rate_limit)],
+)
 async def get_category(
+    request: Request,
     category_id: Annotated[int, Path(ge=1)],
-    category_service: Annotated[CategoryService, Depends(get_category_service)],
-) -> Category:
-    return await category_service.get_category_by_id(category_id=category_id)
+    category_service: Annotated[CategoryService, Depends(get_category_read_service)],
+) -> Response:
+    category = await category_service.get_category_by_id(category_id=category_id)
+    return cached_json_response(
+        request, category, etag=version_etag(category["version"])
+    )
 
 
 @router.post("/", response_model=Category, status_code=status.HTTP_201_CREATED)
@@ -38,10 +84,31 @@ async def update_category(
     category_id: Annotated[int, Path(ge=1)],
     category: Annotated[CategoryCreate, Field(description="Update category data")],
     category_service: Annotated[CategoryService, Depends(get_category_service)],
+    expected_version: Annotated[Optional[int], Depends(get_expected_version)],
+    response: Response,
+) -> Category:
+    """Обновляет категорию; с If-Match - только в указанной версии, иначе 412."""
+    category_db = await category_service.update_category(
+        category_id=category_id, category=category, expected_version=expected_version
+    )
+    response.headers["ETag"] = version_etag(category_db["version"])
+    return category_db
+
+
+@router.patch("/{category_id}", response_model=Category, status_code=status.HTTP_200_OK)
+async def patch_category(
+    category_id: Annotated[int, Path(ge=1)],
+    category: Annotated[CategoryUpdate, Field(description="Changed category fields")],
+    category_service: Annotated[CategoryService, Depends(get_category_service)],
+    expected_version: Annotated[Optional[int], Depends(get_expected_version)],
+    response: Response,
 ) -> Category:
-    return await category_service.update_category(
-        category_id=category_id, category=category
+    """Частичное обновление: UPDATE пишет только переданные поля."""
+    category_db = await category_service.patch_category(
+        category_id=category_id, category=category, expected_version=expected_version
     )
+    response.headers["ETag"] = version_etag(category_db["version"])
+    return category_db
 
 
 @router.delete("/{category_id}", status_code=status.HTTP_200_OK)
@@ -0,0 +1,105 @@
+# pylint:disable=broad-exception-caught
+import os
+from typing import Annotated
+import aiofiles
+
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status, Path
+from fastapi.responses import FileResponse
+from app.core.config import settings
+from app.core.files import get_file_response
+from app.core.rate_limit import upload_rate_limit
+
+
+router = APIRouter(tags=["files"])
+
+FILES_DIRECTORY = "app/files"
+AVATARS_DIRECTORY = os.path.join(FILES_DIRECTORY, "avatars")
+
+
+@router.post("/uploadfile_async_save", dependencies=[Depends(upload_rate_limit)])
+async def create_upload_file_async_save(files: list[UploadFile] = File(...)):
+
+    response_info = []
+
+    for file in files:
+
+        filename_lower = file.filename.lower()
+        file_ext = os.path.splitext(filename_lower)[1]
+
+        if file.content_type not in settings.ALLOWED_IMAGE_MIME_TYPES:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"Unsupported file type: '{file.content_type}.'"
+                f"Only {', '.join(settings.ALLOWED_IMAGE_MIME_TYPES)} are allowed.",
+            )
+
+        if file_ext not in settings.ALLOWED_FILE_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported file extension: '{file_ext}'. "
+                f"Only {', '.join(settings.ALLOWED_FILE_EXTENSIONS)} are allowed.",
+            )
+
+        file_location = f"{AVATARS_DIRECTORY}/{file.filename}"
+        try:
+            async with aiofiles.open(file_location, "wb") as out_file:
+                chunk_size = 1024 * 1024
+                current_size = 0
+                while content := await file.read(chunk_size):
+                    current_size += len(content)
+                    if current_size > settings.MAX_FILE_SIZE_BYTES:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"File too large. Max size is {settings.MAX_FILE_SIZE_MB}MB.",
+                        )
+                    await out_file.write(content)
+            response_info.append(
+                {
+                    "filename": file.filename,
+                    "content_type": file.content_type,
+                    "size_bytes": current_size,
+                    "status": "File uploaded and size validated successfully.",
+                }
+            )
+        except HTTPException as e:
+            if os.path.exists(file_location):
+                os.remove(file_location)
+            response_info.append(
+                {
+                    "filename": file.filename,
+                    "status": "error",
+                    "message": f"Could not save file: {e}",
+                }
+            )
+        except Exception as e:
+            # Общая обработка других возможных ошибок (например, проблем с диском)
+            if os.path.exists(file_location):
+                os.remove(file_location)  # Удаляем неполный файл
+            response_info.append(
+                {
+                    "filename": file.filename,
+                    "status": "error",
+                    "message": f"An unexpected error occurred during file upload: {e}",
+                }
+            )
+        finally:
+            await file.close()
+
+    return {"uploaded_files": response_info}
+
+
+@router.get("/download/{file_name}", response_class=FileResponse)
+async def download_file(file_name: Annotated[str, Path(...)]):
+    file_path = os.path.join(AVATARS_DIRECTORY, file_name)
+    return get_file_response(file_path=file_path, file_name=file_name)
+
+
+@router.get("/stream-large-file/{file_name}", response_class=FileResponse)
+async def stream_large_file(file_name: str):
+    file_path = os.path.join(FILES_DIRECTORY, file_name)
+    return get_file_response(
+        file_path=file_path,
+        file_name=file_name,
+        media_type="application/octet-stream",
+        content_disposition_type="inline",
+    )
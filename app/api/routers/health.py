@@ -0,0 +1,49 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.database import database
+from app.core.health import health_probes, pool_stats
+from app.core.lifecycle import in_flight_requests
+
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/healthz", include_in_schema=False)
+async def healthz() -> dict:
+    """
+    Liveness: процесс жив и обслуживает event loop. Зависимости здесь не
+    проверяются, чтобы сбой БД не приводил к перезапуску всех экземпляров.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/readyz", include_in_schema=False)
+async def readyz() -> JSONResponse:
+    """
+    Readiness: 503 во время остановки или если недоступна зависимость из
+    HEALTH_REQUIRED_CHECKS. Результаты проверок кэшируются на
+    HEALTH_CACHE_TTL_SECONDS, заполненность пулов отдаётся текущая.
+    """
+    if in_flight_requests.stopping:
+        return JSONResponse(
+            {"status": "draining"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    checks = await health_probes.results()
+    ready = all(
+        checks[name]["ok"] for name in settings.HEALTH_REQUIRED_CHECKS if name in checks
+    )
+    return JSONResponse(
+        {
+            "status": "ready" if ready else "unavailable",
+            "checks": checks,
+            "pools": {
+                "primary": pool_stats(database.engine),
+                "replicas": [pool_stats(engine) for engine in database.replica_engines],
+            },
+        },
+        status_code=(
+            status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+    )
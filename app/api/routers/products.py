@@ -1,41 +1,123 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends, status, Path
+# pylint:disable=too-many-positional-arguments
+from typing import Annotated, Literal, Optional
+from fastapi import APIRouter, Depends, Request, Response, status, Path, Query
+from fastapi.responses import StreamingResponse
 from pydantic import Field
-from app.schemas.products import ProductCreate, Product
+from app.schemas.products import (
+    ProductCreate,
+    ProductUpdate,
+    ProductBulkUpdate,
+    Product,
+    ProductBatch,
+    ProductWithReviewSummary,
+)
+from app.schemas.exports import ExportFormat
 
-from app.core.dependencies.services import get_product_service
+from app.core.dependencies.services import (
+    get_export_service,
+    get_product_read_service,
+    get_product_service,
+)
 from app.services.products import ProductService
+from app.services.exports import ExportService
+from app.core.responses import (
+    JSONBytesResponse,
+    cached_json_response,
+    version_etag,
+)
+from app.core.dependencies.preconditions import get_expected_version
+from app.core.rate_limit import catalog_rate_limit, export_rate_limit
 from app.auth.security import get_email_current_user
 
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+MAX_BATCH_IDS = 100
 
-@router.get("/", response_model=list[Product], status_code=status.HTTP_200_OK)
+
+@router.get(
+    "/",
+    response_model=list[Product],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(catalog_rate_limit)],
+)
 async def get_products(
-    product_service: Annotated[ProductService, Depends(get_product_service)],
-) -> list[Product]:
-    return await product_service.get_all_products()
+    product_service: Annotated[ProductService, Depends(get_product_read_service)],
+) -> JSONBytesResponse:
+    return JSONBytesResponse(await product_service.get_all_products())
 
 
-@router.get("/{product_id}", response_model=Product, status_code=status.HTTP_200_OK)
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(export_rate_limit)],
+)
+async def export_products(
+    export_service: Annotated[ExportService, Depends(get_export_service)],
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+) -> StreamingResponse:
+    """Потоковая выгрузка всех активных товаров в NDJSON или CSV."""
+    return StreamingResponse(
+        export_service.export_products(export_format),
+        media_type=export_format.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="products.{export_format.value}"'
+        },
+    )
+
+
+@router.get(
+    "/batch",
+    response_model=ProductBatch,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(catalog_rate_limit)],
+)
+async def get_products_batch(
+    ids: Annotated[list[int], Query(min_length=1, max_length=MAX_BATCH_IDS)],
+    product_service: Annotated[ProductService, Depends(get_product_read_service)],
+) -> JSONBytesResponse:
+    """Возвращает до 100 товаров по списку ID (?ids=1&ids=2) одним запросом к БД."""
+    return JSONBytesResponse(await product_service.get_products_batch(ids))
+
+
+@router.get(
+    "/{product_id}",
+    response_model=ProductWithReviewSummary,
+    response_model_exclude_unset=True,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(catalog_rate_limit)],
+)
 async def get_product_by_id(
+    request: Request,
     product_id: Annotated[int, Path(ge=1)],
-    product_service: Annotated[ProductService, Depends(get_product_service)],
-) -> Product:
-    return await product_service.get_by_id(product_id=product_id)
+    product_service: Annotated[ProductService, Depends(get_product_read_service)],
+    embed: Annotated[
+        Optional[Literal["review_summary"]],
+        Query(description="review_summary - встроить сводку отзывов"),
+    ] = None,
+) -> Response:
+    product = await product_service.get_by_id(
+        product_id=product_id, embed_review_summary=embed == "review_summary"
+    )
+    # Сводка отзывов меняется без смены версии товара: ETag по хэшу тела
+    etag = None if embed else version_etag(product["version"])
+    return cached_json_response(request, product, etag=etag)
 
 
 @router.get(
     "/category/{category_id}",
     response_model=list[Product],
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(catalog_rate_limit)],
 )
 async def get_products_by_category(
     category_id: Annotated[int, Path(ge=1)],
-    product_service: Annotated[ProductService, Depends(get_product_service)],
-) -> list[Product]:
-    return await product_service.get_products_by_category(category_id=category_id)
+    product_service: Annotated[ProductService, Depends(get_product_read_service)],
+) -> JSONBytesResponse:
+    return JSONBytesResponse(
+        await product_service.get_products_by_category(category_id=category_id)
+    )
 
 
 @router.post("/", response_model=Product, status_code=status.HTTP_201_CREATED)
@@ -54,16 +136,68 @@ async def product_update(
     product_id: Annotated[int, Path(ge=1)],
     update_product: Annotated[ProductCreate, Field(description="Update product data")],
     product_service: Annotated[ProductService, Depends(get_product_service)],
+    user_email: Annotated[str, Depends(get_email_current_user)],
+    expected_version: Annotated[Optional[int], Depends(get_expected_version)],
+    response: Response,
 ) -> Product:
-    return await product_service.update(
-        product_id=product_id, product_update=update_product
+    """
+    Обновляет товар; продавец - только свой, администратор - любой.
+    С If-Match (ETag из GET) обновление выполняется только если товар
+    с тех пор не менялся, иначе 412.
+    """
+    product = await product_service.update(
+        product_id=product_id,
+        product_update=update_product,
+        email_user=user_email,
+        expected_version=expected_version,
     )
+    response.headers["ETag"] = version_etag(product["version"])
+    return product
+
+
+@router.patch("/", response_model=ProductBatch, status_code=status.HTTP_200_OK)
+async def products_update_stock_and_prices(
+    bulk_update: Annotated[ProductBulkUpdate, Field(description="Price/stock changes")],
+    product_service: Annotated[ProductService, Depends(get_product_service)],
+    user_email: Annotated[str, Depends(get_email_current_user)],
+) -> ProductBatch:
+    """
+    Меняет цены и/или остатки до 100 товаров одним UPDATE. Продавец меняет
+    только свои товары, администратор - любые. В missing - ID, для которых
+    активный товар (у продавца - его собственный) не найден.
+    """
+    return await product_service.update_stock_and_prices(
+        bulk_update, email_user=user_email
+    )
+
+
+@router.patch("/{product_id}", response_model=Product, status_code=status.HTTP_200_OK)
+async def product_patch(
+    product_id: Annotated[int, Path(ge=1)],
+    patch_product: Annotated[
+        ProductUpdate, Field(description="Changed product fields")
+    ],
+    product_service: Annotated[ProductService, Depends(get_product_service)],
+    user_email: Annotated[str, Depends(get_email_current_user)],
+    expected_version: Annotated[Optional[int], Depends(get_expected_version)],
+    response: Response,
+) -> Product:
+    """Частичное обновление: UPDATE пишет только переданные поля."""
+    product = await product_service.patch(
+        product_id=product_id,
+        product_update=patch_product,
+        email_user=user_email,
+        expected_version=expected_version,
+    )
+    response.headers["ETag"] = version_etag(product["version"])
+    return product
 
 
 @router.delete("/{product_id}", status_code=status.HTTP_200_OK)
 async def product_delete(
     product_id: Annotated[int, Path(ge=1)],
     product_service: Annotated[ProductService, Depends(get_product_service)],
+    user_email: Annotated[str, Depends(get_email_current_user)],
 ) -> dict:
-    await product_service.delete(product_id=product_id)
+    await product_service.delete(product_id=product_id, email_user=user_email)
     return {"success": "product success deleted"}
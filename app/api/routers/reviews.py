@@ -1,33 +1,144 @@
-# pylint:disable=unused-argument
+# pylint:disable=unused-argument,too-many-positional-arguments
 # ruff:noqa:E712
-from typing import Annotated
-from fastapi import APIRouter, Depends, status, Path
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, Request, Response, status, Path, Query
+from fastapi.responses import StreamingResponse
 from pydantic import Field
-from app.core.dependencies.services import get_review_service
+from app.core.dependencies.services import (
+    get_export_service,
+    get_review_read_service,
+    get_review_service,
+)
 from app.services.reviews import ReviewService
-from app.schemas.reviews import Review, ReviewCreate
+from app.services.exports import ExportService
+from app.schemas.exports import ExportFormat
+from app.core.responses import (
+    JSONBytesResponse,
+    cached_json_response,
+    page_headers,
+    version_etag,
+)
+from app.core.dependencies.pagination import get_review_page
+from app.core.dependencies.preconditions import get_expected_version
+from app.repositories.pagination import KeysetPage
+from app.core.rate_limit import catalog_rate_limit, export_rate_limit
+from app.schemas.reviews import (
+    Review,
+    ReviewCreate,
+    ReviewUpdate,
+    ReviewBatch,
+    ReviewSummary,
+)
 from app.auth.security import get_email_current_user
 
 router = APIRouter(tags=["reviews"])
 
+MAX_BATCH_IDS = 100
 
-@router.get("/reviews", status_code=status.HTTP_200_OK, response_model=list[Review])
+
+@router.get(
+    "/reviews",
+    status_code=status.HTTP_200_OK,
+    response_model=list[Review],
+    dependencies=[Depends(catalog_rate_limit)],
+)
 async def get_reviews(
-    review_repo: ReviewService = Depends(get_review_service),
-) -> list[Review]:
-    return await review_repo.get_all_reviews()
+    page: Annotated[KeysetPage, Depends(get_review_page)],
+    review_repo: ReviewService = Depends(get_review_read_service),
+) -> JSONBytesResponse:
+    """Страница активных отзывов; следующая - по курсору из X-Next-Cursor."""
+    reviews, next_cursor = await review_repo.get_reviews_page(page)
+    return JSONBytesResponse(reviews, headers=page_headers(next_cursor))
+
+
+@router.get(
+    "/reviews/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(export_rate_limit)],
+)
+async def export_reviews(
+    export_service: Annotated[ExportService, Depends(get_export_service)],
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+) -> StreamingResponse:
+    """Потоковая выгрузка всех активных отзывов в NDJSON или CSV."""
+    return StreamingResponse(
+        export_service.export_reviews(export_format),
+        media_type=export_format.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="reviews.{export_format.value}"'
+        },
+    )
+
+
+@router.get(
+    "/reviews/batch",
+    response_model=ReviewBatch,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(catalog_rate_limit)],
+)
+async def get_reviews_batch(
+    ids: Annotated[list[int], Query(min_length=1, max_length=MAX_BATCH_IDS)],
+    review_service: Annotated[ReviewService, Depends(get_review_read_service)],
+) -> JSONBytesResponse:
+    """Возвращает до 100 отзывов по списку ID (?ids=1&ids=2) одним запросом к БД."""
+    return JSONBytesResponse(await review_service.get_reviews_batch(ids))
 
 
 @router.get(
     "/products/{product_id}/reviews",
     response_model=list[Review],
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(catalog_rate_limit)],
 )
 async def get_reviews_by_product(
+    request: Request,
     product_id: Annotated[int, Path(..., ge=1)],
-    review_service: Annotated[ReviewService, Depends(get_review_service)],
-) -> list[Review]:
-    return await review_service.get_reviews_by_product(product_id=product_id)
+    page: Annotated[KeysetPage, Depends(get_review_page)],
+    review_service: Annotated[ReviewService, Depends(get_review_read_service)],
+) -> Response:
+    """Отзывы о товаре страницами, newest - по дате, grade - по оценке."""
+    reviews, next_cursor = await review_service.get_reviews_by_product(
+        product_id=product_id, page=page
+    )
+    return cached_json_response(
+        request, reviews, extra_headers=page_headers(next_cursor)
+    )
+
+
+@router.get(
+    "/users/{user_id}/reviews",
+    response_model=list[Review],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(catalog_rate_limit)],
+)
+async def get_reviews_by_user(
+    user_id: Annotated[int, Path(..., ge=1)],
+    page: Annotated[KeysetPage, Depends(get_review_page)],
+    review_service: Annotated[ReviewService, Depends(get_review_read_service)],
+) -> JSONBytesResponse:
+    """Отзывы пользователя страницами, как и отзывы о товаре."""
+    reviews, next_cursor = await review_service.get_reviews_by_user(
+        user_id=user_id, page=page
+    )
+    return JSONBytesResponse(reviews, headers=page_headers(next_cursor))
+
+
+@router.get(
+    "/products/{product_id}/reviews/summary",
+    response_model=ReviewSummary,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(catalog_rate_limit)],
+)
+async def get_review_summary(
+    request: Request,
+    product_id: Annotated[int, Path(..., ge=1)],
+    review_service: Annotated[ReviewService, Depends(get_review_read_service)],
+) -> Response:
+    """Число отзывов, рейтинг и распределение оценок без агрегации по reviews."""
+    return cached_json_response(
+        request, await review_service.get_review_summary(product_id=product_id)
+    )
 
 
 @router.post("/reviews", response_model=Review, status_code=status.HTTP_201_CREATED)
@@ -47,10 +158,40 @@ async def update_review(
     review: Annotated[ReviewCreate, Field(description="Create review data")],
     review_service: Annotated[ReviewService, Depends(get_review_service)],
     email: Annotated[str, Depends(get_email_current_user)],
+    expected_version: Annotated[Optional[int], Depends(get_expected_version)],
+    response: Response,
+) -> Review:
+    """Обновляет отзыв; с If-Match - только в указанной версии, иначе 412."""
+    review_db = await review_service.update_review(
+        review_id=review_id,
+        review=review,
+        email_user=email,
+        expected_version=expected_version,
+    )
+    response.headers["ETag"] = version_etag(review_db.version)
+    return review_db
+
+
+@router.patch(
+    "/reviews/{review_id}", response_model=Review, status_code=status.HTTP_200_OK
+)
+async def patch_review(
+    review_id: Annotated[int, Path(..., ge=1)],
+    review: Annotated[ReviewUpdate, Field(description="Changed review fields")],
+    review_service: Annotated[ReviewService, Depends(get_review_service)],
+    email: Annotated[str, Depends(get_email_current_user)],
+    expected_version: Annotated[Optional[int], Depends(get_expected_version)],
+    response: Response,
 ) -> Review:
-    return await review_service.update_review(
-        review_id=review_id, review=review, email_user=email
+    """Частичное обновление: UPDATE пишет только переданные поля."""
+    review_db = await review_service.patch_review(
+        review_id=review_id,
+        review=review,
+        email_user=email,
+        expected_version=expected_version,
     )
+    response.headers["ETag"] = version_etag(review_db.version)
+    return review_db
 
 
 @router.delete(
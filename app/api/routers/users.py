@@ -4,7 +4,7 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, status, Path
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import Field
-from app.schemas.users import UserCreate, User
+from app.schemas.users import UserCreate, UserCredentials, UserUpdate, User
 from app.auth.dependencies.services import get_user_service
 from app.services.users import UserService
 from app.auth.security import (
@@ -13,6 +13,7 @@ from app.auth.security import (
     get_email_current_user,
 )
 from app.schemas.tokens import TokenGroup, RefreshTokenRequest
+from app.core.rate_limit import login_rate_limit
 
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -29,13 +30,34 @@ async def register_user(
 @router.put("/edit/{user_id}", response_model=User, status_code=status.HTTP_200_OK)
 async def update_user(
     user_id: Annotated[int, Path(ge=1)],
-    user: Annotated[UserCreate, Field(description="User create data")],
+    user: Annotated[UserCredentials, Field(description="User email and password")],
     user_service: Annotated[UserService, Depends(get_user_service)],
+    user_email: Annotated[str, Depends(get_email_current_user)],
 ):
-    return await user_service.update_user(user_id=user_id, user=user)
+    """Меняет email и пароль; доступно самому пользователю и администратору."""
+    return await user_service.update_user(
+        user_id=user_id, user_update=user, email_user=user_email
+    )
 
 
-@router.post("/token", status_code=status.HTTP_200_OK)
+@router.patch("/edit/{user_id}", response_model=User, status_code=status.HTTP_200_OK)
+async def patch_user(
+    user_id: Annotated[int, Path(ge=1)],
+    user: Annotated[UserUpdate, Field(description="Changed user fields")],
+    user_service: Annotated[UserService, Depends(get_user_service)],
+    user_email: Annotated[str, Depends(get_email_current_user)],
+):
+    """Частичное обновление: UPDATE пишет только переданные поля."""
+    return await user_service.update_user(
+        user_id=user_id, user_update=user, email_user=user_email
+    )
+
+
+@router.post(
+    "/token",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(login_rate_limit)],
+)
 async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     user_service: Annotated[UserService, Depends(get_user_service)],
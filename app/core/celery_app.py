@@ -0,0 +1,25 @@
+from celery import Celery
+
+from app.core.config import settings
+
+
+def create_celery_app() -> Celery:
+    """Celery-приложение для воркера, beat и отправки задач из API."""
+    celery_app = Celery(
+        "app",
+        broker=settings.celery_broker_url,
+        backend=settings.celery_broker_url,
+        broker_connection_retry_on_startup=True,
+        include=["app.task"],
+    )
+    celery_app.conf.beat_schedule = {
+        "run-me-background-task": {
+            "task": "app.task.call_background_task",
+            "schedule": 60.0,
+            "args": ("Test text message",),
+        }
+    }
+    return celery_app
+
+
+celery = create_celery_app()
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,7 +9,20 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE_BYTES: int = MAX_FILE_SIZE_MB * 1024 * 1024
     ALLOWED_IMAGE_MIME_TYPES: list[str] = ["image/jpeg", "image/png"]
     ALLOWED_FILE_EXTENSIONS: list[str] = [".jpg", ".jpeg", ".png"]
+    FILE_CHUNK_SIZE_BYTES: int = 256 * 1024
+    FILE_SERVING_MODE: Literal["thread", "mmap"] = "thread"
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 4
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
     DATABASE_URL: str
+    DATABASE_REPLICA_URLS: list[str] = []
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_QUERY_CACHE_SIZE: int = 1200
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
     SECRET_KEY: str
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
@@ -18,6 +32,44 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int
     REDIS_HOST: str
     REDIS_PORT: int
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 1.0
+    # Сколько /readyz отдаёт 503 до отказа в новых запросах: за это время
+    # балансировщик выводит экземпляр
+    SHUTDOWN_READINESS_DELAY_SECONDS: float = 5.0
+    SHUTDOWN_DRAIN_TIMEOUT_SECONDS: float = 25.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 1.0
+    HEALTH_CACHE_TTL_SECONDS: float = 5.0
+    HEALTH_REQUIRED_CHECKS: list[str] = ["postgres"]
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_REDIS_RETRY_SECONDS: float = 5.0
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 10
+    RATE_LIMIT_UPLOAD_PER_MINUTE: int = 20
+    RATE_LIMIT_CATALOG_PER_MINUTE: int = 600
+    RATE_LIMIT_EXPORT_PER_MINUTE: int = 5
+    # Адреса и сети (CIDR) обратных прокси: только от них X-Forwarded-For
+    # принимается как адрес клиента
+    TRUSTED_PROXIES: list[str] = []
+    # Браузер ревалидирует по ETag каждый раз, CDN кэширует на s-maxage
+    CATALOG_CACHE_CONTROL: str = (
+        "public, max-age=0, s-maxage=60, stale-while-revalidate=30"
+    )
+    LOAD_SHEDDING_ENABLED: bool = True
+    # Группам, которые держат соединение с БД, достаётся доля пула основной
+    # базы (DB_POOL_SIZE + DB_MAX_OVERFLOW), сумма долей не больше 1
+    CONCURRENCY_POOL_SHARES: dict[str, float] = {
+        "catalog": 0.6,
+        "writes": 0.25,
+        "auth": 0.15,
+    }
+    # Лимиты групп без БД
+    CONCURRENCY_LIMITS: dict[str, int] = {"uploads": 4}
+    LOAD_SHEDDING_TARGET_DELAY_SECONDS: float = 0.05
+    LOAD_SHEDDING_INTERVAL_SECONDS: float = 0.1
+    LOAD_SHEDDING_MAX_WAIT_SECONDS: float = 1.0
+
+    @property
+    def celery_broker_url(self) -> str:
+        return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/0"
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -1,26 +1,129 @@
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
-from dotenv import load_dotenv
+import itertools
+from typing import Optional
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase
 
-load_dotenv()
+from app.core.config import settings
+from app.core.metrics import instrument_compiled_cache
 
-SQLITE_DATABASE_URL = os.getenv("SQLITE_DATABASE_URL")
 
+class Base(DeclarativeBase):
+    pass
 
-DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Синхронное подключение
-engine = create_engine(SQLITE_DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(bind=engine)
+def create_app_async_engine(url: str) -> AsyncEngine:
+    """
+    Асинхронный движок приложения. Размер кэша подготовленных выражений
+    asyncpg задаётся на соединение, кэш скомпилированных запросов — на движок.
+    """
+    app_engine = create_async_engine(
+        url,
+        echo=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        connect_args=(
+            {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+            if make_url(url).get_driver_name() == "asyncpg"
+            else {}
+        ),
+    )
+    instrument_compiled_cache(app_engine.sync_engine)
+    return app_engine
 
-# Асинхронное подключение
-async_engine = create_async_engine(DATABASE_URL, echo=True)
-async_session_maker = async_sessionmaker(
-    bind=async_engine, expire_on_commit=False, class_=AsyncSession
-)
 
+def create_session_maker(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=bind, expire_on_commit=False, class_=AsyncSession)
 
-class Base(DeclarativeBase):
-    pass
+
+class ReadSessionRouter:
+    """
+    Выбирает фабрику сессий для чтения: реплики по кругу, основная база —
+    если реплик нет или клиент недавно писал. Окно read-your-writes защищает
+    от чтения с реплики, которая ещё не догнала только что сделанную запись.
+    Метку записи клиент приносит сам в подписанной cookie (см.
+    app.core.dependencies.db), поэтому её видят все воркеры и инстансы.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: list[async_sessionmaker[AsyncSession]],
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self._replica_cycle = itertools.cycle(replicas)
+
+    def get_session_maker(self, recent_write: bool) -> async_sessionmaker[AsyncSession]:
+        if not self.replicas or recent_write:
+            return self.primary
+        return next(self._replica_cycle)
+
+
+class Database:
+    """
+    Движки и фабрики сессий приложения. Импорт модуля ничего не создаёт:
+    пулы поднимаются в lifespan (connect) или при первом обращении — например,
+    в Celery и скриптах — и закрываются в dispose.
+    """
+
+    def __init__(self):
+        self._engine: Optional[AsyncEngine] = None
+        self._session_maker: Optional[async_sessionmaker[AsyncSession]] = None
+        self._replica_engines: list[AsyncEngine] = []
+        self._read_router: Optional[ReadSessionRouter] = None
+
+    def connect(self) -> None:
+        if self._engine is not None:
+            return
+        self._engine = create_app_async_engine(settings.DATABASE_URL)
+        self._session_maker = create_session_maker(self._engine)
+        self._replica_engines = [
+            create_app_async_engine(url) for url in settings.DATABASE_REPLICA_URLS
+        ]
+        self._read_router = ReadSessionRouter(
+            primary=self._session_maker,
+            replicas=[
+                create_session_maker(replica) for replica in self._replica_engines
+            ],
+        )
+
+    async def dispose(self) -> None:
+        """Закрывает соединения всех пулов; следующий запрос создаст их заново."""
+        for engine in (self._engine, *self._replica_engines):
+            if engine is not None:
+                await engine.dispose()
+        self._engine = None
+        self._session_maker = None
+        self._replica_engines = []
+        self._read_router = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        self.connect()
+        return self._engine
+
+    @property
+    def session_maker(self) -> async_sessionmaker[AsyncSession]:
+        self.connect()
+        return self._session_maker
+
+    @property
+    def replica_engines(self) -> list[AsyncEngine]:
+        self.connect()
+        return self._replica_engines
+
+    @property
+    def read_router(self) -> ReadSessionRouter:
+        self.connect()
+        return self._read_router
+
+
+database = Database()
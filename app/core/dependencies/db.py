@@ -1,31 +1,103 @@
-from collections.abc import Generator
+import math
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 from typing import AsyncGenerator
-from sqlalchemy.orm import Session
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import (
-    SessionLocal,
-    async_session_maker,
-)
+import jwt
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.core.database import database
+from app.core.responses import add_response_headers
 
 
-def get_db() -> Generator[Session, None, None]:
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+READ_YOUR_WRITES_COOKIE = "last_write"
+READ_YOUR_WRITES_PURPOSE = "read-your-writes"
+
+
+def read_your_writes_cookie() -> str:
     """
-    Зависимость для получения сессии базы данных.
-    Создаёт новую сессию для каждого запроса и закрывает её после обработки.
+    Set-Cookie с подписанной меткой записи. Срок окна зашит в exp и в
+    Max-Age: подделать или продлить метку клиент не может.
     """
-    db: Session = SessionLocal()
+    seconds = settings.DB_READ_YOUR_WRITES_SECONDS
+    token = jwt.encode(
+        {
+            "purpose": READ_YOUR_WRITES_PURPOSE,
+            "exp": datetime.now(timezone.utc) + timedelta(seconds=seconds),
+        },
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+    return (
+        f"{READ_YOUR_WRITES_COOKIE}={token}; Max-Age={math.ceil(seconds)}; "
+        "Path=/; HttpOnly; SameSite=lax"
+    )
+
+
+def has_recent_write(request: Request) -> bool:
+    """Писал ли клиент в окне read-your-writes: по cookie из его запроса."""
+    token = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    if not token:
+        return False
     try:
-        yield db
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+    except jwt.PyJWTError:
+        return False
+    return payload.get("purpose") == READ_YOUR_WRITES_PURPOSE
+
+
+@asynccontextmanager
+async def request_session(
+    request: Request, session_maker: async_sessionmaker[AsyncSession], name: str
+) -> AsyncIterator[AsyncSession]:
+    """
+    Сессия запроса. AsyncSession берёт соединение из пула только при
+    первом обращении к БД, поэтому запрос без SQL соединение не держит.
+    Вторая сессия в том же запросе (например, зависимости и от основной
+    базы, и от реплики) заняла бы второе соединение: это ошибка в цепочке
+    зависимостей, и она падает сразу, а не под нагрузкой на пуле.
+    """
+    opened = getattr(request.state, "db_session", None)
+    if opened is not None:
+        raise RuntimeError(
+            f"{request.method} {request.url.path} opens a second database "
+            f"session ({name}) after {opened}"
+        )
+    request.state.db_session = name
+    async with session_maker() as session:
+        yield session
 
 
-async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Предоставляет асинхронную сессию SQLAlchemy для работы с базой данных PostgreSQL.
+    FastAPI вызывает зависимость один раз за запрос. Изменяющий запрос
+    получает cookie read-your-writes: пока она действует, чтения клиента
+    идут в основную базу.
+    """
+    if request.method not in SAFE_METHODS and database.read_router.replicas:
+        add_response_headers(request, {"set-cookie": read_your_writes_cookie()})
+    async with request_session(request, database.session_maker, "primary") as session:
+        yield session
+
+
+def get_read_session_maker(request: Request) -> async_sessionmaker[AsyncSession]:
+    return database.read_router.get_session_maker(has_recent_write(request))
+
+
+async def get_async_read_db(
+    request: Request,
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_read_session_maker),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия для read-only запросов: реплика по кругу, если они настроены,
+    иначе основная база.
     """
-    async with async_session_maker() as session:
+    async with request_session(request, session_maker, "read") as session:
         yield session
@@ -0,0 +1,36 @@
+from typing import Annotated, Optional
+
+from fastapi import Query
+
+from app.core.exceptions import BusinessException
+from app.repositories.pagination import KeysetPage, decode_cursor
+from app.repositories.reviews import REVIEW_SORT_COLUMNS
+from app.schemas.reviews import ReviewSort
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def get_review_page(
+    sort: Annotated[ReviewSort, Query(description="Порядок отзывов")] = (
+        ReviewSort.NEWEST
+    ),
+    limit: Annotated[
+        int, Query(ge=1, le=MAX_PAGE_SIZE, description="Размер страницы")
+    ] = DEFAULT_PAGE_SIZE,
+    cursor: Annotated[
+        Optional[str], Query(description="Курсор из заголовка X-Next-Cursor")
+    ] = None,
+) -> KeysetPage:
+    """
+    Параметры keyset-страницы отзывов. Курсор следующей страницы приходит
+    в X-Next-Cursor; курсор от другой сортировки или испорченный - 400.
+    """
+    columns = REVIEW_SORT_COLUMNS[sort]
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor, sort.value, columns)
+        except ValueError as exc:
+            raise BusinessException("Invalid pagination cursor") from exc
+    return KeysetPage(sort.value, columns, limit, after)
@@ -0,0 +1,23 @@
+from typing import Annotated, Optional
+
+from fastapi import Header
+
+from app.core.exceptions import PreconditionFailedException
+from app.core.responses import parse_version_etag
+
+
+def get_expected_version(
+    if_match: Annotated[Optional[str], Header()] = None,
+) -> Optional[int]:
+    """
+    Ожидаемая версия строки из If-Match. None - обновление без условия
+    (заголовка нет или If-Match: *). Версионный ETag принимается и слабым:
+    клиент со сжатием видит только W/"vN". ETag не нашего формата не может
+    совпасть ни с одной версией, поэтому сразу 412.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    version = parse_version_etag(if_match)
+    if version is None:
+        raise PreconditionFailedException("If-Match does not match current version")
+    return version
@@ -4,8 +4,11 @@ from fastapi import Depends
 from app.repositories.categories import CategoryRepository
 from app.repositories.products import ProductRepository
 from app.repositories.reviews import ReviewRepository
+from app.repositories.review_stats import ReviewStatsRepository
+from app.repositories.users import UserRepository
+from app.repositories.loaders import RepositoryLoaders
 
-from app.core.dependencies.db import get_async_db
+from app.core.dependencies.db import get_async_db, get_async_read_db
 
 
 def get_category_repository(
@@ -23,4 +26,26 @@ def get_product_repository(
 def get_review_repository(
     db: AsyncSession = Depends(get_async_db),
 ) -> CategoryRepository:
-    return ReviewRepository(db=db)
+    return ReviewRepository(db=db, stats_repo=ReviewStatsRepository(db=db))
+
+
+def make_repository_loaders(db: AsyncSession) -> RepositoryLoaders:
+    return RepositoryLoaders(
+        product_repo=ProductRepository(db=db),
+        category_repo=CategoryRepository(db=db),
+        review_repo=ReviewRepository(db=db, stats_repo=ReviewStatsRepository(db=db)),
+        user_repo=UserRepository(db=db),
+    )
+
+
+def get_repository_loaders(
+    db: AsyncSession = Depends(get_async_db),
+) -> RepositoryLoaders:
+    """Загрузчики живут один запрос: FastAPI кэширует зависимость в его рамках."""
+    return make_repository_loaders(db)
+
+
+def get_read_repository_loaders(
+    db: AsyncSession = Depends(get_async_read_db),
+) -> RepositoryLoaders:
+    return make_repository_loaders(db)
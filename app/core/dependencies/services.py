@@ -1,31 +1,95 @@
 from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from app.services.categories import CategoryService
 from app.services.products import ProductService
 from app.services.reviews import ReviewService
+from app.services.exports import ExportService
 
-from app.core.dependencies.db import get_async_db
+from app.core.dependencies.db import (
+    get_async_db,
+    get_async_read_db,
+    get_read_session_maker,
+)
+from app.core.dependencies.repositories import (
+    get_read_repository_loaders,
+    get_repository_loaders,
+)
 from app.repositories.categories import CategoryRepository
 from app.repositories.products import ProductRepository
 from app.repositories.reviews import ReviewRepository
+from app.repositories.review_stats import ReviewStatsRepository
 from app.repositories.users import UserRepository
+from app.repositories.loaders import RepositoryLoaders
 
 
 def get_category_service(db: AsyncSession = Depends(get_async_db)) -> CategoryService:
     return CategoryService(category_repo=CategoryRepository(db=db))
 
 
-def get_product_service(db: AsyncSession = Depends(get_async_db)) -> ProductService:
+def get_category_read_service(
+    db: AsyncSession = Depends(get_async_read_db),
+) -> CategoryService:
+    """Сервис для GET-эндпоинтов: чтение идёт с реплики."""
+    return CategoryService(category_repo=CategoryRepository(db=db))
+
+
+def get_product_service(
+    db: AsyncSession = Depends(get_async_db),
+    loaders: RepositoryLoaders = Depends(get_repository_loaders),
+) -> ProductService:
+    return ProductService(
+        product_repo=ProductRepository(db=db),
+        category_repo=CategoryRepository(db=db),
+        user_repo=UserRepository(db=db),
+        loaders=loaders,
+        review_stats_repo=ReviewStatsRepository(db=db),
+    )
+
+
+def get_product_read_service(
+    db: AsyncSession = Depends(get_async_read_db),
+    loaders: RepositoryLoaders = Depends(get_read_repository_loaders),
+) -> ProductService:
+    """Сервис для GET-эндпоинтов: чтение идёт с реплики."""
     return ProductService(
         product_repo=ProductRepository(db=db),
         category_repo=CategoryRepository(db=db),
         user_repo=UserRepository(db=db),
+        loaders=loaders,
+        review_stats_repo=ReviewStatsRepository(db=db),
     )
 
 
-def get_review_service(db: AsyncSession = Depends(get_async_db)) -> ReviewService:
+def get_review_service(
+    db: AsyncSession = Depends(get_async_db),
+    loaders: RepositoryLoaders = Depends(get_repository_loaders),
+) -> ReviewService:
+    review_stats_repo = ReviewStatsRepository(db=db)
     return ReviewService(
-        review_repo=ReviewRepository(db=db),
+        review_repo=ReviewRepository(db=db, stats_repo=review_stats_repo),
         product_repo=ProductRepository(db=db),
         user_repo=UserRepository(db=db),
+        loaders=loaders,
+        review_stats_repo=review_stats_repo,
     )
+
+
+def get_review_read_service(
+    db: AsyncSession = Depends(get_async_read_db),
+    loaders: RepositoryLoaders = Depends(get_read_repository_loaders),
+) -> ReviewService:
+    """Сервис для GET-эндпоинтов: чтение идёт с реплики."""
+    review_stats_repo = ReviewStatsRepository(db=db)
+    return ReviewService(
+        review_repo=ReviewRepository(db=db, stats_repo=review_stats_repo),
+        product_repo=ProductRepository(db=db),
+        user_repo=UserRepository(db=db),
+        loaders=loaders,
+        review_stats_repo=review_stats_repo,
+    )
+
+
+def get_export_service(
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_read_session_maker),
+) -> ExportService:
+    return ExportService(session_factory=session_maker)
@@ -0,0 +1,37 @@
+def parse_accept_encoding(header: str | None) -> dict[str, float]:
+    """
+    Разбирает заголовок Accept-Encoding в словарь {кодировка: q}.
+    Кодировки с q=0 явно запрещены клиентом и в результат не попадают.
+    """
+    encodings: dict[str, float] = {}
+    if not header:
+        return encodings
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            encodings[name] = quality
+    return encodings
+
+
+def choose_encoding(header: str | None, available: tuple[str, ...]) -> str | None:
+    """
+    Выбирает кодировку из available (в порядке предпочтения сервера)
+    с наибольшим q, который указал клиент.
+    """
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
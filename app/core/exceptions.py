@@ -10,8 +10,8 @@ class AppException(HTTPException):
 class NotFoundException(AppException):
     def __init__(
         self,
-        status_code: int = status.HTTP_404_NOT_FOUND,
         detail: str = "Resource not found",
+        status_code: int = status.HTTP_404_NOT_FOUND,
     ):
         super().__init__(status_code=status_code, detail=detail)
 
@@ -19,8 +19,8 @@ class NotFoundException(AppException):
 class ConflictException(AppException):
     def __init__(
         self,
-        status_code: int = status.HTTP_409_CONFLICT,
         detail: str = "Resource already exists",
+        status_code: int = status.HTTP_409_CONFLICT,
     ):
         super().__init__(status_code=status_code, detail=detail)
 
@@ -30,6 +30,28 @@ class BusinessException(AppException):
         super().__init__(status_code=status_code, detail=detail)
 
 
+class PreconditionFailedException(AppException):
+    def __init__(
+        self,
+        detail: str = "Resource has been modified",
+        status_code: int = status.HTTP_412_PRECONDITION_FAILED,
+    ):
+        super().__init__(status_code=status_code, detail=detail)
+
+
+class TooManyRequestsException(AppException):
+    def __init__(
+        self,
+        detail: str = "Too many requests",
+        headers: Optional[dict] = None,
+    ):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers=headers,
+        )
+
+
 class UnauthorizedException(HTTPException):
     def __init__(
         self,
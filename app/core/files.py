@@ -0,0 +1,175 @@
+import mmap
+import operator
+import os
+import stat
+from email.utils import parsedate
+from typing import BinaryIO
+
+import anyio
+from fastapi import HTTPException, status
+from fastapi.responses import FileResponse, Response
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+
+
+NOT_MODIFIED_HEADERS = ("etag", "last-modified", "cache-control", "vary")
+
+
+def is_not_modified(response_headers: Headers, request_headers: Headers) -> bool:
+    """
+    Проверяет условные заголовки запроса (RFC 9110, раздел 13.2.2).
+    If-None-Match имеет приоритет: If-Modified-Since учитывается только без него.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = response_headers.get("etag")
+        if etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # Для GET/HEAD используется слабое сравнение: префикс W/ игнорируется.
+        candidates = [
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        ]
+        return etag.removeprefix("W/") in candidates
+
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = response_headers.get("last-modified")
+    if if_modified_since is None or last_modified is None:
+        return False
+    since, modified = parsedate(if_modified_since), parsedate(last_modified)
+    return since is not None and modified is not None and since >= modified
+
+
+class ConditionalFileResponse(FileResponse):
+    """
+    FileResponse с поддержкой условных GET-запросов.
+
+    Range (206) и multipart/byteranges, ETag и Last-Modified обрабатывает
+    базовый класс Starlette; здесь добавляется ответ 304 по If-None-Match /
+    If-Modified-Since и настраиваемый размер чанка.
+
+    Если ASGI-сервер поддерживает расширение http.response.pathsend, тело
+    отдаёт сам сервер (Starlette выбирает этот путь автоматически). Иначе в
+    режиме FILE_SERVING_MODE="mmap" полный GET копируется срезами mmap в
+    пуле потоков вместо чтения файла через anyio: переходов в пул столько
+    же, но без промежуточного буфера файла. Запросы с Range и HEAD всегда
+    обслуживает реализация Starlette.
+    """
+
+    chunk_size = settings.FILE_CHUNK_SIZE_BYTES
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["method"] in ("GET", "HEAD") and is_not_modified(
+            self.headers, Headers(scope=scope)
+        ):
+            headers = {
+                name: value
+                for name, value in self.headers.items()
+                if name in NOT_MODIFIED_HEADERS
+            }
+            response = Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+            await response(scope, receive, send)
+            return
+        if self._use_mmap(scope):
+            await self._send_mmap(send)
+            if self.background is not None:
+                await self.background()
+            return
+        await super().__call__(scope, receive, send)
+
+    def _use_mmap(self, scope: Scope) -> bool:
+        # Range, HEAD и pathsend обслуживает Starlette; mmap нельзя создать
+        # для пустого файла
+        return (
+            settings.FILE_SERVING_MODE == "mmap"
+            and scope["method"] == "GET"
+            and "http.response.pathsend" not in scope.get("extensions", {})
+            and "range" not in Headers(scope=scope)
+            and self.stat_result is not None
+            and self.stat_result.st_size > 0
+        )
+
+    async def _send_mmap(self, send: Send) -> None:
+        # open, mmap и munmap - системные вызовы, которые могут ждать диск:
+        # как и срезы, они выполняются в пуле потоков
+        file, mapped = await anyio.to_thread.run_sync(map_file, self.path)
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            size = len(mapped)
+            start = 0
+            while start < size:
+                end = min(start + self.chunk_size, size)
+                # Срез копирует страницы и может ждать диск: не в event loop
+                chunk = await anyio.to_thread.run_sync(
+                    operator.getitem, mapped, slice(start, end)
+                )
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": end < size,
+                    }
+                )
+                start = end
+        finally:
+            # Закрытие не должно потеряться при отмене (обрыв клиента)
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(unmap_file, file, mapped)
+
+
+def map_file(path: str | os.PathLike[str]) -> tuple[BinaryIO, mmap.mmap]:
+    """Открывает файл и отображает его в память только для чтения."""
+    file = open(path, "rb")  # pylint:disable=consider-using-with
+    try:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except BaseException:
+        file.close()
+        raise
+    if hasattr(mapped, "madvise"):
+        mapped.madvise(mmap.MADV_SEQUENTIAL)
+    return file, mapped
+
+
+def unmap_file(file: BinaryIO, mapped: mmap.mmap) -> None:
+    mapped.close()
+    file.close()
+
+
+def get_file_response(
+    file_path: str,
+    file_name: str,
+    media_type: str | None = None,
+    content_disposition_type: str = "attachment",
+) -> ConditionalFileResponse:
+    """
+    Возвращает ответ с файлом, заранее получив stat, чтобы ETag и
+    Last-Modified были известны до проверки условных заголовков.
+    """
+    try:
+        stat_result = os.stat(file_path)
+    except FileNotFoundError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="File not found."
+        ) from exc
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="File not found."
+        )
+    return ConditionalFileResponse(
+        path=file_path,
+        filename=file_name,
+        media_type=media_type,
+        stat_result=stat_result,
+        content_disposition_type=content_disposition_type,
+    )
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+from redis.asyncio import Redis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.database import database
+from app.core.redis import get_redis
+
+
+async def check_postgres() -> None:
+    async with database.engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def check_redis() -> None:
+    await get_redis().ping()
+
+
+async def check_celery_broker() -> None:
+    """Брокер проверяется отдельным соединением: у Celery свой пул."""
+    broker = Redis.from_url(
+        settings.celery_broker_url,
+        socket_connect_timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+        socket_timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+    )
+    try:
+        await broker.ping()
+    finally:
+        await broker.aclose()
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    """Заполненность пула соединений: checked_out / (pool_size + max_overflow)."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {}
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    checked_out = pool.checkedout()
+    return {
+        "checked_out": checked_out,
+        "idle": pool.checkedin(),
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+    }
+
+
+class HealthProbes:
+    """
+    Проверки зависимостей для /readyz с ограничением по времени. Результат
+    кэшируется на ttl секунд, а одновременные опросы балансировщика ждут
+    одну общую проверку, поэтому частый polling не умножает нагрузку на БД.
+    """
+
+    def __init__(
+        self,
+        checks: dict[str, Callable[[], Awaitable[None]]],
+        timeout: float,
+        ttl: float,
+    ):
+        self.checks = checks
+        self.timeout = timeout
+        self.ttl = ttl
+        self._result: Optional[dict[str, dict[str, Any]]] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _run_check(self, check: Callable[[], Awaitable[None]]) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), self.timeout)
+        except asyncio.TimeoutError:
+            return {"ok": False, "error": f"timeout after {self.timeout}s"}
+        except Exception as exc:  # pylint:disable=broad-exception-caught
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        return {
+            "ok": True,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    async def results(self) -> dict[str, dict[str, Any]]:
+        async with self._lock:
+            if self._result is None or time.monotonic() - self._checked_at > self.ttl:
+                outcomes = await asyncio.gather(
+                    *(self._run_check(check) for check in self.checks.values())
+                )
+                self._result = dict(zip(self.checks, outcomes))
+                self._checked_at = time.monotonic()
+            return self._result
+
+
+health_probes = HealthProbes(
+    checks={
+        "postgres": check_postgres,
+        "redis": check_redis,
+        "celery_broker": check_celery_broker,
+    },
+    timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+    ttl=settings.HEALTH_CACHE_TTL_SECONDS,
+)
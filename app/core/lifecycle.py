@@ -0,0 +1,110 @@
+import asyncio
+import signal
+from typing import Optional
+
+from loguru import logger
+
+
+class InFlightRequests:
+    """
+    Счётчик HTTP-запросов, которые сейчас обрабатываются, и фаза остановки.
+    stopping: /readyz уже отдаёт 503, но запросы ещё принимаются, пока
+    балансировщик не выведет экземпляр. draining: новые запросы
+    отклоняются, начатые дорабатывают.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.stopping = False
+        self.draining = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def reset(self) -> None:
+        self.stopping = False
+        self.draining = False
+
+    def started(self) -> None:
+        self.count += 1
+        self._idle.clear()
+
+    def finished(self) -> None:
+        self.count -= 1
+        if self.count == 0:
+            self._idle.set()
+
+    async def drain(self, readiness_delay: float, timeout: float) -> bool:
+        """
+        Снимает готовность, через readiness_delay секунд перестаёт принимать
+        запросы и ждёт текущие не дольше timeout секунд. Возвращает False,
+        если к концу ожидания запросы ещё выполняются.
+        """
+        self.stopping = True
+        await asyncio.sleep(readiness_delay)
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class SigtermDrain:
+    """
+    Drain по SIGTERM до того, как сигнал увидит ASGI-сервер. uvicorn по
+    сигналу сразу закрывает сокеты и ждёт или обрывает открытые запросы, а
+    lifespan shutdown выполняет уже после этого, когда дренировать нечего.
+    Поэтому обработчик ставится в lifespan startup поверх обработчика
+    сервера: он выполняет drain и передаёт сигнал прежнему обработчику,
+    после чего сервер останавливается как обычно.
+    """
+
+    def __init__(
+        self, tracker: InFlightRequests, readiness_delay: float, timeout: float
+    ):
+        self.tracker = tracker
+        self.readiness_delay = readiness_delay
+        self.timeout = timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._previous = None
+        self._task: Optional[asyncio.Task] = None
+
+    def install(self) -> None:
+        loop = asyncio.get_running_loop()
+        previous = signal.getsignal(signal.SIGTERM)
+        try:
+            loop.add_signal_handler(signal.SIGTERM, self._on_sigterm)
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Не главный поток или Windows: остаётся обработчик сервера
+            return
+        self._loop = loop
+        self._previous = signal.SIG_DFL if previous is None else previous
+        self._task = None
+
+    def uninstall(self) -> None:
+        """Возвращает прежний обработчик SIGTERM."""
+        if self._loop is None:
+            return
+        self._loop.remove_signal_handler(signal.SIGTERM)
+        signal.signal(signal.SIGTERM, self._previous)
+        self._loop = None
+
+    def _on_sigterm(self) -> None:
+        # Повторный SIGTERM во время drain ничего не меняет
+        if self._task is None:
+            self._task = self._loop.create_task(self._drain_and_stop())
+
+    async def _drain_and_stop(self) -> None:
+        with logger.contextualize(log_id="shutdown"):
+            logger.info(f"SIGTERM: draining {self.tracker.count} requests in flight")
+            drained = await self.tracker.drain(self.readiness_delay, self.timeout)
+            if not drained:
+                logger.warning(
+                    f"Shutdown drain timed out with {self.tracker.count} "
+                    "requests in flight"
+                )
+        self.uninstall()
+        signal.raise_signal(signal.SIGTERM)
+
+
+in_flight_requests = InFlightRequests()
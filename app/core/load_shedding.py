@@ -0,0 +1,194 @@
+# pylint:disable=too-many-instance-attributes
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Optional
+
+from starlette.types import Scope
+
+from app.core.config import settings
+from app.core.metrics import (
+    http_concurrency_in_flight,
+    http_concurrency_queue_depth,
+    http_concurrency_queue_wait_seconds,
+    http_requests_shed_total,
+)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+AUTH_PATHS = ("/users/token", "/users/refresh_token", "/users/register")
+UPLOAD_PATHS = ("/uploadfile_async_save",)
+API_PREFIXES = ("/products", "/categories", "/reviews", "/users")
+
+
+def get_route_group(scope: Scope) -> Optional[str]:
+    """
+    Группа лимита конкурентности по пути и методу, ещё до маршрутизации.
+    Пробы, метрики, статика и файлы не ограничиваются (None).
+    """
+    path = scope["path"]
+    if path in AUTH_PATHS:
+        return "auth"
+    if path in UPLOAD_PATHS:
+        return "uploads"
+    if not path.startswith(API_PREFIXES):
+        return None
+    if scope["method"] in SAFE_METHODS:
+        return "catalog"
+    return "writes"
+
+
+class ConcurrencyLimiter:
+    """
+    Не больше limit одновременных запросов группы, остальные ждут в FIFO.
+    Ожидание ограничено по схеме CoDel: для каждого запроса известно время
+    постановки в очередь, и за каждый интервал interval берётся минимальное
+    ожидание получивших слот. Если даже минимум выше target, очередь стоячая
+    и сервер перегружен: новым запросам разрешается ждать только target
+    секунд, иначе - до max_wait. Короткий всплеск с быстрыми ожиданиями
+    перегрузкой не считается, даже если очередь всё время непуста. Не
+    дождавшийся слота запрос отклоняется (503), а не копит задержку до
+    таймаутов пула БД.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        *,
+        target: float,
+        interval: float,
+        max_wait: float,
+    ):
+        self.name = name
+        self.limit = limit
+        self.target = target
+        self.interval = interval
+        self.max_wait = max_wait
+        self.active = 0
+        # (future, время постановки в очередь)
+        self._waiters: deque[tuple[asyncio.Future, float]] = deque()
+        self._min_wait = math.inf
+        self._interval_end = time.monotonic() + interval
+        self._overloaded = False
+        self._in_flight_gauge = http_concurrency_in_flight.labels(group=name)
+        self._queue_depth_gauge = http_concurrency_queue_depth.labels(group=name)
+        self._queue_wait = http_concurrency_queue_wait_seconds.labels(group=name)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def overloaded(self) -> bool:
+        self._close_interval(time.monotonic())
+        return self._overloaded
+
+    def _record_wait(self, wait: float, now: float) -> None:
+        self._min_wait = min(self._min_wait, wait)
+        self._close_interval(now)
+
+    def _close_interval(self, now: float) -> None:
+        if now < self._interval_end:
+            return
+        min_wait = self._min_wait
+        if self._waiters:
+            # Голова очереди ещё ждёт: её ожидание уже не меньше текущего
+            min_wait = min(min_wait, now - self._waiters[0][1])
+        # Интервал без запросов (min_wait = inf) перегрузкой не считается
+        self._overloaded = self.target < min_wait < math.inf
+        self._min_wait = math.inf
+        self._interval_end = now + self.interval
+
+    def _update_gauges(self) -> None:
+        self._in_flight_gauge.set(self.active)
+        self._queue_depth_gauge.set(len(self._waiters))
+
+    async def acquire(self) -> bool:
+        """Занимает слот; False - запрос нужно отклонить."""
+        now = time.monotonic()
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self._record_wait(0.0, now)
+            self._update_gauges()
+            return True
+
+        overloaded = self.overloaded()
+        timeout = self.target if overloaded else self.max_wait
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (waiter, now)
+        self._waiters.append(entry)
+        self._update_gauges()
+        try:
+            await asyncio.wait({waiter}, timeout=timeout)
+        except asyncio.CancelledError:
+            # Клиент ушёл: полученный слот возвращается, иначе уходим из очереди
+            if waiter.done():
+                self.release()
+            else:
+                self._leave_queue(entry)
+            raise
+        self._queue_wait.observe(time.monotonic() - now)
+        if not waiter.done():
+            self._leave_queue(entry)
+            reason = "codel" if overloaded else "max_wait"
+            http_requests_shed_total.labels(group=self.name, reason=reason).inc()
+            return False
+        return True
+
+    def _leave_queue(self, entry: tuple[asyncio.Future, float]) -> None:
+        entry[0].cancel()
+        self._waiters.remove(entry)
+        self._update_gauges()
+
+    def release(self) -> None:
+        # Слот сразу переходит следующему ожидающему, active не меняется
+        if self._waiters:
+            waiter, enqueued_at = self._waiters.popleft()
+            waiter.set_result(None)
+            now = time.monotonic()
+            self._record_wait(now - enqueued_at, now)
+            self._update_gauges()
+            return
+        self.active -= 1
+        self._update_gauges()
+
+
+def concurrency_limits() -> dict[str, int]:
+    """
+    Лимиты групп. Группы с БД делят пул соединений основной базы по
+    CONCURRENCY_POOL_SHARES, так что лимитер срабатывает раньше пула:
+    лишние запросы ждут в его очереди и отклоняются, а не стоят за
+    соединением до DB_POOL_TIMEOUT_SECONDS. Реплики не учитываются: чтения
+    в окне read-your-writes идут в основную базу.
+    """
+    shares = settings.CONCURRENCY_POOL_SHARES
+    if sum(shares.values()) > 1:
+        raise ValueError("CONCURRENCY_POOL_SHARES add up to more than 1")
+    overlap = shares.keys() & settings.CONCURRENCY_LIMITS.keys()
+    if overlap:
+        raise ValueError(
+            f"groups {sorted(overlap)} are in both CONCURRENCY_POOL_SHARES "
+            "and CONCURRENCY_LIMITS"
+        )
+    pool_capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    limits = {group: int(pool_capacity * share) for group, share in shares.items()}
+    starved = [group for group, limit in limits.items() if limit < 1]
+    if starved:
+        raise ValueError(
+            f"database pool of {pool_capacity} connections leaves no slot "
+            f"for groups {starved}"
+        )
+    return {**limits, **settings.CONCURRENCY_LIMITS}
+
+
+def create_concurrency_limiters() -> dict[str, ConcurrencyLimiter]:
+    return {
+        group: ConcurrencyLimiter(
+            group,
+            limit,
+            target=settings.LOAD_SHEDDING_TARGET_DELAY_SECONDS,
+            interval=settings.LOAD_SHEDDING_INTERVAL_SECONDS,
+            max_wait=settings.LOAD_SHEDDING_MAX_WAIT_SECONDS,
+        )
+        for group, limit in concurrency_limits().items()
+    }
@@ -0,0 +1,29 @@
+import sys
+
+from loguru import logger
+
+_handler_id: int | None = None
+
+
+def configure_logging() -> None:
+    """Подключает вывод логов в stdout; повторный вызов ничего не меняет."""
+    global _handler_id  # pylint:disable=global-statement
+    if _handler_id is not None:
+        return
+    _handler_id = logger.add(
+        sys.stdout,
+        colorize=True,
+        format="<green>Log:</green> [{extra[log_id]}:"
+        "{time} - <magenta>{level} - <CYAN>{message}</CYAN></magenta>]",
+        level="INFO",
+        enqueue=True,
+    )
+
+
+async def shutdown_logging() -> None:
+    """Дожидается записи всех сообщений из очереди (enqueue=True) и отключает вывод."""
+    global _handler_id  # pylint:disable=global-statement
+    await logger.complete()
+    if _handler_id is not None:
+        logger.remove(_handler_id)
+        _handler_id = None
@@ -0,0 +1,65 @@
+# pylint:disable=unused-argument,too-many-arguments,too-many-positional-arguments
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHING_DISABLED,
+    NO_CACHE_KEY,
+    NO_DIALECT_SUPPORT,
+)
+
+COMPILED_CACHE_RESULTS = {
+    CACHE_HIT: "hit",
+    CACHE_MISS: "miss",
+    CACHING_DISABLED: "disabled",
+    NO_CACHE_KEY: "no_key",
+    NO_DIALECT_SUPPORT: "unsupported",
+}
+
+sql_compiled_cache_total = Counter(
+    "sqlalchemy_compiled_cache_total",
+    "Выполненные SQL-запросы по результату поиска в кэше компиляции SQLAlchemy",
+    ["result"],
+)
+
+http_concurrency_in_flight = Gauge(
+    "http_concurrency_in_flight",
+    "Выполняющиеся запросы по группам лимита конкурентности",
+    ["group"],
+    multiprocess_mode="livesum",
+)
+
+http_concurrency_queue_depth = Gauge(
+    "http_concurrency_queue_depth",
+    "Запросы, ожидающие слот в группе лимита конкурентности",
+    ["group"],
+    multiprocess_mode="livesum",
+)
+
+http_concurrency_queue_wait_seconds = Histogram(
+    "http_concurrency_queue_wait_seconds",
+    "Время ожидания слота в очереди группы",
+    ["group"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+http_requests_shed_total = Counter(
+    "http_requests_shed_total",
+    "Запросы, отклонённые с 503 из-за перегрузки, по группе и причине",
+    ["group", "reason"],
+)
+
+
+def instrument_compiled_cache(engine: Engine) -> None:
+    """
+    Считает попадания в кэш компиляции движка. Доля попаданий —
+    rate(..{result="hit"}) / rate(..) по всем result.
+    """
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def count_cache_result(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            result = COMPILED_CACHE_RESULTS.get(context.cache_hit, "no_key")
+            sql_compiled_cache_total.labels(result=result).inc()
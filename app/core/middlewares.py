@@ -0,0 +1,312 @@
+# pylint:disable=too-many-positional-arguments,too-many-instance-attributes
+import zlib
+from collections.abc import Callable
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.encodings import choose_encoding
+from app.core.lifecycle import InFlightRequests
+from app.core.load_shedding import ConcurrencyLimiter, get_route_group
+
+try:
+    import brotli
+except ImportError:  # brotli - необязательная зависимость
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard - необязательная зависимость
+    zstandard = None
+
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        # Z_SYNC_FLUSH отдаёт клиенту всё, что накоплено, не дожидаясь конца потока
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    Сжимает ответы gzip, а при наличии библиотек - zstd и brotli.
+
+    Не сжимаются: ответы меньше minimum_size, типы вне allowlist, ответы
+    с уже заданным Content-Encoding, частичные ответы (206) и пути из
+    excluded_paths (файлы и предсжатая статика). Потоковые ответы
+    (StreamingResponse) сжимаются по мере поступления чанков.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        excluded_paths: tuple[str, ...] = (),
+        gzip_level: int = 4,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.excluded_paths = excluded_paths
+        self.encoders = {}
+        if zstandard is not None:
+            self.encoders["zstd"] = lambda: ZstdEncoder(zstd_level)
+        if brotli is not None:
+            self.encoders["br"] = lambda: BrotliEncoder(brotli_quality)
+        self.encoders["gzip"] = lambda: GzipEncoder(gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding"), tuple(self.encoders)
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(
+            self.app, encoding, self.encoders[encoding], self.minimum_size
+        )
+        await responder(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, encoder_factory, minimum_size):
+        self.app = app
+        self.encoding = encoding
+        self.encoder_factory = encoder_factory
+        self.minimum_size = minimum_size
+        self.send: Send
+        self.start_message: Message | None = None
+        self.encoder = None
+        self.passthrough = False
+        self.pending = b""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Заголовки откладываются до первого чанка тела
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                message["status"] in (204, 206, 304)
+                or "content-encoding" in headers
+                or not headers.get("content-type", "").startswith(
+                    COMPRESSIBLE_CONTENT_TYPES
+                )
+            )
+            return
+        if message_type != "http.response.body":
+            # Например, http.response.pathsend: тело отдаёт сам сервер
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.passthrough:
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        if self.encoder is None:
+            # Внешние BaseHTTPMiddleware отдают даже маленькое тело чанками:
+            # решение о сжатии ждёт minimum_size байт или конца тела
+            self.pending += body
+            if more_body and len(self.pending) < self.minimum_size:
+                return
+            body, self.pending = self.pending, b""
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self._flush_start()
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            self.encoder = self.encoder_factory()
+            self._set_encoding_headers(streaming=more_body)
+            if not more_body:
+                body = self.encoder.finish(body)
+                MutableHeaders(raw=self.start_message["headers"])["content-length"] = (
+                    str(len(body))
+                )
+            await self._flush_start()
+            if not more_body:
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+        if more_body:
+            body = self.encoder.compress(body)
+            if body:
+                await self.send(
+                    {"type": "http.response.body", "body": body, "more_body": True}
+                )
+        else:
+            await self.send(
+                {"type": "http.response.body", "body": self.encoder.finish(body)}
+            )
+
+    def _set_encoding_headers(self, streaming: bool) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["content-encoding"] = self.encoding
+        if "accept-encoding" not in headers.get("vary", "").lower():
+            headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            # Сжатое представление побайтно отличается от исходного
+            headers["etag"] = f"W/{etag}"
+        if streaming and "content-length" in headers:
+            del headers["content-length"]
+
+    async def _flush_start(self) -> None:
+        if self.start_message is not None:
+            await self.send(self.start_message)
+            self.start_message = None
+
+
+async def send_service_unavailable(
+    send: Send, retry_after: int = 1, close_connection: bool = False
+) -> None:
+    headers = [
+        (b"retry-after", str(retry_after).encode()),
+        (b"content-length", b"0"),
+    ]
+    if close_connection:
+        headers.append((b"connection", b"close"))
+    await send({"type": "http.response.start", "status": 503, "headers": headers})
+    await send({"type": "http.response.body", "body": b""})
+
+
+class InFlightMiddleware:
+    """
+    Считает выполняющиеся HTTP-запросы для graceful shutdown. Во время drain
+    (после SIGTERM и задержки снятия готовности) новые запросы получают 503
+    с Connection: close, чтобы клиент переключился на другой экземпляр.
+    exempt_paths (пробы) проходят всегда и не учитываются.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        tracker: InFlightRequests,
+        exempt_paths: tuple[str, ...] = (),
+    ):
+        self.app = app
+        self.tracker = tracker
+        self.exempt_paths = exempt_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        if self.tracker.draining:
+            await send_service_unavailable(send, close_connection=True)
+            return
+        self.tracker.started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.tracker.finished()
+
+
+class LoadSheddingMiddleware:
+    """
+    Лимит одновременных запросов по группам маршрутов (get_route_group):
+    у каждой группы свои слоты и очередь, поэтому всплеск логинов не
+    занимает слоты чтения каталога. Запрос, не дождавшийся слота,
+    получает 503 с Retry-After.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiters: dict[str, ConcurrencyLimiter],
+        get_group: Callable[[Scope], Optional[str]] = get_route_group,
+    ):
+        self.app = app
+        self.limiters = limiters
+        self.get_group = get_group
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter = None
+        if scope["type"] == "http":
+            limiter = self.limiters.get(self.get_group(scope))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        if not await limiter.acquire():
+            await send_service_unavailable(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+class DeferredHeadersMiddleware:
+    """Добавляет к ответу заголовки, собранные через add_response_headers."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                deferred = scope.get("state", {}).get("response_headers")
+                if deferred:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in deferred.items():
+                        headers.setdefault(name, value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
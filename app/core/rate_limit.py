@@ -0,0 +1,285 @@
+import asyncio
+import ipaddress
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Literal, Optional
+
+import jwt
+from fastapi import Request
+from loguru import logger
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.exceptions import TooManyRequestsException
+from app.core.redis import get_redis
+from app.core.responses import add_response_headers
+
+# Token bucket целиком выполняется в Redis: чтение, пополнение и списание
+# атомарны, а время берётся из TIME, поэтому часы воркеров не важны.
+# Дробные значения возвращаются строками: Lua-числа Redis обрезает до целых.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+
+class RateLimitDecision:
+    __slots__ = ("allowed", "limit", "remaining", "reset_after", "retry_after")
+
+    def __init__(
+        self,
+        allowed: bool,
+        *,
+        limit: int,
+        remaining: float,
+        reset_after: float,
+        retry_after: float,
+    ):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_after = reset_after
+        self.retry_after = retry_after
+
+    def headers(self, policy: str) -> dict[str, str]:
+        """Заголовки RateLimit-* (draft-ietf-httpapi-ratelimit-headers)."""
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(max(0, math.floor(self.remaining))),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+            "RateLimit-Policy": policy,
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class LocalTokenBuckets:
+    """
+    Token bucket в памяти процесса на время недоступности Redis. Лимит
+    действует на каждый воркер отдельно, а самые давние ключи вытесняются,
+    чтобы поток запросов с разных IP не съел память.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def take(
+        self, key: str, capacity: int, rate: float, cost: int = 1
+    ) -> tuple[bool, float, float]:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (float(capacity), now))
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+        allowed = tokens >= cost
+        retry_after = 0.0
+        if allowed:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, tokens, retry_after
+
+
+class RateLimiter:
+    """
+    Распределённый лимитер: корзины хранятся в Redis и общие для всех
+    воркеров. После ошибки Redis лимитер на retry_seconds переходит на
+    LocalTokenBuckets и не ждёт таймаут соединения в каждом запросе.
+    Без redis_factory работает только локально.
+    """
+
+    def __init__(
+        self,
+        redis_factory: Optional[Callable[[], Redis]] = get_redis,
+        retry_seconds: float = settings.RATE_LIMIT_REDIS_RETRY_SECONDS,
+        prefix: str = "rate_limit:",
+    ):
+        self.redis_factory = redis_factory
+        self.retry_seconds = retry_seconds
+        self.prefix = prefix
+        self.local = LocalTokenBuckets()
+        self._redis_down_until = 0.0
+        self._script: Optional[AsyncScript] = None
+
+    def _get_script(self) -> AsyncScript:
+        redis = self.redis_factory()
+        if self._script is None or self._script.registered_client is not redis:
+            self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+        return self._script
+
+    async def _take_redis(
+        self, key: str, capacity: int, rate: float
+    ) -> tuple[bool, float, float]:
+        allowed, tokens, retry_after = await self._get_script()(
+            keys=[self.prefix + key], args=[capacity, rate, 1]
+        )
+        return bool(allowed), float(tokens), float(retry_after)
+
+    async def hit(self, key: str, capacity: int, rate: float) -> RateLimitDecision:
+        """Списывает один токен из корзины key (rate - токенов в секунду)."""
+        result = None
+        if (
+            self.redis_factory is not None
+            and time.monotonic() >= self._redis_down_until
+        ):
+            try:
+                result = await self._take_redis(key, capacity, rate)
+            except (RedisError, OSError, asyncio.TimeoutError) as exc:
+                self._redis_down_until = time.monotonic() + self.retry_seconds
+                logger.warning(f"Rate limiter falls back to local buckets: {exc}")
+        if result is None:
+            result = self.local.take(key, capacity, rate)
+        allowed, tokens, retry_after = result
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=capacity,
+            remaining=tokens,
+            reset_after=(capacity - tokens) / rate,
+            retry_after=retry_after,
+        )
+
+
+rate_limiter = RateLimiter()
+
+
+@lru_cache
+def trusted_networks(
+    proxies: tuple[str, ...],
+) -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(
+        address in network
+        for network in trusted_networks(tuple(settings.TRUSTED_PROXIES))
+    )
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Адрес клиента для корзины. За доверенным прокси (TRUSTED_PROXIES) это
+    правый адрес X-Forwarded-For, не принадлежащий доверенным прокси: левые
+    значения клиент может подставить сам. От остальных пиров заголовок
+    игнорируется.
+    """
+    if request.client is None:
+        return "unknown"
+    host = request.client.host
+    if not is_trusted_proxy(host):
+        return host
+    forwarded = request.headers.get("x-forwarded-for", "")
+    for address in reversed([part.strip() for part in forwarded.split(",")]):
+        if not address:
+            break
+        host = address
+        if not is_trusted_proxy(address):
+            break
+    return host
+
+
+def get_user_id(request: Request) -> Optional[str]:
+    """id пользователя из access-токена; невалидный токен - как его отсутствие."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+    except jwt.PyJWTError:
+        return None
+    user_id = payload.get("id")
+    return str(user_id) if user_id is not None else None
+
+
+class RateLimit:
+    """
+    Зависимость маршрута с политикой per_minute запросов в минуту и
+    всплеском до burst. Корзина отдельная для каждого маршрута и клиента:
+    по IP или по id пользователя из JWT (без токена - по IP).
+
+        @router.post("/token", dependencies=[Depends(RateLimit("login", 10))])
+    """
+
+    def __init__(
+        self,
+        name: str,
+        per_minute: int,
+        *,
+        key: Literal["ip", "user"] = "ip",
+        burst: Optional[int] = None,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.name = name
+        self.capacity = burst or per_minute
+        self.rate = per_minute / 60
+        self.key = key
+        self.limiter = limiter or rate_limiter
+        self.policy = f"{per_minute};w=60;burst={self.capacity}"
+
+    def client_key(self, request: Request) -> str:
+        if self.key == "user":
+            user_id = get_user_id(request)
+            if user_id is not None:
+                return f"user:{user_id}"
+        return f"ip:{get_client_ip(request)}"
+
+    async def __call__(self, request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", request.url.path)
+        decision = await self.limiter.hit(
+            f"{self.name}:{route_path}:{self.client_key(request)}",
+            self.capacity,
+            self.rate,
+        )
+        headers = decision.headers(self.policy)
+        if not decision.allowed:
+            raise TooManyRequestsException(headers=headers)
+        add_response_headers(request, headers)
+
+
+login_rate_limit = RateLimit("login", settings.RATE_LIMIT_LOGIN_PER_MINUTE)
+upload_rate_limit = RateLimit("upload", settings.RATE_LIMIT_UPLOAD_PER_MINUTE)
+catalog_rate_limit = RateLimit(
+    "catalog", settings.RATE_LIMIT_CATALOG_PER_MINUTE, key="user"
+)
+export_rate_limit = RateLimit(
+    "export", settings.RATE_LIMIT_EXPORT_PER_MINUTE, key="user"
+)
@@ -0,0 +1,30 @@
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+_redis: Optional[Redis] = None
+
+
+def get_redis() -> Redis:
+    """
+    Общий клиент Redis приложения. Пул соединений создаётся при первом
+    обращении и закрывается в lifespan через close_redis.
+    """
+    global _redis  # pylint:disable=global-statement
+    if _redis is None:
+        _redis = Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        )
+    return _redis
+
+
+async def close_redis() -> None:
+    global _redis  # pylint:disable=global-statement
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -0,0 +1,105 @@
+import hashlib
+import re
+from typing import Any, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic_core import to_json
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+from app.core.files import NOT_MODIFIED_HEADERS, is_not_modified
+
+
+class JSONBytesResponse(Response):
+    """
+    JSON-ответ для быстрых read-only эндпоинтов: строки из БД сериализуются
+    напрямую через pydantic-core, без повторной валидации через response_model.
+    Схема OpenAPI по-прежнему берётся из response_model маршрута.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
+
+
+def make_weak_etag(body: bytes) -> str:
+    """Слабый ETag: одинаковое JSON-тело, но сжатие может отличаться."""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+VERSION_ETAG = re.compile(r'^(?:W/)?"v(\d+)"$')
+
+
+def version_etag(version: int) -> str:
+    """
+    Сильный ETag строки по её версии: известен до сериализации ответа.
+    Если ответ сжимается, CompressionMiddleware делает его слабым.
+    """
+    return f'"v{version}"'
+
+
+def parse_version_etag(etag: str) -> Optional[int]:
+    """
+    Версия из нашего ETag "v3" или W/"v3"; None для чужого формата.
+    W/ к версионному ETag добавляет только сжатие: версия строки та же,
+    поэтому If-Match сравнивает по версии, а не побайтно.
+    """
+    match = VERSION_ETAG.match(etag.strip())
+    return int(match.group(1)) if match else None
+
+
+def cached_json_response(
+    request: Request,
+    content: Any,
+    cache_control: str = settings.CATALOG_CACHE_CONTROL,
+    etag: Optional[str] = None,
+    extra_headers: Optional[dict[str, str]] = None,
+) -> Response:
+    """
+    JSON-ответ публичного каталога с ETag, Cache-Control и Vary. Без etag
+    он считается по хэшу тела; с version_etag 304 на совпавший
+    If-None-Match отдаётся без сериализации. extra_headers идут только
+    в 200: 304 клиент дополняет заголовками из своего кэша.
+    """
+    body = None
+    if etag is None:
+        body = content if isinstance(content, bytes) else to_json(content)
+        etag = make_weak_etag(body)
+    headers = {
+        "etag": etag,
+        "cache-control": cache_control,
+        "vary": "Accept-Encoding",
+    }
+    if is_not_modified(Headers(headers), request.headers):
+        return Response(
+            status_code=304,
+            headers={
+                name: headers[name] for name in NOT_MODIFIED_HEADERS if name in headers
+            },
+        )
+    if extra_headers:
+        headers.update(extra_headers)
+    return JSONBytesResponse(content if body is None else body, headers=headers)
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_headers(next_cursor: Optional[str]) -> dict[str, str]:
+    """Курсор следующей страницы; на последней странице заголовка нет."""
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+
+
+def add_response_headers(request: Request, headers: dict[str, str]) -> None:
+    """
+    Заголовки, которые зависимость хочет добавить к ответу. FastAPI не
+    переносит заголовки из параметра response, если эндпоинт сам вернул
+    Response (как с JSONBytesResponse), поэтому их добавляет
+    DeferredHeadersMiddleware из request.state.
+    """
+    state = request.scope.setdefault("state", {})
+    state.setdefault("response_headers", {}).update(headers)
@@ -0,0 +1,104 @@
+import json
+import os
+from functools import lru_cache
+from mimetypes import guess_type
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.types import Scope
+
+from app.core.encodings import choose_encoding
+
+
+STATIC_DIRECTORY = "app/static"
+STATIC_URL_PREFIX = "/static"
+DIST_DIRECTORY = "dist"
+MANIFEST_FILE = "manifest.json"
+
+# Кодировки предсобранных копий в порядке предпочтения сервера
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles, отдающий заранее сжатые копии (.br / .gz), собранные
+    scripts/build_assets.py, вместо сжатия на каждый запрос.
+
+    Файлы с отпечатком содержимого из каталога dist/ получают immutable
+    Cache-Control, остальные - no-cache с ревалидацией по ETag.
+    """
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        headers = {
+            "cache-control": self._cache_control(self.get_path(scope)),
+            "vary": "Accept-Encoding",
+        }
+        media_type = guess_type(str(full_path))[0] or "text/plain"
+
+        available = tuple(
+            encoding
+            for encoding, suffix in PRECOMPRESSED_SUFFIXES.items()
+            if os.path.isfile(f"{full_path}{suffix}")
+        )
+        encoding = choose_encoding(request_headers.get("accept-encoding"), available)
+        if encoding is not None:
+            full_path = f"{full_path}{PRECOMPRESSED_SUFFIXES[encoding]}"
+            stat_result = os.stat(full_path)
+            headers["content-encoding"] = encoding
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=stat_result,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return Response(
+                status_code=304,
+                headers={
+                    name: value
+                    for name, value in response.headers.items()
+                    if name in ("etag", "cache-control", "vary", "content-encoding")
+                },
+            )
+        return response
+
+    @staticmethod
+    def _cache_control(path: str) -> str:
+        if path.replace(os.sep, "/").startswith(f"{DIST_DIRECTORY}/"):
+            return IMMUTABLE_CACHE_CONTROL
+        return REVALIDATE_CACHE_CONTROL
+
+
+@lru_cache()
+def get_asset_manifest() -> dict[str, str]:
+    """
+    Загружает манифест {исходное имя: имя с отпечатком}.
+    Если ассеты не собраны, возвращает пустой словарь.
+    """
+    manifest_path = os.path.join(STATIC_DIRECTORY, DIST_DIRECTORY, MANIFEST_FILE)
+    try:
+        with open(manifest_path, encoding="utf-8") as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return {}
+
+
+def static_url(name: str) -> str:
+    """
+    Возвращает URL ассета для шаблонов, например
+    static_url("css/style.css") -> "/static/dist/css/style.3f2a9c1d0b7e.css".
+    """
+    return f"{STATIC_URL_PREFIX}/{get_asset_manifest().get(name, name)}"
@@ -1,54 +1,78 @@
 # pylint:disable=broad-exception-caught
 import os
-import sys
 import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from uuid import uuid4
-from typing import Annotated
-import aiofiles
-
-# from datetime import datetime, timedelta, timezone
-from celery import Celery
 
 # from celery.schedules import crontab
 from loguru import logger
-from fastapi import FastAPI, Request, File, UploadFile, HTTPException, status, Path
+from prometheus_client import multiprocess
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
-from fastapi.staticfiles import StaticFiles
-from app.api import category_router, product_router, review_router, user_router
-from app.task import call_background_task
+from fastapi.responses import JSONResponse
+from app.api import (
+    category_router,
+    files_router,
+    health_router,
+    metrics_router,
+    product_router,
+    review_router,
+    user_router,
+)
+from app.api.routers.files import AVATARS_DIRECTORY
 from app.core.config import settings
-
-
-if not os.path.exists("app/files/avatars"):
-    os.makedirs("app/files/avatars")
-
-logger.add(
-    sys.stdout,
-    colorize=True,
-    format="<green>Log:</green> [{extra[log_id]}:"
-    "{time} - <magenta>{level} - <CYAN>{message}</CYAN></magenta>]",
-    level="INFO",
-    enqueue=True,
+from app.core.database import database
+from app.core.lifecycle import SigtermDrain, in_flight_requests
+from app.core.load_shedding import create_concurrency_limiters
+from app.core.logging_config import configure_logging, shutdown_logging
+from app.core.middlewares import (
+    CompressionMiddleware,
+    DeferredHeadersMiddleware,
+    InFlightMiddleware,
+    LoadSheddingMiddleware,
 )
+from app.core.redis import close_redis
+from app.core.responses import NEXT_CURSOR_HEADER
+from app.core.static import PrecompressedStaticFiles, STATIC_DIRECTORY
 
-celery = Celery(
-    __name__,
-    broker=f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/0",
-    backend=f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/0",
-    broker_connection_retry_on_startup=True,
-)
 
-app = FastAPI(
-    title="FastAPI ecommerce - Интеренет магазин",
-    version="0.1.0",
-)
+allow_origins = ["http://localhost:8000"]
 
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """
+    Всё, что требует ввода-вывода, создаётся при старте приложения, а не при
+    импорте модуля: логирование, каталоги для файлов и пулы соединений с БД.
+
+    По SIGTERM /readyz сразу отдаёт 503, через
+    SHUTDOWN_READINESS_DELAY_SECONDS новые запросы отклоняются, а начатые
+    дорабатывают не дольше SHUTDOWN_DRAIN_TIMEOUT_SECONDS; только потом
+    сигнал получает сервер (SigtermDrain). При остановке закрываются пулы
+    БД и Redis и дописывается очередь логов.
+    """
+    configure_logging()
+    in_flight_requests.reset()
+    sigterm_drain = SigtermDrain(
+        in_flight_requests,
+        readiness_delay=settings.SHUTDOWN_READINESS_DELAY_SECONDS,
+        timeout=settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS,
+    )
+    sigterm_drain.install()
+    os.makedirs(AVATARS_DIRECTORY, exist_ok=True)
+    database.connect()
+    try:
+        yield
+    finally:
+        sigterm_drain.uninstall()
+        await database.dispose()
+        await close_redis()
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            multiprocess.mark_process_dead(os.getpid())
+        await shutdown_logging()
 
 
-@app.middleware("http")
 async def log_middleware(request: Request, call_next):
     log_id = uuid4()
     with logger.contextualize(log_id=log_id):
@@ -65,18 +89,6 @@ async def log_middleware(request: Request, call_next):
         return response
 
 
-allow_origins = ["http://localhost:8000"]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allow_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-@app.middleware("http")
 async def timing_middleware(request: Request, call_next):
     start_time = time.time()
     response = await call_next(request)
@@ -85,134 +97,66 @@ async def timing_middleware(request: Request, call_next):
     return response
 
 
-# app.add_middleware(TrustedHostMiddleware, allow_hosts=["http://127.0.0.1:8000"])
-# app.add_middleware(HTTPSRedirectMiddleware)
-
-app.include_router(category_router)
-app.include_router(product_router)
-app.include_router(review_router)
-app.include_router(user_router)
-
-
-@app.get("/")
-async def root(message):
-    """Корневой маршрут, подверждающий, что API работает."""
-    # task_datetime = datetime.now(timezone.utc) + timedelta(minutes=1)
-    call_background_task.apply_async(args=[message], expires=3600)
+async def root():
+    """
+    Корневой маршрут, подверждающий, что API работает. Фоновых задач не
+    ставит; для проверок состояния есть /healthz и /readyz.
+    """
     return {"message": "Добро пожаловать в API интернет-магазина!"}
 
 
-celery.conf.beat_schedule = {
-    "run-me-background-task": {
-        "task": "app.task.call_background_task",
-        "schedule": 60.0,
-        "args": ("Test text message",),
-    }
-}
-
-
-@app.post("/uploadfile_async_save")
-async def create_upload_file_async_save(files: list[UploadFile] = File(...)):
-
-    response_info = []
-
-    for file in files:
+def create_app() -> FastAPI:
+    application = FastAPI(
+        title="FastAPI ecommerce - Интеренет магазин",
+        version="0.1.0",
+        lifespan=lifespan,
+    )
 
-        filename_lower = file.filename.lower()
-        file_ext = os.path.splitext(filename_lower)[1]
+    application.mount(
+        "/static", PrecompressedStaticFiles(directory=STATIC_DIRECTORY), name="static"
+    )
 
-        if file.content_type not in settings.ALLOWED_IMAGE_MIME_TYPES:
-            raise HTTPException(
-                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-                detail=f"Unsupported file type: '{file.content_type}.'"
-                f"Only {', '.join(settings.ALLOWED_IMAGE_MIME_TYPES)} are allowed.",
-            )
+    application.middleware("http")(log_middleware)
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=allow_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["ETag", NEXT_CURSOR_HEADER],
+    )
+    application.middleware("http")(timing_middleware)
+    application.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        excluded_paths=("/download/", "/stream-large-file/", "/static/"),
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+    )
+    application.add_middleware(DeferredHeadersMiddleware)
+    if settings.LOAD_SHEDDING_ENABLED:
+        application.add_middleware(
+            LoadSheddingMiddleware, limiters=create_concurrency_limiters()
+        )
+    application.add_middleware(
+        InFlightMiddleware,
+        tracker=in_flight_requests,
+        exempt_paths=("/healthz", "/readyz"),
+    )
 
-        if file_ext not in settings.ALLOWED_FILE_EXTENSIONS:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported file extension: '{file_ext}'. "
-                f"Only {', '.join(settings.ALLOWED_FILE_EXTENSIONS)} are allowed.",
-            )
+    # application.add_middleware(TrustedHostMiddleware, allow_hosts=["http://127.0.0.1:8000"])
+    # application.add_middleware(HTTPSRedirectMiddleware)
 
-        file_location = f"app/files/avatars/{file.filename}"
-        try:
-            async with aiofiles.open(file_location, "wb") as out_file:
-                chunk_size = 1024 * 1024
-                current_size = 0
-                while content := await file.read(chunk_size):
-                    current_size += len(content)
-                    if current_size > settings.MAX_FILE_SIZE_BYTES:
-                        raise HTTPException(
-                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                            detail=f"File too large. Max size is {settings.MAX_FILE_SIZE_MB}MB.",
-                        )
-                    await out_file.write(content)
-            response_info.append(
-                {
-                    "filename": file.filename,
-                    "content_type": file.content_type,
-                    "size_bytes": current_size,
-                    "status": "File uploaded and size validated successfully.",
-                }
-            )
-        except HTTPException as e:
-            if os.path.exists(file_location):
-                os.remove(file_location)
-            response_info.append(
-                {
-                    "filename": file.filename,
-                    "status": "error",
-                    "message": f"Could not save file: {e}",
-                }
-            )
-        except Exception as e:
-            # Общая обработка других возможных ошибок (например, проблем с диском)
-            if os.path.exists(file_location):
-                os.remove(file_location)  # Удаляем неполный файл
-            response_info.append(
-                {
-                    "filename": file.filename,
-                    "status": "error",
-                    "message": f"An unexpected error occurred during file upload: {e}",
-                }
-            )
-        finally:
-            await file.close()
-
-    return {"uploaded_files": response_info}
-
-
-@app.get("/download/{file_name}", response_class=FileResponse)
-async def download_file(file_name: Annotated[str, Path(...)]):
-    file_path = os.path.join("app/files/avatars/", file_name)
-
-    if not os.path.exists(file_path) or not os.path.isfile(file_path):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="File not found."
-        )
-    return FileResponse(path=file_path, filename=file_name)
+    application.include_router(category_router)
+    application.include_router(product_router)
+    application.include_router(review_router)
+    application.include_router(user_router)
+    application.include_router(metrics_router)
+    application.include_router(files_router)
+    application.include_router(health_router)
+    application.get("/")(root)
+    return application
 
 
-async def file_streamer(file_path: str, chunk_size: int = 8192):
-    try:
-        async with aiofiles.open(file_path, mode="rb") as file:
-            while True:
-                chunk = await file.read(chunk_size)
-                if not chunk:
-                    break
-                yield chunk
-    except FileNotFoundError:
-        print(f"Error: File not found at {file_path}")
-
-
-@app.get("/stream-large-file/{file_name}")
-async def stream_large_file(file_name: str):
-    file_path = os.path.join("app/files/", file_name)
-    if not os.path.exists(file_path):
-        return {
-            "error": f"File '{file_path}' not found on server. Please restart the application."
-        }
-    return StreamingResponse(
-        file_streamer(file_path), media_type="application/octet-stream"
-    )
+app = create_app()
@@ -0,0 +1,34 @@
+"""add version columns
+
+Revision ID: 3f9c2a7d51e4
+Revises: 8dbac9b43d88
+Create Date: 2026-10-19 11:50:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d51e4'
+down_revision: Union[str, Sequence[str], None] = '8dbac9b43d88'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Константный DEFAULT в PostgreSQL 11+ не переписывает таблицу
+    for table in ('products', 'categories', 'reviews'):
+        op.add_column(
+            table,
+            sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('reviews', 'categories', 'products'):
+        op.drop_column(table, 'version')
@@ -0,0 +1,53 @@
+"""add product review stats
+
+Revision ID: b7e41d9c0a26
+Revises: 3f9c2a7d51e4
+Create Date: 2026-10-19 11:58:40.102934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e41d9c0a26'
+down_revision: Union[str, Sequence[str], None] = '3f9c2a7d51e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'product_review_stats',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('review_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('grade_1', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('grade_2', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('grade_3', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('grade_4', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('grade_5', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.PrimaryKeyConstraint('product_id')
+    )
+    # Начальное заполнение; пересобрать позже: python -m scripts.rebuild_review_stats
+    op.execute(
+        """
+        INSERT INTO product_review_stats
+            (product_id, review_count, grade_1, grade_2, grade_3, grade_4, grade_5)
+        SELECT product_id, count(*),
+               count(*) FILTER (WHERE grade = 1), count(*) FILTER (WHERE grade = 2),
+               count(*) FILTER (WHERE grade = 3), count(*) FILTER (WHERE grade = 4),
+               count(*) FILTER (WHERE grade = 5)
+        FROM reviews
+        WHERE is_active
+        GROUP BY product_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('product_review_stats')
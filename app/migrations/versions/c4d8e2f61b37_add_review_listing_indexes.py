@@ -0,0 +1,74 @@
+"""add review listing indexes
+
+Revision ID: c4d8e2f61b37
+Revises: b7e41d9c0a26
+Create Date: 2026-10-19 15:20:41.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2f61b37'
+down_revision: Union[str, Sequence[str], None] = 'b7e41d9c0a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INVALID_INDEX = sa.text(
+    'SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid '
+    'WHERE pg_class.relname = :name AND NOT pg_index.indisvalid'
+)
+
+
+def create_index_concurrently(name, table, columns, **kwargs) -> None:
+    # Прерванный CONCURRENTLY оставляет невалидный индекс, который
+    # IF NOT EXISTS принял бы за готовый: такой удаляется и строится заново
+    online = not op.get_context().as_sql
+    if online and op.get_bind().execute(INVALID_INDEX, {'name': name}).first():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    op.create_index(
+        name,
+        table,
+        columns,
+        postgresql_concurrently=True,
+        if_not_exists=True,
+        **kwargs,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись отзывов, но не работает в транзакции
+    with op.get_context().autocommit_block():
+        create_index_concurrently(
+            'ix_reviews_product_active_date',
+            'reviews',
+            ['product_id', 'is_active', sa.text('comment_date DESC'), sa.text('id DESC')],
+        )
+        create_index_concurrently(
+            'ix_reviews_user_product',
+            'reviews',
+            ['user_id', 'product_id'],
+            postgresql_include=['is_active'],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_reviews_user_product',
+            table_name='reviews',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_reviews_product_active_date',
+            table_name='reviews',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,80 @@
+"""add foreign key indexes
+
+Revision ID: d1a5f9e3c802
+Revises: c4d8e2f61b37
+Create Date: 2026-10-19 16:05:13.557920
+
+Индексы строятся через CREATE INDEX CONCURRENTLY вне транзакции миграции:
+запись в таблицы не блокируется, поэтому миграцию можно катить на живую
+базу. reviews.product_id и reviews.user_id уже покрыты ведущими колонками
+индексов ix_reviews_product_active_date и ix_reviews_user_product.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1a5f9e3c802'
+down_revision: Union[str, Sequence[str], None] = 'c4d8e2f61b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text('is_active = true')
+
+# (имя, таблица, колонки, условие частичного индекса)
+INDEXES = (
+    # Товары категории в каталоге - только активные
+    ('ix_products_category_id_active', 'products', ['category_id'], ACTIVE),
+    # Проверка FK при удалении пользователя смотрит все товары продавца
+    ('ix_products_seller_id', 'products', ['seller_id'], None),
+    ('ix_categories_parent_id_active', 'categories', ['parent_id'], ACTIVE),
+    # Лента всех отзывов (GET /reviews): keyset-страница по дате без сортировки
+    (
+        'ix_reviews_date_active',
+        'reviews',
+        [sa.text('comment_date DESC'), sa.text('id DESC')],
+        ACTIVE,
+    ),
+)
+
+INVALID_INDEX = sa.text(
+    'SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid '
+    'WHERE pg_class.relname = :name AND NOT pg_index.indisvalid'
+)
+
+
+def create_index_concurrently(name, table, columns, where) -> None:
+    # Прерванный CONCURRENTLY оставляет невалидный индекс, который
+    # IF NOT EXISTS принял бы за готовый: такой удаляется и строится заново
+    online = not op.get_context().as_sql
+    if online and op.get_bind().execute(INVALID_INDEX, {'name': name}).first():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    op.create_index(
+        name,
+        table,
+        columns,
+        postgresql_where=where,
+        postgresql_concurrently=True,
+        if_not_exists=True,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            create_index_concurrently(name, table, columns, where)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,61 @@
+"""add review grade index
+
+Revision ID: e5c2a8b4f917
+Revises: d1a5f9e3c802
+Create Date: 2026-10-19 18:42:07.318264
+
+Отзывы товара с сортировкой по оценке (sort=grade) читаются keyset-страницей
+по (grade, comment_date, id). Индекс по дате этот порядок не даёт, и без
+этого индекса PostgreSQL сортирует все отзывы товара на каждую страницу.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c2a8b4f917'
+down_revision: Union[str, Sequence[str], None] = 'd1a5f9e3c802'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_reviews_product_active_grade'
+
+INVALID_INDEX = sa.text(
+    'SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid '
+    'WHERE pg_class.relname = :name AND NOT pg_index.indisvalid'
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # Невалидный индекс от прерванного CONCURRENTLY строится заново
+        online = not op.get_context().as_sql
+        if online and op.get_bind().execute(INVALID_INDEX, {'name': INDEX_NAME}).first():
+            op.drop_index(INDEX_NAME, table_name='reviews', postgresql_concurrently=True)
+        op.create_index(
+            INDEX_NAME,
+            'reviews',
+            [
+                'product_id',
+                'is_active',
+                sa.text('grade DESC'),
+                sa.text('comment_date DESC'),
+                sa.text('id DESC'),
+            ],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX_NAME,
+            table_name='reviews',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -1,6 +1,7 @@
 from app.models.categories import Category
 from app.models.products import Product
 from app.models.reviews import Review
+from app.models.review_stats import ProductReviewStats
 from app.models.users import User
 
-__all__ = ["Category", "Product", "Review", "User"]
+__all__ = ["Category", "Product", "ProductReviewStats", "Review", "User"]
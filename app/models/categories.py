@@ -1,6 +1,6 @@
-# ruff: noqa: F821
+# ruff: noqa: F821, E712
 from typing import Optional
-from sqlalchemy import String, Integer, Boolean, ForeignKey
+from sqlalchemy import String, Integer, Boolean, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
@@ -14,6 +14,10 @@ class Category(Base):
         ForeignKey("categories.id"), nullable=True
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Версия строки: растёт при каждой записи, служит ETag и условием If-Match
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
     products: Mapped[list["Product"]] = relationship(  # ignore ruff
         "Product", back_populates="category", uselist=True
     )
@@ -23,3 +27,10 @@ class Category(Base):
     children: Mapped[list["Category"]] = relationship(
         "Category", back_populates="parent"
     )
+
+
+Index(
+    "ix_categories_parent_id_active",
+    Category.parent_id,
+    postgresql_where=Category.is_active == True,
+)
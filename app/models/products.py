@@ -1,6 +1,6 @@
-# ruff: noqa: F821
+# ruff: noqa: F821, E712
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Boolean, Integer, Float, ForeignKey, Numeric
+from sqlalchemy import String, Boolean, Integer, Float, ForeignKey, Numeric, Index
 from app.core.database import Base
 
 
@@ -19,6 +19,10 @@ class Product(Base):
     )
     rating: Mapped[float] = mapped_column(Numeric(5, 2), default=0.0, nullable=False)
     seller_id: Mapped[str] = mapped_column(ForeignKey("users.id"), nullable=False)
+    # Версия строки: растёт при каждой записи, служит ETag и условием If-Match
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
     category: Mapped["Category"] = relationship(
         "Category", back_populates="products"
     )  # ignore
@@ -26,3 +30,13 @@ class Product(Base):
     reviews: Mapped[list["Review"]] = relationship(
         "Review", back_populates="product", uselist=True
     )
+
+
+# Товары категории в каталоге: только активные, индекс меньше
+Index(
+    "ix_products_category_id_active",
+    Product.category_id,
+    postgresql_where=Product.is_active == True,
+)
+# Проверка FK при удалении пользователя смотрит все товары продавца
+Index("ix_products_seller_id", Product.seller_id)
@@ -0,0 +1,34 @@
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+
+class ProductReviewStats(Base):
+    """
+    Сводка отзывов товара: число активных отзывов и распределение оценок.
+    Обновляется в той же транзакции, что и запись отзыва.
+    """
+
+    __tablename__ = "product_review_stats"
+
+    product_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("products.id"), primary_key=True
+    )
+    review_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    grade_1: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    grade_2: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    grade_3: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    grade_4: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    grade_5: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
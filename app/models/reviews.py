@@ -1,7 +1,7 @@
-# ruff: noqa: F821
+# ruff: noqa: F821, E712
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Boolean, Integer, ForeignKey, DateTime
+from sqlalchemy import String, Boolean, Integer, ForeignKey, DateTime, Index
 from app.core.database import Base
 
 
@@ -21,6 +21,44 @@ class Review(Base):
     )
     grade: Mapped[int] = mapped_column(Integer, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Версия строки: растёт при каждой записи, служит ETag и условием If-Match
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
 
     user: Mapped["User"] = relationship("User", back_populates="reviews")
     product: Mapped["Product"] = relationship("Product", back_populates="reviews")
+
+
+# Список отзывов товара по дате: фильтр и порядок keyset-страницы из индекса
+Index(
+    "ix_reviews_product_active_date",
+    Review.product_id,
+    Review.is_active,
+    Review.comment_date.desc(),
+    Review.id.desc(),
+)
+# Отзывы товара по оценке (sort=grade): тот же keyset-порядок без сортировки
+Index(
+    "ix_reviews_product_active_grade",
+    Review.product_id,
+    Review.is_active,
+    Review.grade.desc(),
+    Review.comment_date.desc(),
+    Review.id.desc(),
+)
+# Лента всех отзывов (GET /reviews) по дате
+Index(
+    "ix_reviews_date_active",
+    Review.comment_date.desc(),
+    Review.id.desc(),
+    postgresql_where=Review.is_active == True,
+)
+# Отзывы пользователя и проверка дубля отзыва; is_active в INCLUDE
+# позволяет check_existing обойтись index-only scan
+Index(
+    "ix_reviews_user_product",
+    Review.user_id,
+    Review.product_id,
+    postgresql_include=["is_active"],
+)
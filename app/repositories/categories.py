@@ -1,10 +1,39 @@
 # ruff: noqa: E712
-from typing import Optional
-from sqlalchemy import select, update
+from collections.abc import Sequence
+from typing import Any, Optional
+from sqlalchemy import ColumnElement, bindparam, exists, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.models.categories import Category as CategoryModel
-from app.schemas.categories import CategoryCreate
+from app.schemas.categories import CategoryCreate, Category
+from app.repositories.columns import schema_columns, rows_as_dicts, any_of
+from app.repositories.integrity import integrity_errors, literal_columns
+
+
+CATEGORY_ROW_COLUMNS = schema_columns(CategoryModel, Category)
+
+_ACTIVE_CATEGORY = CategoryModel.is_active == True
+
+SELECT_CATEGORY_ROWS = select(*CATEGORY_ROW_COLUMNS).where(_ACTIVE_CATEGORY)
+SELECT_CATEGORY_ROW_BY_ID = SELECT_CATEGORY_ROWS.where(
+    CategoryModel.id == bindparam("category_id")
+)
+SELECT_CATEGORY_BY_ID = select(CategoryModel).where(
+    CategoryModel.id == bindparam("category_id"), _ACTIVE_CATEGORY
+)
+SELECT_CATEGORY_BY_NAME = select(CategoryModel).where(
+    CategoryModel.name == bindparam("name"), _ACTIVE_CATEGORY
+)
+
+
+def active_category_exists(category_id: int) -> ColumnElement[bool]:
+    """
+    EXISTS-условие на активную категорию для записи одним запросом. Алиас
+    нужен, чтобы подзапрос не коррелировал с UPDATE самой таблицы categories.
+    """
+    category = aliased(CategoryModel)
+    return exists().where(category.id == category_id, category.is_active == True)
 
 
 class CategoryRepository:
@@ -20,14 +49,43 @@ class CategoryRepository:
         categories = result.all()
         return categories
 
+    async def get_all_rows(self) -> list[dict[str, Any]]:
+        """Возвращает активные категории строками с полями схемы Category."""
+        result = await self.db.execute(SELECT_CATEGORY_ROWS)
+        return rows_as_dicts(result)
+
+    async def get_rows_by_ids(self, ids: list[int]) -> list[dict[str, Any]]:
+        """Возвращает активные строки по списку ID одним запросом."""
+        result = await self.db.execute(
+            select(*CATEGORY_ROW_COLUMNS).where(
+                any_of(CategoryModel.id, ids), CategoryModel.is_active == True
+            )
+        )
+        return rows_as_dicts(result)
+
+    async def get_row_by_id(self, category_id: int) -> Optional[dict[str, Any]]:
+        result = await self.db.execute(
+            SELECT_CATEGORY_ROW_BY_ID, {"category_id": category_id}
+        )
+        rows = rows_as_dicts(result)
+        return rows[0] if rows else None
+
     async def get_by_id(self, category_id: int) -> Optional[CategoryModel]:
-        stmt = select(CategoryModel).where(
-            CategoryModel.id == category_id, CategoryModel.is_active == True
+        result = await self.db.scalars(
+            SELECT_CATEGORY_BY_ID, {"category_id": category_id}
         )
-        result = await self.db.scalars(stmt)
         category = result.first()
         return category
 
+    async def get_by_ids(self, category_ids: list[int]) -> Sequence[CategoryModel]:
+        """Возвращает активные категории по списку ID одним запросом."""
+        result = await self.db.scalars(
+            select(CategoryModel).where(
+                any_of(CategoryModel.id, category_ids), CategoryModel.is_active == True
+            )
+        )
+        return result.all()
+
     async def get_parent_id(self, parent_id: int) -> Optional[CategoryModel]:
         stmt = select(CategoryModel).where(
             CategoryModel.parent_id == parent_id, CategoryModel.is_active == True
@@ -37,36 +95,68 @@ class CategoryRepository:
         return category
 
     async def get_by_name(self, name: str) -> Optional[CategoryModel]:
-        stmt = select(CategoryModel).where(
-            CategoryModel.name == name, CategoryModel.is_active == True
-        )
-        result = await self.db.scalars(stmt)
+        result = await self.db.scalars(SELECT_CATEGORY_BY_NAME, {"name": name})
         category = result.first()
         return category
 
-    async def create(self, category_create: CategoryCreate) -> CategoryModel:
-        """Создает новую категорию."""
-        category = CategoryModel(**category_create.model_dump())
-        self.db.add(category)
-        await self.db.commit()
-        await self.db.refresh(category)
-        return category
+    async def create(self, category_create: CategoryCreate) -> Optional[dict[str, Any]]:
+        """
+        Создает новую категорию одним запросом INSERT ... SELECT ... RETURNING.
+        Строка не вставляется, если родитель не найден или удалён, — тогда
+        возвращается None. Дубликат имени отсекает ограничение unique.
+        """
+        values = category_create.model_dump()
+        source = select(*literal_columns(CategoryModel, values))
+        if category_create.parent_id is not None:
+            source = source.where(active_category_exists(category_create.parent_id))
+        async with integrity_errors(
+            self.db,
+            conflict=f"Category '{category_create.name}' already exists",
+            not_found=f"Parent category with id {category_create.parent_id} not found",
+        ):
+            result = await self.db.execute(
+                insert(CategoryModel)
+                .from_select(list(values), source)
+                .returning(*CATEGORY_ROW_COLUMNS)
+            )
+            rows = rows_as_dicts(result)
+            await self.db.commit()
+        return rows[0] if rows else None
 
     async def update(
         self,
         category_id: int,
-        category_update: CategoryCreate,
-    ) -> Optional[CategoryModel]:
-        """Обновляет новую категорию по ее ID."""
-        result = await self.db.execute(
-            update(CategoryModel)
-            .where(CategoryModel.id == category_id)
-            .values(**category_update.model_dump())
+        values: dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[dict[str, Any]]:
+        """
+        Обновляет категорию по ее ID одним запросом UPDATE ... RETURNING:
+        пишутся только колонки из values, версия увеличивается; с
+        expected_version - только в этой версии.
+        Возвращает None, если категория или новый родитель не найдены или
+        версия изменилась.
+        """
+        stmt = update(CategoryModel).where(
+            CategoryModel.id == category_id, CategoryModel.is_active == True
         )
-        await self.db.commit()
-        if result.rowcount > 0:
-            return await self.get_by_id(category_id)
-        return None
+        if expected_version is not None:
+            stmt = stmt.where(CategoryModel.version == expected_version)
+        parent_id = values.get("parent_id")
+        if parent_id is not None:
+            stmt = stmt.where(active_category_exists(parent_id))
+        async with integrity_errors(
+            self.db,
+            conflict=f"Category '{values.get('name')}' already exists",
+            not_found=f"Parent category with id {parent_id} not found",
+        ):
+            result = await self.db.execute(
+                stmt.values(**values, version=CategoryModel.version + 1).returning(
+                    *CATEGORY_ROW_COLUMNS
+                )
+            )
+            rows = rows_as_dicts(result)
+            await self.db.commit()
+        return rows[0] if rows else None
 
     async def delete(
         self,
@@ -77,7 +167,7 @@ class CategoryRepository:
         result = await self.db.execute(
             update(CategoryModel)
             .where(CategoryModel.id == category_id)
-            .values(is_active=False)
+            .values(is_active=False, version=CategoryModel.version + 1)
         )
         await self.db.commit()
         return result.rowcount > 0
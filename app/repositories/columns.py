@@ -0,0 +1,36 @@
+from collections.abc import Sequence
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import ARRAY, ColumnElement, any_, bindparam
+from sqlalchemy.engine import Result
+
+
+def schema_columns(
+    model: type, schema: type[BaseModel], **overrides: ColumnElement
+) -> tuple[ColumnElement, ...]:
+    """
+    Колонки модели в порядке полей схемы ответа. overrides позволяют
+    заменить колонку выражением (например, cast Numeric -> Float), чтобы
+    значения сразу имели тип, который отдаёт схема.
+    """
+    return tuple(
+        overrides[name].label(name) if name in overrides else getattr(model, name)
+        for name in schema.model_fields
+    )
+
+
+def rows_as_dicts(result: Result) -> list[dict[str, Any]]:
+    """Преобразует строки Core-запроса в словари без гидрации ORM-объектов."""
+    keys = tuple(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def any_of(column: ColumnElement, values: Sequence) -> ColumnElement[bool]:
+    """
+    Условие column = ANY(:values). Один параметр-массив вместо IN (...) даёт
+    один и тот же текст запроса при любом числе значений.
+    """
+    return column == any_(
+        bindparam(f"{column.key}_values", list(values), type_=ARRAY(column.type))
+    )
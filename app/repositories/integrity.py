@@ -0,0 +1,52 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+
+from sqlalchemy import ColumnElement, literal
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ConflictException, NotFoundException
+
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+NOT_NULL_VIOLATION = "23502"
+
+
+def get_sqlstate(exc: IntegrityError) -> Optional[str]:
+    """SQLSTATE ошибки драйвера (asyncpg кладёт его в sqlstate/pgcode)."""
+    return getattr(exc.orig, "sqlstate", None) or getattr(exc.orig, "pgcode", None)
+
+
+@asynccontextmanager
+async def integrity_errors(
+    db: AsyncSession, *, conflict: str, not_found: str
+) -> AsyncIterator[None]:
+    """
+    Переводит нарушения ограничений БД в исключения приложения: уникальность —
+    ConflictException, внешний ключ и NOT NULL — NotFoundException. Проверку
+    делает сама БД в момент записи, поэтому отдельный SELECT перед INSERT не
+    нужен и гонки между проверкой и записью нет.
+    """
+    try:
+        yield
+    except IntegrityError as exc:
+        await db.rollback()
+        sqlstate = get_sqlstate(exc)
+        if sqlstate == UNIQUE_VIOLATION:
+            raise ConflictException(conflict) from exc
+        if sqlstate in (FOREIGN_KEY_VIOLATION, NOT_NULL_VIOLATION):
+            raise NotFoundException(not_found) from exc
+        raise
+
+
+def literal_columns(model: type, values: dict[str, Any]) -> list[ColumnElement]:
+    """
+    Значения как литералы с типами колонок модели — список колонок SELECT
+    для INSERT ... SELECT ... WHERE, когда вставка зависит от условия в БД.
+    """
+    table = model.__table__
+    return [
+        literal(value, type_=table.c[name].type).label(name)
+        for name, value in values.items()
+    ]
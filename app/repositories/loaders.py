@@ -0,0 +1,104 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from operator import attrgetter
+from typing import Generic, Optional, TypeVar
+
+from app.repositories.categories import CategoryRepository
+from app.repositories.products import ProductRepository
+from app.repositories.reviews import ReviewRepository
+from app.repositories.users import UserRepository
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Собирает ключи, запрошенные у этого загрузчика в одном тике event loop,
+    и загружает их одним запросом batch_fn. Результаты запоминаются на время
+    жизни загрузчика, то есть на один HTTP-запрос.
+
+    Батчуются только ключи одного загрузчика. Все загрузчики запроса делят
+    одну AsyncSession, которая не допускает конкурентных операций, поэтому
+    их батчи выполняются по очереди под общим lock: asyncio.gather по
+    разным загрузчикам даёт по запросу на загрузчик, а не один запрос.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[K]], Awaitable[Sequence[V]]],
+        key_fn: Callable[[V], K],
+        lock: asyncio.Lock,
+    ):
+        self._batch_fn = batch_fn
+        self._key_fn = key_fn
+        self._lock = lock
+        self._cache: dict[K, asyncio.Future] = {}
+        self._queue: list[tuple[K, asyncio.Future]] = []
+        self._dispatch_task: Optional[asyncio.Task] = None
+
+    async def load(self, key: K) -> Optional[V]:
+        """Возвращает объект по ключу или None, если он не найден."""
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._cache[key] = loop.create_future()
+            self._queue.append((key, future))
+            if len(self._queue) == 1:
+                # Задача стартует после того, как отработают все корутины,
+                # уже готовые к выполнению в этом тике, и соберёт их ключи.
+                self._dispatch_task = loop.create_task(self._dispatch())
+        return await future
+
+    async def load_many(self, keys: Sequence[K]) -> list[Optional[V]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: Optional[V]) -> None:
+        """Кладёт в кэш уже известное значение, например после записи."""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._cache[key] = future
+
+    def clear(self, key: K) -> None:
+        self._cache.pop(key, None)
+
+    async def _dispatch(self) -> None:
+        batch, self._queue = self._queue, []
+        try:
+            async with self._lock:
+                values = await self._batch_fn([key for key, _ in batch])
+        except Exception as exc:  # pylint:disable=broad-exception-caught
+            for key, future in batch:
+                # Ошибку не кэшируем: повторный load() снова пойдёт в БД
+                if self._cache.get(key) is future:
+                    del self._cache[key]
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        found = {self._key_fn(value): value for value in values}
+        for key, future in batch:
+            if not future.done():
+                future.set_result(found.get(key))
+
+
+class RepositoryLoaders:
+    """Набор загрузчиков одного HTTP-запроса поверх репозиториев одной сессии."""
+
+    def __init__(
+        self,
+        product_repo: ProductRepository,
+        category_repo: CategoryRepository,
+        review_repo: ReviewRepository,
+        user_repo: UserRepository,
+    ):
+        lock = asyncio.Lock()
+        by_id = attrgetter("id")
+        self.products = DataLoader(product_repo.get_by_ids, by_id, lock)
+        self.products_by_name = DataLoader(
+            product_repo.get_by_names, attrgetter("name"), lock
+        )
+        self.categories = DataLoader(category_repo.get_by_ids, by_id, lock)
+        self.reviews = DataLoader(review_repo.get_by_ids, by_id, lock)
+        self.users_by_email = DataLoader(
+            user_repo.get_by_emails, attrgetter("email"), lock
+        )
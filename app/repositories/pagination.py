@@ -0,0 +1,82 @@
+import base64
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic_core import to_json
+from sqlalchemy import ColumnElement, Select, tuple_
+
+
+def encode_cursor(sort: str, key: Sequence[Any]) -> str:
+    """Непрозрачный курсор: порядок сортировки и ключ последней строки."""
+    payload = to_json([sort, *key])
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(
+    cursor: str, sort: str, columns: Sequence[ColumnElement]
+) -> tuple[Any, ...]:
+    """
+    Ключ из курсора с типами колонок сортировки. Курсор другой сортировки
+    или испорченный - ValueError.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, *values = json.loads(payload)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if cursor_sort != sort or len(values) != len(columns):
+        raise ValueError("Cursor does not match sort order")
+    key = []
+    for column, value in zip(columns, values):
+        python_type = column.type.python_type
+        if python_type is datetime and isinstance(value, str):
+            key.append(datetime.fromisoformat(value))
+        elif isinstance(value, python_type) and not isinstance(value, bool):
+            key.append(value)
+        else:
+            raise ValueError("Invalid cursor value")
+    return tuple(key)
+
+
+class KeysetPage:
+    """
+    Страница keyset-пагинации: limit строк после ключа after в порядке
+    убывания columns. В отличие от OFFSET, стоимость не растёт с номером
+    страницы: индекс сразу позиционируется на ключ. Последняя колонка
+    должна быть уникальной (id), чтобы ключ однозначно задавал позицию.
+    """
+
+    __slots__ = ("sort", "columns", "limit", "after")
+
+    def __init__(
+        self,
+        sort: str,
+        columns: tuple[ColumnElement, ...],
+        limit: int,
+        after: Optional[tuple[Any, ...]] = None,
+    ):
+        self.sort = sort
+        self.columns = columns
+        self.limit = limit
+        self.after = after
+
+    def apply(self, stmt: Select) -> Select:
+        # Сравнение строк (a, b) < (:a, :b) - одно условие по индексу
+        if self.after is not None:
+            stmt = stmt.where(tuple_(*self.columns) < tuple_(*self.after))
+        # Лишняя строка показывает, есть ли следующая страница
+        return stmt.order_by(*(column.desc() for column in self.columns)).limit(
+            self.limit + 1
+        )
+
+    def split(
+        self, rows: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], Optional[str]]:
+        """Строки страницы и курсор следующей (None - страница последняя)."""
+        if len(rows) <= self.limit:
+            return rows, None
+        rows = rows[: self.limit]
+        key = [rows[-1][column.key] for column in self.columns]
+        return rows, encode_cursor(self.sort, key)
@@ -1,11 +1,39 @@
 # ruff: noqa: E712
-from typing import Optional
+from collections.abc import AsyncIterator, Sequence
+from typing import Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import Float, bindparam, case, cast, insert, select, update
 
 from app.models.products import Product as ProductModel
 from app.models.users import User as UserModel
-from app.schemas.products import ProductCreate
+from app.schemas.products import ProductCreate, Product, ProductStockPriceUpdate
+from app.repositories.categories import active_category_exists
+from app.repositories.columns import schema_columns, rows_as_dicts, any_of
+from app.repositories.integrity import integrity_errors, literal_columns
+
+
+PRODUCT_ROW_COLUMNS = schema_columns(
+    ProductModel, Product, rating=cast(ProductModel.rating, Float)
+)
+
+# Горячие запросы собраны один раз: ключ кэша компиляции SQLAlchemy
+# запоминается на объекте запроса, а одинаковый SQL позволяет asyncpg
+# переиспользовать подготовленные выражения соединения.
+_ACTIVE_PRODUCT = ProductModel.is_active == True
+
+SELECT_PRODUCT_ROWS = select(*PRODUCT_ROW_COLUMNS).where(_ACTIVE_PRODUCT)
+SELECT_PRODUCT_ROWS_BY_CATEGORY = SELECT_PRODUCT_ROWS.where(
+    ProductModel.category_id == bindparam("category_id")
+)
+SELECT_PRODUCT_ROW_BY_ID = SELECT_PRODUCT_ROWS.where(
+    ProductModel.id == bindparam("product_id")
+)
+SELECT_PRODUCT_BY_ID = select(ProductModel).where(
+    ProductModel.id == bindparam("product_id"), _ACTIVE_PRODUCT
+)
+SELECT_PRODUCT_BY_NAME = select(ProductModel).where(
+    ProductModel.name == bindparam("name"), _ACTIVE_PRODUCT
+)
 
 
 class ProductRepository:
@@ -21,17 +49,82 @@ class ProductRepository:
         products = result.all()
         return products
 
+    async def get_all_rows(self) -> list[dict[str, Any]]:
+        """Возвращает активные товары строками с полями схемы Product."""
+        result = await self.db.execute(SELECT_PRODUCT_ROWS)
+        return rows_as_dicts(result)
+
+    async def get_rows_by_category(self, category_id: int) -> list[dict[str, Any]]:
+        result = await self.db.execute(
+            SELECT_PRODUCT_ROWS_BY_CATEGORY, {"category_id": category_id}
+        )
+        return rows_as_dicts(result)
+
+    async def get_rows_by_ids(self, ids: list[int]) -> list[dict[str, Any]]:
+        """Возвращает активные строки по списку ID одним запросом."""
+        result = await self.db.execute(
+            select(*PRODUCT_ROW_COLUMNS).where(
+                any_of(ProductModel.id, ids), ProductModel.is_active == True
+            )
+        )
+        return rows_as_dicts(result)
+
+    async def get_row_by_id(self, product_id: int) -> Optional[dict[str, Any]]:
+        result = await self.db.execute(
+            SELECT_PRODUCT_ROW_BY_ID, {"product_id": product_id}
+        )
+        rows = rows_as_dicts(result)
+        return rows[0] if rows else None
+
+    async def stream_all(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[ProductModel]]:
+        """
+        Потоково отдаёт активные товары пачками через серверный курсор,
+        не загружая всю таблицу в память.
+        """
+        result = await self.db.stream_scalars(
+            select(ProductModel)
+            .where(ProductModel.is_active == True)
+            .order_by(ProductModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield partition
+
     async def create(
         self,
         product_create: ProductCreate,
-        current_user: UserModel,
-    ) -> ProductModel:
-        """Создает новый товар."""
-        product = ProductModel(**product_create.model_dump(), seller_id=current_user.id)
-        self.db.add(product)
-        await self.db.commit()
-        await self.db.refresh(product)
-        return product
+        seller_email: str,
+        seller_roles: Sequence[str],
+    ) -> Optional[dict[str, Any]]:
+        """
+        Создает новый товар одним запросом INSERT ... SELECT ... RETURNING:
+        seller_id берётся из users по email, вставка выполняется только для
+        продавца с подходящей ролью и активной категории. Если условие не
+        выполнено, возвращает None; дубликат имени отсекает ограничение unique.
+        """
+        values = product_create.model_dump()
+        source = select(
+            *literal_columns(ProductModel, values), UserModel.id.label("seller_id")
+        ).where(
+            UserModel.email == seller_email,
+            UserModel.role.in_(seller_roles),
+            active_category_exists(product_create.category_id),
+        )
+        async with integrity_errors(
+            self.db,
+            conflict=f"Product '{product_create.name}' already exists",
+            not_found=f"Product with category id {product_create.category_id} not found",
+        ):
+            result = await self.db.execute(
+                insert(ProductModel)
+                .from_select([*values, "seller_id"], source)
+                .returning(*PRODUCT_ROW_COLUMNS)
+            )
+            rows = rows_as_dicts(result)
+            await self.db.commit()
+        return rows[0] if rows else None
 
     async def get_by_category(
         self,
@@ -54,35 +147,109 @@ class ProductRepository:
         """
         Возвращает детальную информацию о товаре по его ID.
         """
-        stmt = select(ProductModel).where(
-            ProductModel.id == product_id, ProductModel.is_active == True
-        )
-        result = await self.db.scalars(stmt)
+        result = await self.db.scalars(SELECT_PRODUCT_BY_ID, {"product_id": product_id})
         product = result.first()
         return product
 
-    async def get_by_name(self, name: str):
-        result = await self.db.scalars(
-            select(ProductModel.name == name, ProductModel.is_active == True)
-        )
+    async def get_by_name(self, name: str) -> Optional[ProductModel]:
+        result = await self.db.scalars(SELECT_PRODUCT_BY_NAME, {"name": name})
         product = result.first()
         return product
 
+    async def get_by_ids(self, product_ids: list[int]) -> Sequence[ProductModel]:
+        """Возвращает активные товары по списку ID одним запросом."""
+        result = await self.db.scalars(
+            select(ProductModel).where(
+                any_of(ProductModel.id, product_ids), ProductModel.is_active == True
+            )
+        )
+        return result.all()
+
+    async def get_by_names(self, names: list[str]) -> Sequence[ProductModel]:
+        """Возвращает активные товары по списку названий одним запросом."""
+        result = await self.db.scalars(
+            select(ProductModel).where(
+                any_of(ProductModel.name, names), ProductModel.is_active == True
+            )
+        )
+        return result.all()
+
     async def update(
         self,
         product_id: int,
-        product_update: ProductCreate,
-    ) -> Optional[ProductModel]:
-        """Обновляет товар по ID."""
+        values: dict[str, Any],
+        expected_version: Optional[int] = None,
+        seller_id: Optional[int] = None,
+    ) -> Optional[dict[str, Any]]:
+        """
+        Обновляет товар по ID одним запросом UPDATE ... RETURNING: пишутся
+        только колонки из values (для PATCH - переданные поля), версия
+        увеличивается. С expected_version строка обновляется только в этой
+        версии (оптимистическая блокировка без SELECT ... FOR UPDATE),
+        с seller_id - только товар этого продавца.
+        Возвращает None, если товар или категория не найдены, версия
+        изменилась или товар чужой.
+        """
+        stmt = update(ProductModel).where(
+            ProductModel.id == product_id, ProductModel.is_active == True
+        )
+        if seller_id is not None:
+            stmt = stmt.where(ProductModel.seller_id == seller_id)
+        if "category_id" in values:
+            stmt = stmt.where(active_category_exists(values["category_id"]))
+        if expected_version is not None:
+            stmt = stmt.where(ProductModel.version == expected_version)
+        async with integrity_errors(
+            self.db,
+            conflict=f"Product '{values.get('name')}' already exists",
+            not_found=f"Product with category id {values.get('category_id')} not found",
+        ):
+            result = await self.db.execute(
+                stmt.values(**values, version=ProductModel.version + 1).returning(
+                    *PRODUCT_ROW_COLUMNS
+                )
+            )
+            rows = rows_as_dicts(result)
+            await self.db.commit()
+        return rows[0] if rows else None
+
+    async def update_stock_and_prices(
+        self,
+        changes: list[ProductStockPriceUpdate],
+        seller_id: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Пакетно меняет цены и остатки одним запросом:
+        UPDATE products SET price = CASE id WHEN ... END, stock = CASE ...
+        WHERE id = ANY(:ids). Колонка без изменений в пакете не пишется,
+        а у товара без нового значения CASE оставляет прежнее. С seller_id
+        меняются только товары этого продавца.
+        Возвращает обновлённые активные строки.
+        """
+        values: dict[str, Any] = {"version": ProductModel.version + 1}
+        for column in ("price", "stock"):
+            new_values = {
+                change.id: getattr(change, column)
+                for change in changes
+                if column in change.model_fields_set
+            }
+            if new_values:
+                model_column = getattr(ProductModel, column)
+                values[column] = case(
+                    new_values, value=ProductModel.id, else_=model_column
+                )
+        stmt = update(ProductModel).where(
+            any_of(ProductModel.id, [change.id for change in changes]),
+            ProductModel.is_active == True,
+        )
+        if seller_id is not None:
+            stmt = stmt.where(ProductModel.seller_id == seller_id)
         result = await self.db.execute(
-            update(ProductModel)
-            .where(ProductModel.id == product_id)
-            .values(**product_update.model_dump())
+            stmt.values(**values).returning(*PRODUCT_ROW_COLUMNS)
         )
+        rows = rows_as_dicts(result)
         await self.db.commit()
-        if result.rowcount > 0:
-            return await self.get_by_id(product_id)
-        return None
+        return rows
 
     async def delete(
         self,
@@ -92,7 +259,7 @@ class ProductRepository:
         result = await self.db.execute(
             update(ProductModel)
             .where(ProductModel.id == product_id)
-            .values(is_active=False)
+            .values(is_active=False, version=ProductModel.version + 1)
         )
         await self.db.commit()
         return result.rowcount > 0
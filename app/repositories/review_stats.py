@@ -0,0 +1,163 @@
+# pylint:disable=not-callable,assignment-from-no-return
+# ruff: noqa: E712
+from typing import Any, Optional
+from sqlalchemy import (
+    Numeric,
+    bindparam,
+    cast,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.products import Product as ProductModel
+from app.models.reviews import Review as ReviewModel
+from app.models.review_stats import ProductReviewStats as StatsModel
+
+
+GRADES = (1, 2, 3, 4, 5)
+GRADE_COLUMNS = tuple(getattr(StatsModel, f"grade_{grade}") for grade in GRADES)
+
+_insert_stats = pg_insert(StatsModel).values(
+    product_id=bindparam("product_id"),
+    review_count=bindparam("review_count"),
+    **{column.key: bindparam(column.key) for column in GRADE_COLUMNS},
+)
+# Приращения складываются в самой БД: конкурентные отзывы к одному товару
+# не теряют обновления без блокировок на уровне приложения.
+UPSERT_STATS = _insert_stats.on_conflict_do_update(
+    index_elements=[StatsModel.product_id],
+    set_={
+        column.key: column + getattr(_insert_stats.excluded, column.key)
+        for column in (StatsModel.review_count, *GRADE_COLUMNS)
+    },
+).returning(StatsModel.review_count, *GRADE_COLUMNS)
+
+SELECT_SUMMARY = (
+    select(
+        ProductModel.id.label("product_id"),
+        func.coalesce(StatsModel.review_count, 0).label("review_count"),
+        *(func.coalesce(column, 0).label(column.key) for column in GRADE_COLUMNS),
+    )
+    .outerjoin(StatsModel, StatsModel.product_id == ProductModel.id)
+    .where(ProductModel.id == bindparam("product_id"), ProductModel.is_active == True)
+)
+
+
+def average_grade(review_count: int, grade_counts: list[int]) -> float:
+    if not review_count:
+        return 0.0
+    total = sum(grade * count for grade, count in zip(GRADES, grade_counts))
+    return round(total / review_count, 2)
+
+
+def summary_from_row(row: Any) -> dict[str, Any]:
+    grade_counts = [getattr(row, column.key) for column in GRADE_COLUMNS]
+    return {
+        "product_id": row.product_id,
+        "review_count": row.review_count,
+        "rating": average_grade(row.review_count, grade_counts),
+        "grades": dict(zip(GRADES, grade_counts)),
+    }
+
+
+class ReviewStatsRepository:
+    """
+    Денормализованная сводка отзывов по товарам. Методы записи не делают
+    commit: их вызывает ReviewRepository внутри транзакции записи отзыва.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_summary(self, product_id: int) -> Optional[dict[str, Any]]:
+        """Сводка активного товара (нули без отзывов) или None без товара."""
+        result = await self.db.execute(SELECT_SUMMARY, {"product_id": product_id})
+        row = result.first()
+        return summary_from_row(row) if row else None
+
+    async def apply(self, product_id: int, grade_deltas: dict[int, int]) -> None:
+        """
+        Прибавляет к счётчикам оценок grade_deltas ({оценка: +1/-1}) и
+        пересчитывает рейтинг товара из сводки вместо AVG по всем отзывам.
+        """
+        if not any(grade_deltas.values()):
+            return
+        result = await self.db.execute(
+            UPSERT_STATS,
+            {
+                "product_id": product_id,
+                "review_count": sum(grade_deltas.values()),
+                **{
+                    column.key: grade_deltas.get(grade, 0)
+                    for grade, column in zip(GRADES, GRADE_COLUMNS)
+                },
+            },
+        )
+        review_count, *grade_counts = result.one()
+        # Рейтинг входит в представление товара, поэтому меняет его версию
+        await self.db.execute(
+            update(ProductModel)
+            .where(ProductModel.id == product_id)
+            .values(
+                rating=average_grade(review_count, grade_counts),
+                version=ProductModel.version + 1,
+            )
+        )
+
+    async def apply_change(
+        self, old_product_id: int, old_grade: int, new_product_id: int, new_grade: int
+    ) -> None:
+        """Переносит отзыв из (товар, оценка) в новые (товар, оценка)."""
+        if old_product_id == new_product_id:
+            deltas = {old_grade: -1}
+            deltas[new_grade] = deltas.get(new_grade, 0) + 1
+            await self.apply(old_product_id, deltas)
+            return
+        await self.apply(old_product_id, {old_grade: -1})
+        await self.apply(new_product_id, {new_grade: 1})
+
+    async def rebuild(self) -> int:
+        """
+        Пересобирает сводку из reviews и обновляет рейтинги разошедшихся
+        товаров. Блокировка таблицы заставляет конкурентные записи отзывов
+        дождаться конца пересборки, поэтому их приращения не теряются.
+        Возвращает число товаров со сводкой.
+        """
+        if self.db.bind.dialect.name == "postgresql":
+            await self.db.execute(
+                text("LOCK TABLE product_review_stats IN EXCLUSIVE MODE")
+            )
+        await self.db.execute(delete(StatsModel))
+        grade_counts = (
+            func.count().filter(ReviewModel.grade == grade).label(column.key)
+            for grade, column in zip(GRADES, GRADE_COLUMNS)
+        )
+        result = await self.db.execute(
+            insert(StatsModel).from_select(
+                ["product_id", "review_count", *(c.key for c in GRADE_COLUMNS)],
+                select(ReviewModel.product_id, func.count(), *grade_counts)
+                .where(ReviewModel.is_active == True)
+                .group_by(ReviewModel.product_id),
+            )
+        )
+        weighted = sum(grade * column for grade, column in zip(GRADES, GRADE_COLUMNS))
+        rating = func.coalesce(
+            select(func.round(cast(weighted, Numeric) / StatsModel.review_count, 2))
+            .where(
+                StatsModel.product_id == ProductModel.id, StatsModel.review_count > 0
+            )
+            .scalar_subquery(),
+            0,
+        )
+        await self.db.execute(
+            update(ProductModel)
+            .where(ProductModel.rating != rating)
+            .values(rating=rating, version=ProductModel.version + 1)
+        )
+        return result.rowcount
@@ -1,102 +1,181 @@
 # ruff: noqa: E712
-from typing import Optional
-from sqlalchemy import select, update, func
+from collections.abc import AsyncIterator, Sequence
+from typing import Any, Optional
+from sqlalchemy import bindparam, exists, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.reviews import Review as ReviewModel
 from app.models.users import User as UserModel
-from app.schemas.reviews import ReviewCreate
-from app.models.products import Product as ProductModel
+from app.schemas.reviews import ReviewCreate, Review, ReviewSort
+from app.repositories.columns import schema_columns, rows_as_dicts, any_of
+from app.repositories.pagination import KeysetPage
+from app.repositories.review_stats import ReviewStatsRepository
+
+
+REVIEW_ROW_COLUMNS = schema_columns(ReviewModel, Review)
+
+_ACTIVE_REVIEW = ReviewModel.is_active == True
+
+SELECT_REVIEW_ROWS = select(*REVIEW_ROW_COLUMNS).where(_ACTIVE_REVIEW)
+SELECT_REVIEW_BY_ID = select(ReviewModel).where(
+    ReviewModel.id == bindparam("review_id"), _ACTIVE_REVIEW
+)
+# Блокирует строку до UPDATE, чтобы сводка вычла именно прежнюю оценку
+SELECT_REVIEW_GRADE_FOR_UPDATE = (
+    select(ReviewModel.product_id, ReviewModel.grade)
+    .where(ReviewModel.id == bindparam("review_id"), _ACTIVE_REVIEW)
+    .with_for_update()
+)
+# Читает только колонки индекса ix_reviews_user_product: index-only scan
+SELECT_REVIEW_EXISTS_BY_USER_AND_PRODUCT = select(
+    exists().where(
+        ReviewModel.user_id == bindparam("user_id"),
+        ReviewModel.product_id == bindparam("product_id"),
+        _ACTIVE_REVIEW,
+    )
+)
+
+# Ключи keyset-пагинации, id делает ключ уникальным
+REVIEW_SORT_COLUMNS = {
+    ReviewSort.NEWEST: (ReviewModel.comment_date, ReviewModel.id),
+    ReviewSort.GRADE: (ReviewModel.grade, ReviewModel.comment_date, ReviewModel.id),
+}
 
 
 class ReviewRepository:
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, stats_repo: ReviewStatsRepository):
+        # Сводка меняется в транзакции отзыва: stats_repo - в той же сессии
         self.db = db
+        self.stats_repo = stats_repo
 
-    async def get_all(self) -> list[ReviewModel]:
-        """Получает все активные отзывы"""
-        result = await self.db.scalars(
-            select(ReviewModel).where(ReviewModel.is_active == True)
+    async def get_rows_by_ids(self, ids: list[int]) -> list[dict[str, Any]]:
+        """Возвращает активные строки по списку ID одним запросом."""
+        result = await self.db.execute(
+            select(*REVIEW_ROW_COLUMNS).where(
+                any_of(ReviewModel.id, ids), ReviewModel.is_active == True
+            )
         )
-        reviews = result.all()
-        return reviews
+        return rows_as_dicts(result)
 
-    async def get_by_id(self, review_id: int) -> Optional[ReviewModel]:
-        result = await self.db.scalars(
-            select(ReviewModel).where(
-                ReviewModel.id == review_id, ReviewModel.is_active == True
-            )
+    async def get_rows_page(
+        self,
+        page: KeysetPage,
+        product_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+    ) -> tuple[list[dict[str, Any]], Optional[str]]:
+        """
+        Страница активных отзывов (всех, товара или пользователя) и курсор
+        следующей. По товару читается индекс
+        (product_id, is_active, comment_date DESC, id DESC), при сортировке
+        по оценке - такой же с grade DESC перед датой.
+        """
+        stmt = SELECT_REVIEW_ROWS
+        if product_id is not None:
+            stmt = stmt.where(ReviewModel.product_id == product_id)
+        if user_id is not None:
+            stmt = stmt.where(ReviewModel.user_id == user_id)
+        result = await self.db.execute(page.apply(stmt))
+        return page.split(rows_as_dicts(result))
+
+    async def stream_all(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[ReviewModel]]:
+        """Потоково отдаёт активные отзывы пачками через серверный курсор"""
+        result = await self.db.stream_scalars(
+            select(ReviewModel)
+            .where(ReviewModel.is_active == True)
+            .order_by(ReviewModel.id)
+            .execution_options(yield_per=batch_size)
         )
+        async for partition in result.partitions():
+            yield partition
+
+    async def get_by_id(self, review_id: int) -> Optional[ReviewModel]:
+        result = await self.db.scalars(SELECT_REVIEW_BY_ID, {"review_id": review_id})
         review = result.first()
         return review
 
-    async def get_reviews_by_product(
-        self,
-        product_id: int,
-    ) -> list[ReviewModel]:
-        """Получает все активные отзывы о продукте"""
+    async def get_by_ids(self, review_ids: list[int]) -> Sequence[ReviewModel]:
+        """Возвращает активные отзывы по списку ID одним запросом"""
         result = await self.db.scalars(
             select(ReviewModel).where(
-                ReviewModel.product_id == product_id, ReviewModel.is_active == True
+                any_of(ReviewModel.id, review_ids), ReviewModel.is_active == True
             )
         )
-        reviews = result.all()
-        return reviews
+        return result.all()
 
     async def create(
         self,
         review: ReviewCreate,
         current_user: UserModel,
     ) -> Optional[ReviewModel]:
-        """Создает отзыв"""
+        """Создает отзыв и в той же транзакции обновляет сводку товара."""
         review_db = ReviewModel(**review.model_dump(), user_id=current_user.id)
         self.db.add(review_db)
+        await self.db.flush()
+        await self.stats_repo.apply(review_db.product_id, {review_db.grade: 1})
         await self.db.commit()
         await self.db.refresh(review_db)
         return review_db
 
-    async def update(self, review_id: int, review_update: ReviewCreate):
-        result = await self.db.execute(
-            update(ReviewModel)
-            .where(ReviewModel.id == review_id, ReviewModel.is_active == True)
-            .values(**review_update.model_dump())
+    async def update(
+        self,
+        review_id: int,
+        values: dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[ReviewModel]:
+        """
+        Обновляет отзыв одним запросом UPDATE ... RETURNING: пишутся только
+        колонки из values, версия увеличивается; с expected_version - только
+        в этой версии. populate_existing обновляет объект, если он уже
+        загружен в сессию. Смена оценки или товара переносит отзыв в сводке
+        в той же транзакции.
+        """
+        previous = None
+        if "grade" in values or "product_id" in values:
+            result = await self.db.execute(
+                SELECT_REVIEW_GRADE_FOR_UPDATE, {"review_id": review_id}
+            )
+            previous = result.first()
+        stmt = update(ReviewModel).where(
+            ReviewModel.id == review_id, ReviewModel.is_active == True
         )
+        if expected_version is not None:
+            stmt = stmt.where(ReviewModel.version == expected_version)
+        result = await self.db.scalars(
+            stmt.values(**values, version=ReviewModel.version + 1)
+            .returning(ReviewModel)
+            .execution_options(populate_existing=True)
+        )
+        review = result.first()
+        if review is not None and previous is not None:
+            await self.stats_repo.apply_change(
+                previous.product_id, previous.grade, review.product_id, review.grade
+            )
         await self.db.commit()
-        if result.rowcount > 0:
-            return await self.get_by_id(review_id)
-        return None
+        return review
 
     async def delete(
         self,
         review_id: int,
     ) -> bool:
-        """Удаляет отзыв по ID."""
+        """Мягко удаляет отзыв по ID и вычитает его из сводки товара."""
         result = await self.db.execute(
             update(ReviewModel)
-            .where(ReviewModel.id == review_id)
-            .values(is_active=False)
+            .where(ReviewModel.id == review_id, ReviewModel.is_active == True)
+            .values(is_active=False, version=ReviewModel.version + 1)
+            .returning(ReviewModel.product_id, ReviewModel.grade)
         )
+        deleted = result.first()
+        if deleted is not None:
+            await self.stats_repo.apply(deleted.product_id, {deleted.grade: -1})
         await self.db.commit()
-        return result.rowcount > 0
+        return deleted is not None
 
-    async def check_existing(self, user_id: int, product_id: int):
-        review = await self.db.scalars(
-            select(ReviewModel).where(
-                ReviewModel.user_id == user_id,
-                ReviewModel.product_id == product_id,
-                ReviewModel.is_active == True,
-            )
+    async def check_existing(self, user_id: int, product_id: int) -> bool:
+        """Есть ли у пользователя активный отзыв о товаре."""
+        return await self.db.scalar(
+            SELECT_REVIEW_EXISTS_BY_USER_AND_PRODUCT,
+            {"user_id": user_id, "product_id": product_id},
         )
-        return review.first()
-
-    async def update_rating(self, review: ReviewModel):
-        result = await self.db.scalars(
-            select(func.avg(ReviewModel.grade)).where(
-                ReviewModel.product_id == review.product_id,
-                ReviewModel.is_active == True,
-            )
-        )
-        await self.db.execute(update(ProductModel).values(rating=result.first()))
-        await self.db.commit()
-        await self.db.refresh(review)
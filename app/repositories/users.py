@@ -1,11 +1,22 @@
 # ruff: noqa: E712
-from typing import Optional
+from collections.abc import Sequence
+from typing import Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import bindparam, select, update
 
 from app.models.users import User as UserModel
 from app.schemas.users import UserCreate
 from app.auth.security import verify_password, hash_password
+from app.repositories.columns import any_of
+from app.repositories.integrity import integrity_errors
+
+
+SELECT_USER_BY_ID = select(UserModel).where(
+    UserModel.id == bindparam("user_id"), UserModel.is_active == True
+)
+SELECT_USER_BY_EMAIL = select(UserModel).where(
+    UserModel.email == bindparam("email"), UserModel.is_active == True
+)
 
 
 class UserRepository:
@@ -17,11 +28,7 @@ class UserRepository:
         """
         Получает пользователя по id
         """
-        result = await self.db.scalars(
-            select(UserModel).where(
-                UserModel.id == user_id, UserModel.is_active == True
-            )
-        )
+        result = await self.db.scalars(SELECT_USER_BY_ID, {"user_id": user_id})
         user = result.first()
         return user
 
@@ -29,13 +36,20 @@ class UserRepository:
         """
         Получает пользователя по email
         """
+        result = await self.db.scalars(SELECT_USER_BY_EMAIL, {"email": email})
+        user = result.first()
+        return user
+
+    async def get_by_emails(self, emails: list[str]) -> Sequence[UserModel]:
+        """
+        Получает активных пользователей по списку email одним запросом
+        """
         result = await self.db.scalars(
             select(UserModel).where(
-                UserModel.email == email, UserModel.is_active == True
+                any_of(UserModel.email, emails), UserModel.is_active == True
             )
         )
-        user = result.first()
-        return user
+        return result.all()
 
     async def create(self, user: UserCreate) -> UserModel:
         """
@@ -52,17 +66,27 @@ class UserRepository:
         await self.db.refresh(db_user)
         return db_user
 
-    async def update(self, user_id: int, user_update: UserCreate) -> UserModel:
+    async def update(self, user_id: int, values: dict[str, Any]) -> Optional[UserModel]:
         """
-        Обновляет пользователя по id
+        Обновляет пользователя по id одним запросом UPDATE ... RETURNING,
+        записывая только колонки из values. populate_existing обновляет
+        объект, уже загруженный в сессию.
         """
-        result = await self.db.execute(
-            update(UserModel).where(UserModel.id == user_id).values(**user_update)
-        )
-        await self.db.commit()
-        if result.rowcount > 0:
-            return await self.get_by_id(user_id)
-        return None
+        async with integrity_errors(
+            self.db,
+            conflict=f"User with email {values.get('email')} already exists",
+            not_found=f"User with id {user_id} not found",
+        ):
+            result = await self.db.scalars(
+                update(UserModel)
+                .where(UserModel.id == user_id, UserModel.is_active == True)
+                .values(**values)
+                .returning(UserModel)
+                .execution_options(populate_existing=True)
+            )
+            user = result.first()
+            await self.db.commit()
+        return user
 
     async def delete(self, user_id: int) -> bool:
         """
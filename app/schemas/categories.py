@@ -21,6 +21,33 @@ class CategoryCreate(BaseModel):
         return value
 
 
+class CategoryUpdate(BaseModel):
+    """Модель для частичного обновления категории (PATCH).
+    Записываются только переданные поля."""
+
+    name: Annotated[
+        str | None,
+        Field(None, min_length=3, max_length=50, description="Название категории"),
+    ]
+    parent_id: Annotated[
+        int | None, Field(None, description="ID родительской категории, если есть")
+    ]
+
+    @field_validator("name")
+    @classmethod
+    def validate_name(cls, value):
+        if value is None:
+            raise ValueError("Field can not be null")
+        return value
+
+    @field_validator("parent_id")
+    @classmethod
+    def validate_parent(cls, value):
+        if value == 0:
+            return None
+        return value
+
+
 class Category(BaseModel):
     """
     Модель для ответа с данными категории.
@@ -33,5 +60,17 @@ class Category(BaseModel):
         int | None, Field(None, description="ID родительской категории, если есть")
     ]
     is_active: Annotated[bool, Field(description="Активность категории")]
+    version: Annotated[int, Field(description="Версия категории для If-Match")]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class CategoryBatch(BaseModel):
+    """Ответ пакетного запроса категорий по списку ID."""
+
+    items: Annotated[
+        list[Category], Field(description="Найденные категории в порядке запроса")
+    ]
+    missing: Annotated[
+        list[int], Field(description="ID, для которых активная категория не найдена")
+    ]
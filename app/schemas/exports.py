@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class ExportFormat(str, Enum):
+    """Формат выгрузки каталога."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        if self is ExportFormat.CSV:
+            return "text/csv; charset=utf-8"
+        return "application/x-ndjson"
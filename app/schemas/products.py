@@ -1,5 +1,6 @@
 from typing import Annotated
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from app.schemas.reviews import ReviewSummary
 
 
 class ProductCreate(BaseModel):
@@ -22,6 +23,60 @@ class ProductCreate(BaseModel):
     ]
 
 
+class ProductUpdate(BaseModel):
+    """Модель для частичного обновления продукта (PATCH).
+    Записываются только переданные поля."""
+
+    name: Annotated[
+        str | None,
+        Field(None, min_length=3, max_length=100, description="Название товара"),
+    ]
+    description: Annotated[
+        str | None, Field(None, max_length=500, description="Описание товара")
+    ]
+    price: Annotated[float | None, Field(None, gt=0, description="Цена товара")]
+    image_url: Annotated[
+        str | None, Field(None, max_length=200, description="URL изображения товара")
+    ]
+    stock: Annotated[
+        int | None, Field(None, ge=0, description="Колличество товара на складе")
+    ]
+    category_id: Annotated[
+        int | None, Field(None, description="ID категории, к которой относится товар")
+    ]
+
+    @field_validator("name", "price", "stock", "category_id")
+    @classmethod
+    def validate_not_null(cls, value):
+        if value is None:
+            raise ValueError("Field can not be null")
+        return value
+
+
+class ProductStockPriceUpdate(BaseModel):
+    """Изменение цены и/или остатка одного товара в пакетном PATCH."""
+
+    id: Annotated[int, Field(ge=1, description="ID товара")]
+    price: Annotated[float | None, Field(None, gt=0, description="Новая цена")]
+    stock: Annotated[int | None, Field(None, ge=0, description="Новый остаток")]
+
+    @field_validator("price", "stock")
+    @classmethod
+    def validate_not_null(cls, value):
+        if value is None:
+            raise ValueError("Field can not be null")
+        return value
+
+
+class ProductBulkUpdate(BaseModel):
+    """Пакетное изменение цен и остатков, выполняется одним UPDATE."""
+
+    items: Annotated[
+        list[ProductStockPriceUpdate],
+        Field(min_length=1, max_length=100, description="Изменения по товарам"),
+    ]
+
+
 class Product(BaseModel):
     """Модель для ответа с данными запроса.
     Используется в GET-запросах."""
@@ -43,5 +98,25 @@ class Product(BaseModel):
         int, Field(description="ID категории, к которой относится товар")
     ]
     is_active: Annotated[bool, Field(description="Активность товара")]
+    version: Annotated[int, Field(description="Версия товара для If-Match")]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProductBatch(BaseModel):
+    """Ответ пакетного запроса товаров по списку ID."""
+
+    items: Annotated[
+        list[Product], Field(description="Найденные товары в порядке запроса")
+    ]
+    missing: Annotated[
+        list[int], Field(description="ID, для которых активный товар не найден")
+    ]
+
+
+class ProductWithReviewSummary(Product):
+    """Товар со встроенной сводкой отзывов (?embed=review_summary)."""
+
+    review_summary: Annotated[
+        ReviewSummary | None, Field(None, description="Сводка отзывов о товаре")
+    ]
@@ -1,6 +1,14 @@
 from datetime import datetime
+from enum import Enum
 from typing import Annotated
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+
+
+class ReviewSort(str, Enum):
+    """Порядок списка отзывов."""
+
+    NEWEST = "newest"
+    GRADE = "grade"
 
 
 class ReviewCreate(BaseModel):
@@ -11,6 +19,20 @@ class ReviewCreate(BaseModel):
     grade: Annotated[int, Field(ge=1, le=5, description="Оценка")]
 
 
+class ReviewUpdate(BaseModel):
+    """Частичное обновление отзыва (PATCH): текст и/или оценка."""
+
+    comment: Annotated[str | None, Field(None, description="Коментарий к отзыву")]
+    grade: Annotated[int | None, Field(None, ge=1, le=5, description="Оценка")]
+
+    @field_validator("grade")
+    @classmethod
+    def validate_grade(cls, value):
+        if value is None:
+            raise ValueError("Field can not be null")
+        return value
+
+
 class Review(BaseModel):
     id: Annotated[int, Field(description="Уникальный инентификатор товара")]
     user_id: Annotated[int, Field(description="ID пользователя который написал отзыв")]
@@ -23,5 +45,28 @@ class Review(BaseModel):
     comment_date: Annotated[datetime, Field(description="Дата и время")]
     grade: Annotated[int, Field(ge=1, le=5, description="Оценка")]
     is_active: Annotated[bool, Field(description="Активность отзыва")]
+    version: Annotated[int, Field(description="Версия отзыва для If-Match")]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ReviewSummary(BaseModel):
+    """Сводка отзывов о товаре из product_review_stats."""
+
+    product_id: Annotated[int, Field(description="ID товара")]
+    review_count: Annotated[int, Field(ge=0, description="Число активных отзывов")]
+    rating: Annotated[float, Field(description="Средняя оценка")]
+    grades: Annotated[
+        dict[int, int], Field(description="Число отзывов по каждой оценке 1-5")
+    ]
+
+
+class ReviewBatch(BaseModel):
+    """Ответ пакетного запроса отзывов по списку ID."""
+
+    items: Annotated[
+        list[Review], Field(description="Найденные отзывы в порядке запроса")
+    ]
+    missing: Annotated[
+        list[int], Field(description="ID, для которых активный отзыв не найден")
+    ]
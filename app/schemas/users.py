@@ -1,12 +1,17 @@
 from typing import Annotated
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, field_validator
 
 
-class UserCreate(BaseModel):
+class UserCredentials(BaseModel):
+    """Полное обновление пользователя (PUT): роль этим запросом не меняется."""
+
     email: Annotated[EmailStr, Field(description="Email пользователя")]
     password: Annotated[
         str, Field(min_length=8, description="Пароль (минимум 8 символов)")
     ]
+
+
+class UserCreate(UserCredentials):
     role: Annotated[
         str,
         Field(
@@ -17,6 +22,22 @@ class UserCreate(BaseModel):
     ]
 
 
+class UserUpdate(BaseModel):
+    """Частичное обновление пользователя (PATCH): email и/или пароль."""
+
+    email: Annotated[EmailStr | None, Field(None, description="Email пользователя")]
+    password: Annotated[
+        str | None, Field(None, min_length=8, description="Пароль (минимум 8 символов)")
+    ]
+
+    @field_validator("email", "password")
+    @classmethod
+    def validate_not_null(cls, value):
+        if value is None:
+            raise ValueError("Field can not be null")
+        return value
+
+
 class User(BaseModel):
     id: int
     email: EmailStr
@@ -0,0 +1,16 @@
+from typing import Any
+
+
+def order_by_requested_ids(
+    requested_ids: list[int], rows: list[dict[str, Any]]
+) -> dict[str, list]:
+    """
+    Раскладывает строки в порядке запрошенных ID и перечисляет ID,
+    для которых строка не найдена. Повторяющиеся ID отдаются один раз.
+    """
+    rows_by_id = {row["id"]: row for row in rows}
+    unique_ids = list(dict.fromkeys(requested_ids))
+    return {
+        "items": [rows_by_id[row_id] for row_id in unique_ids if row_id in rows_by_id],
+        "missing": [row_id for row_id in unique_ids if row_id not in rows_by_id],
+    }
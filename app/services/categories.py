@@ -1,56 +1,91 @@
-from typing import Optional
+from typing import Any, Optional
 from app.repositories.categories import CategoryRepository
-from app.schemas.categories import CategoryCreate
-from app.models.categories import Category as CategoryModel
-from app.core.exceptions import NotFoundException, ConflictException
+from app.schemas.categories import CategoryCreate, CategoryUpdate
+from app.core.exceptions import NotFoundException, PreconditionFailedException
+from app.services.batches import order_by_requested_ids
 
 
 class CategoryService:
     def __init__(self, category_repo: CategoryRepository):
         self.category_repo = category_repo
 
-    async def get_all_categories(self) -> list[CategoryModel]:
-        db_categories = await self.category_repo.get_all()
+    async def get_all_categories(self) -> list[dict[str, Any]]:
+        db_categories = await self.category_repo.get_all_rows()
         return db_categories
 
-    async def get_category_by_id(self, category_id: int) -> Optional[CategoryModel]:
-        db_category = await self.category_repo.get_by_id(category_id)
+    async def get_category_by_id(self, category_id: int) -> Optional[dict[str, Any]]:
+        db_category = await self.category_repo.get_row_by_id(category_id)
         if not db_category:
             raise NotFoundException(f"Category with id {category_id} not found")
         return db_category
 
-    async def create_category(
-        self, category: CategoryCreate
-    ) -> Optional[CategoryModel]:
+    async def get_categories_batch(self, category_ids: list[int]) -> dict[str, list]:
+        rows = await self.category_repo.get_rows_by_ids(category_ids)
+        return order_by_requested_ids(category_ids, rows)
+
+    async def create_category(self, category: CategoryCreate) -> dict[str, Any]:
         if category.parent_id == 0:
             category.parent_id = None
-        if category.parent_id:
-            parent = await self.category_repo.get_by_id(category.parent_id)
-            if not parent:
-                raise NotFoundException(
-                    f"Parent category with id {category.parent_id} not found"
-                )
-        exsiting_category = await self.category_repo.get_by_name(category.name)
-        if exsiting_category:
-            raise ConflictException(f"Category '{category.name}' already exists")
         category_db = await self.category_repo.create(category)
+        if not category_db:
+            raise NotFoundException(
+                f"Parent category with id {category.parent_id} not found"
+            )
         return category_db
 
     async def update_category(
-        self, category_id: int, category: CategoryCreate
-    ) -> CategoryModel:
+        self,
+        category_id: int,
+        category: CategoryCreate,
+        expected_version: Optional[int] = None,
+    ) -> dict[str, Any]:
         if category.parent_id == 0:
             category.parent_id = None
-        exsiting_category = await self.category_repo.get_by_id(category_id)
-        if not exsiting_category:
+        return await self._update(category_id, category.model_dump(), expected_version)
+
+    async def patch_category(
+        self,
+        category_id: int,
+        category: CategoryUpdate,
+        expected_version: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """Записывает только переданные поля; пустой PATCH ничего не пишет."""
+        values = category.model_dump(exclude_unset=True)
+        if values:
+            return await self._update(category_id, values, expected_version)
+        category_db = await self.get_category_by_id(category_id)
+        if expected_version is not None and category_db["version"] != expected_version:
+            raise PreconditionFailedException(
+                f"Category with id {category_id} has been modified"
+            )
+        return category_db
+
+    async def _update(
+        self,
+        category_id: int,
+        values: dict[str, Any],
+        expected_version: Optional[int],
+    ) -> dict[str, Any]:
+        category_db = await self.category_repo.update(
+            category_id, values, expected_version
+        )
+        if category_db:
+            return category_db
+        existing_category = await self.category_repo.get_by_id(category_id)
+        if not existing_category:
             raise NotFoundException(f"Category with id {category_id} not found")
-        if category.name != exsiting_category.name:
-            category_with_same_name = await self.category_repo.get_by_name(
-                category.name
+        if (
+            expected_version is not None
+            and existing_category.version != expected_version
+        ):
+            raise PreconditionFailedException(
+                f"Category with id {category_id} has been modified"
+            )
+        if values.get("parent_id") is not None:
+            raise NotFoundException(
+                f"Parent category with id {values['parent_id']} not found"
             )
-            if category_with_same_name:
-                raise ConflictException(f"Category '{category.name}' already exists")
-        return await self.category_repo.update(category_id, category)
+        raise NotFoundException(f"Category with id {category_id} not found")
 
     async def delete_category(self, category_id: int) -> bool:
         existing_category = await self.category_repo.get_by_id(category_id)
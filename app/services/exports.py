@@ -0,0 +1,71 @@
+import csv
+import io
+from collections.abc import AsyncIterator, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.repositories.products import ProductRepository
+from app.repositories.reviews import ReviewRepository
+from app.repositories.review_stats import ReviewStatsRepository
+from app.schemas.exports import ExportFormat
+from app.schemas.products import Product
+from app.schemas.reviews import Review
+
+
+async def encode_batches(
+    batches: AsyncIterator[Sequence[object]],
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    """
+    Сериализует пачки ORM-объектов в NDJSON или CSV по одной пачке за раз,
+    в том же виде, в каком их отдают обычные эндпоинты.
+    """
+    if export_format is ExportFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(schema.model_fields))
+        writer.writeheader()
+        async for batch in batches:
+            writer.writerows(
+                schema.model_validate(obj).model_dump(mode="json") for obj in batch
+            )
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+        return
+
+    async for batch in batches:
+        yield b"".join(
+            schema.model_validate(obj).model_dump_json().encode() + b"\n"
+            for obj in batch
+        )
+
+
+class ExportService:
+    """
+    Выгрузка каталога потоком. Сессия открывается внутри генератора:
+    зависимости с yield закрываются до отправки тела StreamingResponse.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+
+    async def export_products(
+        self, export_format: ExportFormat
+    ) -> AsyncIterator[bytes]:
+        async with self.session_factory() as session:
+            batches = ProductRepository(db=session).stream_all()
+            async for chunk in encode_batches(batches, Product, export_format):
+                yield chunk
+
+    async def export_reviews(self, export_format: ExportFormat) -> AsyncIterator[bytes]:
+        async with self.session_factory() as session:
+            repository = ReviewRepository(
+                db=session, stats_repo=ReviewStatsRepository(db=session)
+            )
+            batches = repository.stream_all()
+            async for chunk in encode_batches(batches, Review, export_format):
+                yield chunk
@@ -1,12 +1,22 @@
 # ruff: noqa: E712
-from typing import Optional
+import asyncio
+from typing import Any, Optional
 
-from app.models.products import Product as ProductModel
-from app.schemas.products import ProductCreate
+from app.schemas.products import ProductCreate, ProductUpdate, ProductBulkUpdate
 from app.repositories.products import ProductRepository
 from app.repositories.categories import CategoryRepository
 from app.repositories.users import UserRepository
-from app.core.exceptions import NotFoundException, ConflictException, BusinessException
+from app.repositories.review_stats import ReviewStatsRepository
+from app.repositories.loaders import RepositoryLoaders
+from app.core.exceptions import (
+    NotFoundException,
+    BusinessException,
+    PreconditionFailedException,
+)
+from app.services.batches import order_by_requested_ids
+
+
+SELLER_ROLES = ("seller", "admin")
 
 
 class ProductService:
@@ -16,47 +26,54 @@ class ProductService:
         product_repo: ProductRepository,
         category_repo: CategoryRepository,
         user_repo: UserRepository,
+        loaders: RepositoryLoaders,
+        *,
+        review_stats_repo: ReviewStatsRepository,
     ):
         self.product_repo = product_repo
         self.category_repo = category_repo
         self.user_repo = user_repo
+        self.loaders = loaders
+        self.review_stats_repo = review_stats_repo
 
-    async def get_all_products(self) -> list[ProductModel]:
-        products_db = await self.product_repo.get_all()
+    async def get_all_products(self) -> list[dict[str, Any]]:
+        products_db = await self.product_repo.get_all_rows()
         return products_db
 
+    async def get_products_batch(self, product_ids: list[int]) -> dict[str, list]:
+        rows = await self.product_repo.get_rows_by_ids(product_ids)
+        return order_by_requested_ids(product_ids, rows)
+
     async def create(
         self,
         product_create: ProductCreate,
         email_user: str,
-    ) -> ProductModel:
-        existing_product = await self.product_repo.get_by_name(product_create.name)
-        if existing_product:
-            raise ConflictException(f"Product '{product_create.name}' already exists")
-        product = await self.product_repo.get_by_name(product_create.name)
-        if product:
-            raise ConflictException(
-                f"Product with name {product_create.name} already exists"
-            )
+    ) -> dict[str, Any]:
         if not product_create.category_id:
             raise BusinessException("Product must have category")
-        category = await self.category_repo.get_by_id(product_create.category_id)
+        product = await self.product_repo.create(
+            product_create, seller_email=email_user, seller_roles=SELLER_ROLES
+        )
+        if product:
+            return product
+        # INSERT не вставил строку: уточняем причину, это редкий путь
+        category, current_user = await asyncio.gather(
+            self.loaders.categories.load(product_create.category_id),
+            self.loaders.users_by_email.load(email_user),
+        )
         if not category:
             raise NotFoundException(
                 f"Product with category id {product_create.category_id} not found"
             )
-        current_user = await self.user_repo.get_user_by_email(email_user)
         if not current_user:
             raise NotFoundException("You must login")
-        if current_user.role not in ("seller", "admin"):
-            raise BusinessException("Action not allowed for this user role")
-        return await self.product_repo.create(product_create, current_user)
+        raise BusinessException("Action not allowed for this user role")
 
     async def get_products_by_category(
         self,
         category_id: int,
-    ) -> list[ProductModel]:
-        products_db = await self.product_repo.get_by_category(category_id)
+    ) -> list[dict[str, Any]]:
+        products_db = await self.product_repo.get_rows_by_category(category_id)
         if not products_db:
             raise NotFoundException(f"Product with category id {category_id} not found")
         return products_db
@@ -64,40 +81,114 @@ class ProductService:
     async def get_by_id(
         self,
         product_id: int,
-    ) -> Optional[ProductModel]:
-        product_db = await self.product_repo.get_by_id(product_id)
+        embed_review_summary: bool = False,
+    ) -> Optional[dict[str, Any]]:
+        product_db = await self.product_repo.get_row_by_id(product_id)
         if not product_db:
             raise NotFoundException(f"Product with id {product_id} not found")
+        if embed_review_summary:
+            # Сводка - одна строка по PK, без агрегации по отзывам
+            product_db = {
+                **product_db,
+                "review_summary": await self.review_stats_repo.get_summary(product_id),
+            }
         return product_db
 
     async def update(
         self,
         product_id: int,
         product_update: ProductCreate,
-    ) -> Optional[ProductModel]:
-        product = await self.product_repo.get_by_id(product_id)
-        if not product:
-            raise NotFoundException(f"Product with id {product_id} not found")
-        if product_update.name != product.name:
-            existing_product = await self.product_repo.get_by_name(product_update.name)
-            if existing_product:
-                raise ConflictException(
-                    f"Product '{product_update.name}' already exists"
-                )
+        email_user: str,
+        expected_version: Optional[int] = None,
+    ) -> dict[str, Any]:
         if not product_update.category_id:
             raise BusinessException("Product must have category")
-        category_id = await self.category_repo.get_by_id(product_update.category_id)
-        if not category_id:
+        seller_id = await self._editor_seller_id(email_user)
+        return await self._update(
+            product_id, product_update.model_dump(), expected_version, seller_id
+        )
+
+    async def patch(
+        self,
+        product_id: int,
+        product_update: ProductUpdate,
+        email_user: str,
+        expected_version: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """Записывает только переданные поля; пустой PATCH ничего не пишет."""
+        seller_id = await self._editor_seller_id(email_user)
+        values = product_update.model_dump(exclude_unset=True)
+        if values:
+            return await self._update(product_id, values, expected_version, seller_id)
+        product = await self.get_by_id(product_id)
+        if expected_version is not None and product["version"] != expected_version:
+            raise PreconditionFailedException(
+                f"Product with id {product_id} has been modified"
+            )
+        return product
+
+    async def _editor_seller_id(self, email_user: str) -> Optional[int]:
+        """
+        Кто может менять товары: администратор - любые (None), продавец -
+        только свои (его ID уходит в условие UPDATE).
+        """
+        current_user = await self.loaders.users_by_email.load(email_user)
+        if not current_user:
+            raise NotFoundException("You must login")
+        if current_user.role == "admin":
+            return None
+        if current_user.role != "seller":
+            raise BusinessException(
+                "Action not allowed for this user role", status_code=403
+            )
+        return current_user.id
+
+    async def _update(
+        self,
+        product_id: int,
+        values: dict[str, Any],
+        expected_version: Optional[int],
+        seller_id: Optional[int],
+    ) -> dict[str, Any]:
+        product = await self.product_repo.update(
+            product_id, values, expected_version, seller_id
+        )
+        if product:
+            return product
+        product_db = await self.loaders.products.load(product_id)
+        if not product_db:
+            raise NotFoundException(f"Product with id {product_id} not found")
+        if seller_id is not None and product_db.seller_id != seller_id:
+            raise BusinessException("Action not allowed", status_code=403)
+        if expected_version is not None and product_db.version != expected_version:
+            raise PreconditionFailedException(
+                f"Product with id {product_id} has been modified"
+            )
+        if "category_id" in values:
             raise NotFoundException(
-                f"Product with category id {product_update.category_id} not found"
+                f"Product with category id {values['category_id']} not found"
             )
-        return await self.product_repo.update(product_id, product_update)
+        raise NotFoundException(f"Product with id {product_id} not found")
+
+    async def update_stock_and_prices(
+        self, bulk_update: ProductBulkUpdate, email_user: str
+    ) -> dict[str, list]:
+        """Продавец меняет только свои товары: чужие ID попадают в missing."""
+        seller_id = await self._editor_seller_id(email_user)
+        rows = await self.product_repo.update_stock_and_prices(
+            bulk_update.items, seller_id
+        )
+        return order_by_requested_ids([item.id for item in bulk_update.items], rows)
 
     async def delete(
         self,
         product_id: int,
+        email_user: str,
     ) -> bool:
-        product_existing = await self.product_repo.get_by_id(product_id)
+        seller_id = await self._editor_seller_id(email_user)
+        product_existing = await self.loaders.products.load(product_id)
         if not product_existing:
             raise NotFoundException(f"Product with id {product_id} not found")
+        if seller_id is not None and product_existing.seller_id != seller_id:
+            raise BusinessException("Action not allowed", status_code=403)
         return await self.product_repo.delete(product_id)
@@ -1,11 +1,21 @@
 # ruff: noqa: E712
-from typing import Optional
-from app.schemas.reviews import ReviewCreate
+import asyncio
+from typing import Any, Optional
+from app.schemas.reviews import ReviewCreate, ReviewUpdate
 from app.models.reviews import Review as ReviewModel
 from app.repositories.reviews import ReviewRepository
+from app.repositories.review_stats import ReviewStatsRepository
+from app.repositories.pagination import KeysetPage
 from app.repositories.products import ProductRepository
 from app.repositories.users import UserRepository
-from app.core.exceptions import NotFoundException, ConflictException, BusinessException
+from app.repositories.loaders import RepositoryLoaders
+from app.core.exceptions import (
+    NotFoundException,
+    ConflictException,
+    BusinessException,
+    PreconditionFailedException,
+)
+from app.services.batches import order_by_requested_ids
 
 
 class ReviewService:
@@ -15,75 +25,149 @@ class ReviewService:
         review_repo: ReviewRepository,
         product_repo: ProductRepository,
         user_repo: UserRepository,
+        loaders: RepositoryLoaders,
+        *,
+        review_stats_repo: ReviewStatsRepository,
     ):
         self.review_repo = review_repo
         self.product_repo = product_repo
         self.user_repo = user_repo
+        self.loaders = loaders
+        self.review_stats_repo = review_stats_repo
 
-    async def get_all_reviews(self) -> list[ReviewModel]:
-        reviews_db = await self.review_repo.get_all()
-        return reviews_db
+    async def get_reviews_page(
+        self, page: KeysetPage
+    ) -> tuple[list[dict[str, Any]], Optional[str]]:
+        return await self.review_repo.get_rows_page(page)
+
+    async def get_reviews_batch(self, review_ids: list[int]) -> dict[str, list]:
+        rows = await self.review_repo.get_rows_by_ids(review_ids)
+        return order_by_requested_ids(review_ids, rows)
 
     async def get_review_by_id(self, review_id: int) -> Optional[ReviewModel]:
-        review_db = await self.review_repo.get_by_id(review_id)
+        review_db = await self.loaders.reviews.load(review_id)
         if not review_db:
             raise NotFoundException(f"Review with id {review_id} not found")
         return review_db
 
-    async def get_reviews_by_product(self, product_id: int) -> list[ReviewModel]:
-        review_db = await self.review_repo.get_reviews_by_product(product_id)
-        return review_db
+    async def get_review_summary(self, product_id: int) -> dict[str, Any]:
+        summary = await self.review_stats_repo.get_summary(product_id)
+        if not summary:
+            raise NotFoundException(f"Product with id {product_id} not found")
+        return summary
+
+    async def get_reviews_by_product(
+        self, product_id: int, page: KeysetPage
+    ) -> tuple[list[dict[str, Any]], Optional[str]]:
+        return await self.review_repo.get_rows_page(page, product_id=product_id)
+
+    async def get_reviews_by_user(
+        self, user_id: int, page: KeysetPage
+    ) -> tuple[list[dict[str, Any]], Optional[str]]:
+        return await self.review_repo.get_rows_page(page, user_id=user_id)
 
     async def create_review(
         self,
         review: ReviewCreate,
         email_user: str,
     ):
-        product = await self.product_repo.get_by_id(review.product_id)
+        product, current_user = await asyncio.gather(
+            self.loaders.products.load(review.product_id),
+            self.loaders.users_by_email.load(email_user),
+        )
         if not product:
             raise NotFoundException(
                 f"Review with product id {review.product_id} not found"
             )
-        current_user = await self.user_repo.get_user_by_email(email=email_user)
         if not current_user:
             raise NotFoundException("User with this email not found")
         if current_user.role not in ("seller", "admin"):
             raise BusinessException("Action not allowed for this user role")
         existing_review = await self.review_repo.check_existing(
-            product.id, current_user.id
+            user_id=current_user.id, product_id=product.id
         )
         if existing_review:
             raise ConflictException("Review already existing")
         review_db = await self.review_repo.create(review, current_user)
-        await self.review_repo.update_rating(review_db)
         return review_db
 
-    async def update_review(self, review_id, review: ReviewCreate, email_user: str):
-        review_db = await self.review_repo.get_by_id(review_id)
+    async def update_review(
+        self,
+        review_id,
+        review: ReviewCreate,
+        email_user: str,
+        expected_version: Optional[int] = None,
+    ):
+        return await self._update_review(
+            review_id, review.model_dump(), email_user, expected_version
+        )
+
+    async def patch_review(
+        self,
+        review_id: int,
+        review: ReviewUpdate,
+        email_user: str,
+        expected_version: Optional[int] = None,
+    ):
+        """Записывает только переданные поля; рейтинг пересчитывается при смене оценки."""
+        return await self._update_review(
+            review_id,
+            review.model_dump(exclude_unset=True),
+            email_user,
+            expected_version,
+        )
+
+    async def _update_review(
+        self,
+        review_id: int,
+        values: dict[str, Any],
+        email_user: str,
+        expected_version: Optional[int],
+    ):
+        loads = [
+            self.loaders.reviews.load(review_id),
+            self.loaders.users_by_email.load(email_user),
+        ]
+        if "product_id" in values:
+            loads.append(self.loaders.products.load(values["product_id"]))
+        review_db, current_user, *product = await asyncio.gather(*loads)
         if not review_db:
             raise NotFoundException(f"Review with id {review_id} not found")
-        product = await self.product_repo.get_by_id(review.product_id)
-        if not product:
+        if product and not product[0]:
             raise NotFoundException(
-                f"Review with product id {review.product_id} not found"
+                f"Review with product id {values['product_id']} not found"
             )
-        current_user = await self.user_repo.get_user_by_email(email_user)
         if not current_user:
             raise NotFoundException("User with this email for found")
         if current_user.id != review_db.user_id and current_user.role != "admin":
             raise BusinessException(detail="Action not allowed", status_code=403)
+        if expected_version is not None and review_db.version != expected_version:
+            raise PreconditionFailedException(
+                f"Review with id {review_id} has been modified"
+            )
+        if not values:
+            return review_db
         review_upt_db = await self.review_repo.update(
             review_id,
-            review,
+            values,
+            expected_version,
         )
-        await self.review_repo.update_rating(review_upt_db)
+        if not review_upt_db:
+            # Отзыв изменили или удалили между проверкой и UPDATE
+            if expected_version is not None:
+                raise PreconditionFailedException(
+                    f"Review with id {review_id} has been modified"
+                )
+            raise NotFoundException(f"Review with id {review_id} not found")
         return review_upt_db
 
     async def delete_review(self, review_id: int, email_user: str):
-        review_db = await self.review_repo.get_by_id(review_id)
+        review_db, current_user = await asyncio.gather(
+            self.loaders.reviews.load(review_id),
+            self.loaders.users_by_email.load(email_user),
+        )
         if not review_db:
             raise NotFoundException(f"Review with id {review_id} not found")
-        current_user = await self.user_repo.get_user_by_email(email_user)
         if not current_user:
             raise NotFoundException("User with this email for found")
         if current_user.id != review_db.user_id and current_user.role != "admin":
@@ -2,7 +2,7 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from app.models.users import User as UserModel
-from app.schemas.users import UserCreate
+from app.schemas.users import UserCreate, UserCredentials, UserUpdate
 from app.repositories.users import UserRepository
 from app.auth.security import (
     create_access_token,
@@ -39,18 +39,31 @@ class UserService:
         return user_db
 
     async def update_user(
-        self, user_id: int, user_update: UserCreate
+        self,
+        user_id: int,
+        user_update: UserCredentials | UserUpdate,
+        email_user: str,
     ) -> Optional[UserModel]:
-        user_db = await self.user_repo.get_by_id(user_id)
-        if not user_db:
-            raise NotFoundException(f"User with id {user_id} not found")
-
+        """
+        Обновляет только переданные поля (PUT и PATCH): UPDATE пишет лишь
+        изменённые колонки, пустой запрос ничего не пишет. Менять email и
+        пароль может сам пользователь или администратор.
+        """
+        current_user = await self.user_repo.get_user_by_email(email_user)
+        if not current_user:
+            raise NotFoundException("User with this email not found")
+        if current_user.id != user_id and current_user.role != "admin":
+            raise BusinessException("Action not allowed", status_code=403)
         modified_data = user_update.model_dump(exclude_unset=True)
         if "password" in modified_data:
             modified_data["hashed_password"] = hash_password(modified_data["password"])
             del modified_data["password"]
 
+        if not modified_data:
+            return await self.get_user(user_id)
         user_upt_db = await self.user_repo.update(user_id, modified_data)
+        if not user_upt_db:
+            raise NotFoundException(f"User with id {user_id} not found")
         return user_upt_db
 
     async def delete_user(self, user_id: int) -> bool:
@@ -1,8 +1,9 @@
 import time
-from celery import shared_task
 
+from app.core.celery_app import celery
 
-@shared_task()
+
+@celery.task()
 def call_background_task(message):
     time.sleep(10)
     print("Background Task called!")
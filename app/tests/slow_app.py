@@ -0,0 +1,13 @@
+"""Приложение для теста остановки: create_app() с медленным маршрутом."""
+
+import asyncio
+
+from app.main import create_app
+
+app = create_app()
+
+
+@app.get("/slow")
+async def slow(seconds: float = 1.0) -> dict:
+    await asyncio.sleep(seconds)
+    return {"slept": seconds}
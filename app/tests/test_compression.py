@@ -0,0 +1,24 @@
+# pylint:disable=unused-argument
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.main import create_app
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_small_response_is_not_compressed(client):
+    response = await client.get("/categories/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert int(response.headers["content-length"]) < settings.COMPRESSION_MINIMUM_SIZE
+
+
+async def test_response_above_minimum_size_is_compressed(db, monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_MINIMUM_SIZE", 16)
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/categories/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert [category["id"] for category in response.json()] == [1, 2]
@@ -0,0 +1,66 @@
+# pylint:disable=unused-argument
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.main import create_app
+
+pytestmark = pytest.mark.anyio
+
+# 496 символов, около 1 КБ в UTF-8: такой ответ сжимается при настройках по умолчанию
+LONG_DESCRIPTION = "Описание товара " * 31
+
+
+async def test_category_detail_has_strong_version_etag(client):
+    response = await client.get("/categories/1")
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"v1"'
+
+    response = await client.get("/categories/1", headers={"If-None-Match": '"v1"'})
+    assert response.status_code == 304
+
+
+async def test_if_match_rejects_stale_and_foreign_etags(client):
+    for etag in ('"v2"', 'W/"v2"', '"abc"', 'W/"abc"'):
+        response = await client.patch(
+            "/categories/1", json={"name": "Smartphones"}, headers={"If-Match": etag}
+        )
+        assert response.status_code == 412
+
+    response = await client.patch(
+        "/categories/1", json={"name": "Smartphones"}, headers={"If-Match": '"v1"'}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"v2"'
+
+
+async def test_compression_weakens_version_etag(db, monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_MINIMUM_SIZE", 1)
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            "/categories/1", headers={"Accept-Encoding": "gzip"}
+        )
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"v1"'
+
+
+async def test_compressed_etag_works_as_if_match(client, seller_headers):
+    response = await client.patch(
+        "/products/1", json={"description": LONG_DESCRIPTION}, headers=seller_headers
+    )
+    assert response.status_code == 200
+    version_etag = response.headers["etag"].removeprefix("W/")
+
+    response = await client.get("/products/1", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    assert etag == f"W/{version_etag}"
+
+    response = await client.patch(
+        "/products/1",
+        json={"stock": 7},
+        headers={**seller_headers, "If-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != version_etag
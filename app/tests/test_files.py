@@ -0,0 +1,48 @@
+import threading
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core import files
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+CONTENT = bytes(range(256)) * 4096
+
+
+def file_app(path: str) -> FastAPI:
+    application = FastAPI()
+
+    @application.get("/file")
+    async def get_file():
+        return files.get_file_response(file_path=path, file_name="data.bin")
+
+    return application
+
+
+async def test_mmap_mode_serves_file_from_worker_threads(tmp_path, monkeypatch):
+    path = tmp_path / "data.bin"
+    path.write_bytes(CONTENT)
+    monkeypatch.setattr(settings, "FILE_SERVING_MODE", "mmap")
+    monkeypatch.setattr(files.ConditionalFileResponse, "chunk_size", 64 * 1024)
+    threads = []
+    original_map_file = files.map_file
+
+    def map_file(file_path):
+        threads.append(threading.get_ident())
+        return original_map_file(file_path)
+
+    monkeypatch.setattr(files, "map_file", map_file)
+    transport = httpx.ASGITransport(app=file_app(str(path)))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/file")
+        assert response.content == CONTENT
+        assert threads and threads[0] != threading.get_ident()
+
+        # Range обслуживает Starlette, mmap не открывается
+        response = await client.get("/file", headers={"Range": "bytes=10-19"})
+        assert response.status_code == 206
+        assert response.content == CONTENT[10:20]
+        assert len(threads) == 1
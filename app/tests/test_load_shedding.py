@@ -0,0 +1,116 @@
+# pylint:disable=redefined-outer-name
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import load_shedding
+from app.core.config import settings
+from app.core.load_shedding import ConcurrencyLimiter, concurrency_limits
+
+
+def test_database_groups_fit_in_pool():
+    limits = concurrency_limits()
+    pool_capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    assert sum(limits[group] for group in settings.CONCURRENCY_POOL_SHARES) <= (
+        pool_capacity
+    )
+    assert all(limit >= 1 for limit in limits.values())
+    assert limits["uploads"] == settings.CONCURRENCY_LIMITS["uploads"]
+
+
+def test_limits_follow_pool_size(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 40)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    assert concurrency_limits()["catalog"] == 24
+
+
+@pytest.mark.parametrize(
+    "shares, pool_size",
+    [({"catalog": 0.8, "writes": 0.3}, 20), ({"catalog": 0.5, "auth": 0.01}, 20)],
+)
+def test_invalid_shares_fail_at_startup(monkeypatch, shares, pool_size):
+    monkeypatch.setattr(settings, "CONCURRENCY_POOL_SHARES", shares)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", pool_size)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    with pytest.raises(ValueError):
+        concurrency_limits()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def run_queue(limiter, clock, backlog: int, steps: int, step: float) -> bool:
+    """
+    Слот один: держатель и backlog ожидающих, затем каждые step секунд в
+    очередь встаёт новый запрос, а слот переходит к голове очереди. Очередь
+    не пустеет ни разу, каждый ждёт (backlog + 1) * step секунд. Возвращает
+    overloaded(), пока очередь ещё непуста.
+    """
+    assert await limiter.acquire()
+    tasks = []
+    for _ in range(backlog):
+        tasks.append(asyncio.create_task(limiter.acquire()))
+        await asyncio.sleep(0)
+    for _ in range(steps):
+        tasks.append(asyncio.create_task(limiter.acquire()))
+        await asyncio.sleep(0)
+        clock.now += step
+        limiter.release()
+        await asyncio.sleep(0)
+    overloaded = limiter.overloaded()
+    # Получившие слот дорабатывают и держат его, остальные уходят из очереди
+    await asyncio.wait(tasks, timeout=0)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return overloaded
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    # Подменяются только часы модуля: таймеры цикла событий идут по настоящим
+    monkeypatch.setattr(load_shedding, "time", SimpleNamespace(monotonic=fake))
+    return fake
+
+
+def make_limiter() -> ConcurrencyLimiter:
+    return ConcurrencyLimiter("test", 1, target=0.05, interval=0.1, max_wait=1.0)
+
+
+@pytest.mark.anyio
+async def test_short_waits_in_busy_queue_are_not_overload(clock):
+    limiter = make_limiter()
+    # Очередь непуста 300 мс (три интервала), но каждый ждёт 20 мс
+    assert not await run_queue(limiter, clock, backlog=1, steps=30, step=0.01)
+
+
+@pytest.mark.anyio
+async def test_standing_queue_is_overload(clock):
+    limiter = make_limiter()
+    # Те же 300 мс, но за каждым запросом стоит ещё шесть: ждут по 70 мс
+    assert await run_queue(limiter, clock, backlog=6, steps=30, step=0.01)
+    assert limiter.overloaded()
+
+    # Новый запрос ждёт не дольше target и отклоняется
+    started = asyncio.get_running_loop().time()
+    assert not await limiter.acquire()
+    assert asyncio.get_running_loop().time() - started < limiter.max_wait
+
+
+@pytest.mark.anyio
+async def test_overload_ends_when_queue_drains(clock):
+    limiter = make_limiter()
+    await run_queue(limiter, clock, backlog=6, steps=30, step=0.01)
+    assert limiter.overloaded()
+    limiter.release()
+    clock.now += 0.2
+    assert await limiter.acquire()
+    clock.now += 0.2
+    assert not limiter.overloaded()
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from app.core.database import database
+from app.core.dependencies.repositories import make_repository_loaders
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_keys_of_one_loader_share_one_query(count_statements):
+    async with database.session_maker() as session:
+        loaders = make_repository_loaders(session)
+        with count_statements() as counter:
+            products = await asyncio.gather(
+                loaders.products.load(1),
+                loaders.products.load(2),
+                loaders.products.load(1),
+                loaders.products.load(404),
+            )
+        assert counter.count == 1
+        assert [product and product.id for product in products] == [1, 2, 1, None]
+
+        with count_statements() as counter:
+            assert (await loaders.products.load(2)).id == 2
+        assert counter.count == 0
+
+
+async def test_different_loaders_query_one_after_another(count_statements):
+    # Батчуются только ключи одного загрузчика: gather по разным загрузчикам
+    # даёт запрос на каждый, и выполняются они по очереди в одной сессии
+    async with database.session_maker() as session:
+        loaders = make_repository_loaders(session)
+        with count_statements() as counter:
+            product, user = await asyncio.gather(
+                loaders.products.load(1),
+                loaders.users_by_email.load("seller@example.com"),
+            )
+        assert counter.count == 2
+        assert product.id == 1 and user.id == 1
+
+
+async def test_create_review_statement_count(client, count_statements, seller_headers):
+    with count_statements() as counter:
+        response = await client.post(
+            "/reviews",
+            json={"product_id": 2, "comment": "Fine", "grade": 5},
+            headers=seller_headers,
+        )
+    assert response.status_code == 201, response.text
+    # товар, пользователь, проверка дубля, INSERT, сводка отзывов, рейтинг,
+    # чтение созданного отзыва
+    assert counter.count == 7, counter.statements
+
+
+async def test_patch_review_statement_count(client, count_statements, seller_headers):
+    with count_statements() as counter:
+        response = await client.patch(
+            "/reviews/1", json={"grade": 2}, headers=seller_headers
+        )
+    assert response.status_code == 200, response.text
+    # отзыв, пользователь, блокировка отзыва, UPDATE, сводка отзывов, рейтинг
+    assert counter.count == 6, counter.statements
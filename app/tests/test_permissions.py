@@ -0,0 +1,81 @@
+import pytest
+
+from app.tests.conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+
+async def register_other_seller(client) -> dict[str, str]:
+    response = await client.post(
+        "/users/register",
+        json={"email": "other@example.com", "password": "password", "role": "seller"},
+    )
+    assert response.status_code == 201
+    return auth_headers("other@example.com", "seller", response.json()["id"])
+
+
+async def test_user_edit_requires_authentication(client):
+    response = await client.patch("/users/edit/2", json={"email": "new@example.com"})
+    assert response.status_code == 401
+
+
+async def test_user_edits_only_own_account(client, buyer_headers):
+    response = await client.patch(
+        "/users/edit/1", json={"email": "taken@example.com"}, headers=buyer_headers
+    )
+    assert response.status_code == 403
+
+    response = await client.put(
+        "/users/edit/2",
+        json={
+            "email": "buyer@example.com",
+            "password": "new-password",
+            "role": "admin",
+        },
+        headers=buyer_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["role"] == "buyer"
+
+
+async def test_admin_edits_any_account(client, admin_headers):
+    response = await client.patch(
+        "/users/edit/2", json={"password": "new-password"}, headers=admin_headers
+    )
+    assert response.status_code == 200
+
+
+async def test_bulk_product_update_requires_seller_or_admin(
+    client, buyer_headers, admin_headers
+):
+    changes = {"items": [{"id": 1, "price": 1.5}]}
+    response = await client.patch("/products/", json=changes)
+    assert response.status_code == 401
+
+    response = await client.patch("/products/", json=changes, headers=buyer_headers)
+    assert response.status_code == 403
+
+    response = await client.patch("/products/", json=changes, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["missing"] == []
+
+
+async def test_seller_changes_only_own_products(client, seller_headers):
+    other_seller = await register_other_seller(client)
+    changes = {"items": [{"id": 1, "stock": 0}]}
+    response = await client.patch("/products/", json=changes, headers=other_seller)
+    assert response.status_code == 200
+    assert response.json()["missing"] == [1]
+
+    response = await client.patch(
+        "/products/1", json={"stock": 0}, headers=other_seller
+    )
+    assert response.status_code == 403
+    response = await client.delete("/products/1", headers=other_seller)
+    assert response.status_code == 403
+
+    response = await client.patch(
+        "/products/1", json={"stock": 0}, headers=seller_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["stock"] == 0
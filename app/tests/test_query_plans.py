@@ -0,0 +1,19 @@
+import pytest
+
+from app.core.database import database
+from scripts.check_query_plans import run_checks
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_query_plans_match_snapshots(test_database_url):
+    # Схема создаётся миграциями и после проверки остаётся пустой: остальные
+    # тесты строят её по моделям
+    try:
+        failures = await run_checks(test_database_url)
+    finally:
+        async with database.engine.begin() as connection:
+            await connection.exec_driver_sql("DROP SCHEMA public CASCADE")
+            await connection.exec_driver_sql("CREATE SCHEMA public")
+        await database.dispose()
+    assert not failures, "\n".join(failures)
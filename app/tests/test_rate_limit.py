@@ -0,0 +1,52 @@
+# pylint:disable=redefined-outer-name,unused-argument
+import pytest
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.rate_limit import catalog_rate_limit, export_rate_limit, get_client_ip
+from app.main import create_app
+
+CATALOG_PREFIXES = ("/products", "/categories", "/reviews")
+
+
+def make_request(peer: str, forwarded: str | None = None) -> Request:
+    headers = []
+    if forwarded is not None:
+        headers.append((b"x-forwarded-for", forwarded.encode()))
+    return Request({"type": "http", "headers": headers, "client": (peer, 50000)})
+
+
+@pytest.fixture
+def trusted_proxies(monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", ["10.0.0.0/8", "192.168.1.1"])
+
+
+def test_forwarded_header_ignored_without_trusted_proxies():
+    request = make_request("203.0.113.7", "198.51.100.1")
+    assert get_client_ip(request) == "203.0.113.7"
+
+
+def test_forwarded_header_ignored_from_untrusted_peer(trusted_proxies):
+    request = make_request("203.0.113.7", "198.51.100.1")
+    assert get_client_ip(request) == "203.0.113.7"
+
+
+def test_client_behind_trusted_proxies(trusted_proxies):
+    assert get_client_ip(make_request("10.1.2.3", "198.51.100.1")) == "198.51.100.1"
+
+    # Левое значение подставил клиент, правое непрокси - адрес, который видел прокси
+    request = make_request("10.1.2.3", "1.2.3.4, 198.51.100.1, 192.168.1.1")
+    assert get_client_ip(request) == "198.51.100.1"
+
+    # Без заголовка ключом остаётся сам прокси
+    assert get_client_ip(make_request("10.1.2.3")) == "10.1.2.3"
+
+
+def test_catalog_reads_are_rate_limited():
+    for route in create_app().routes:
+        if "GET" not in getattr(route, "methods", ()):
+            continue
+        if not route.path.startswith(CATALOG_PREFIXES):
+            continue
+        calls = {dependency.call for dependency in route.dependant.dependencies}
+        assert calls & {catalog_rate_limit, export_rate_limit}, route.path
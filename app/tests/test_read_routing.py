@@ -0,0 +1,71 @@
+# pylint:disable=redefined-outer-name,unused-argument
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database import database
+from app.core.dependencies.db import READ_YOUR_WRITES_COOKIE, read_your_writes_cookie
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def replica_statements(db, monkeypatch):
+    """
+    Реплика - отдельный движок на ту же базу: какой движок выполнил
+    запрос, видно по счётчику выражений на нём.
+    """
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", [settings.DATABASE_URL])
+    await database.dispose()
+    statements = []
+
+    def on_execute(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(
+        database.replica_engines[0].sync_engine, "before_cursor_execute", on_execute
+    )
+    yield statements
+    await database.dispose()
+
+
+async def read_hits_replica(client, statements) -> bool:
+    statements.clear()
+    response = await client.get("/products/1")
+    assert response.status_code == 200, response.text
+    return bool(statements)
+
+
+async def test_reads_after_write_go_to_primary(
+    client, replica_statements, seller_headers
+):
+    assert await read_hits_replica(client, replica_statements)
+
+    response = await client.patch(
+        "/reviews/1", json={"grade": 3}, headers=seller_headers
+    )
+    assert response.status_code == 200, response.text
+    assert READ_YOUR_WRITES_COOKIE in response.cookies
+
+    # Чтение без токена после записи с токеном: метку несёт cookie клиента
+    assert not await read_hits_replica(client, replica_statements)
+
+    # Другой клиент (например, за тем же NAT) по-прежнему читает с реплики
+    cookie = client.cookies.pop(READ_YOUR_WRITES_COOKIE)
+    assert await read_hits_replica(client, replica_statements)
+
+    client.cookies.set(READ_YOUR_WRITES_COOKIE, cookie + "x")
+    assert await read_hits_replica(client, replica_statements)
+
+
+def cookie_value(set_cookie: str) -> str:
+    return set_cookie.split(";")[0].partition("=")[2]
+
+
+async def test_write_mark_expires(client, replica_statements, monkeypatch):
+    client.cookies.set(READ_YOUR_WRITES_COOKIE, cookie_value(read_your_writes_cookie()))
+    assert not await read_hits_replica(client, replica_statements)
+
+    monkeypatch.setattr(settings, "DB_READ_YOUR_WRITES_SECONDS", -1.0)
+    client.cookies.set(READ_YOUR_WRITES_COOKIE, cookie_value(read_your_writes_cookie()))
+    assert await read_hits_replica(client, replica_statements)
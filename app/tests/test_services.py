@@ -0,0 +1,18 @@
+# pylint:disable=unused-argument
+import pytest
+
+from app.core.database import database
+from app.core.dependencies.repositories import make_repository_loaders
+from app.core.dependencies.services import get_product_service
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_write_product_service_embeds_review_summary(db):
+    async with database.session_maker() as session:
+        service = get_product_service(
+            db=session, loaders=make_repository_loaders(session)
+        )
+        product = await service.get_by_id(1, embed_review_summary=True)
+    assert product["review_summary"]["review_count"] == 1
+    assert product["review_summary"]["grades"][4] == 1
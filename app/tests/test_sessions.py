@@ -0,0 +1,90 @@
+# pylint:disable=redefined-outer-name,unused-argument
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.dependencies.models import Dependant
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import database
+from app.core.dependencies.db import get_async_db, get_async_read_db
+from app.main import create_app
+
+pytestmark = pytest.mark.anyio
+
+SESSION_DEPENDENCIES = {get_async_db, get_async_read_db}
+
+
+def session_test_app() -> FastAPI:
+    application = FastAPI()
+
+    @application.get("/no-query")
+    async def no_query(db: AsyncSession = Depends(get_async_db)) -> dict:
+        return {}
+
+    @application.get("/query")
+    async def query(db: AsyncSession = Depends(get_async_db)) -> dict:
+        return {"one": (await db.execute(text("SELECT 1"))).scalar_one()}
+
+    @application.get("/two-sessions")
+    async def two_sessions(
+        db: AsyncSession = Depends(get_async_db),
+        read_db: AsyncSession = Depends(get_async_read_db),
+    ) -> dict:
+        return {}
+
+    return application
+
+
+@contextmanager
+def pool_checkouts() -> Iterator[list]:
+    checkouts = []
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts.append(connection_record)
+
+    sync_engine = database.engine.sync_engine
+    event.listen(sync_engine, "checkout", on_checkout)
+    try:
+        yield checkouts
+    finally:
+        event.remove(sync_engine, "checkout", on_checkout)
+
+
+@pytest.fixture
+async def session_client(db):
+    transport = httpx.ASGITransport(app=session_test_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def test_request_without_queries_checks_out_no_connection(session_client):
+    with pool_checkouts() as checkouts:
+        assert (await session_client.get("/no-query")).status_code == 200
+    assert not checkouts
+
+    with pool_checkouts() as checkouts:
+        assert (await session_client.get("/query")).json() == {"one": 1}
+    assert len(checkouts) == 1
+
+
+async def test_second_session_in_one_request_is_an_error(session_client):
+    with pytest.raises(RuntimeError, match="second database session"):
+        await session_client.get("/two-sessions")
+
+
+def session_dependencies(dependant: Dependant) -> set:
+    found = {dependant.call} & SESSION_DEPENDENCIES
+    for sub_dependant in dependant.dependencies:
+        found |= session_dependencies(sub_dependant)
+    return found
+
+
+def test_no_route_depends_on_both_sessions():
+    for route in create_app().routes:
+        dependant = getattr(route, "dependant", None)
+        if dependant is not None:
+            assert len(session_dependencies(dependant)) <= 1, route.path
@@ -0,0 +1,83 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+
+READINESS_DELAY = 1.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(base_url: str, process: subprocess.Popen) -> None:
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        assert process.poll() is None, "uvicorn exited during startup"
+        try:
+            if httpx.get(f"{base_url}/healthz").status_code == 200:
+                return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise AssertionError("uvicorn did not start")
+
+
+def test_sigterm_drains_in_flight_request():
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.tests.slow_app:app",
+            "--port",
+            str(port),
+            "--timeout-graceful-shutdown",
+            "1",
+        ],
+        env={
+            **os.environ,
+            "SHUTDOWN_READINESS_DELAY_SECONDS": str(READINESS_DELAY),
+            "SHUTDOWN_DRAIN_TIMEOUT_SECONDS": "10",
+        },
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    ) as process:
+        try:
+            wait_until_up(base_url, process)
+            slow_responses = []
+            slow_request = threading.Thread(
+                target=lambda: slow_responses.append(
+                    httpx.get(f"{base_url}/slow", params={"seconds": 3}, timeout=10)
+                )
+            )
+            slow_request.start()
+            time.sleep(0.5)
+            process.send_signal(signal.SIGTERM)
+            time.sleep(0.3)
+
+            # Готовность снята, но до конца задержки запросы ещё обслуживаются
+            assert httpx.get(f"{base_url}/readyz").status_code == 503
+            assert httpx.get(f"{base_url}/").status_code == 200
+
+            time.sleep(READINESS_DELAY)
+            rejected = httpx.get(f"{base_url}/")
+            assert rejected.status_code == 503
+            assert rejected.headers["connection"] == "close"
+            assert httpx.get(f"{base_url}/healthz").status_code == 200
+
+            slow_request.join(timeout=10)
+            assert [response.status_code for response in slow_responses] == [200]
+            process.wait(timeout=10)
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
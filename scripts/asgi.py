@@ -0,0 +1,26 @@
+"""Вспомогательные функции для прямых ASGI-вызовов в бенчмарках."""
+
+
+def make_scope(
+    path: str, headers: list[tuple[bytes, bytes]] | None = None, method: str = "GET"
+) -> dict:
+    path, _, query = path.partition("?")
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": headers or [],
+        "client": ("127.0.0.1", 10000),
+        "server": ("127.0.0.1", 8000),
+        "extensions": {},
+    }
+
+
+async def receive_empty_body() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
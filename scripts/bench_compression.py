@@ -0,0 +1,87 @@
+"""
+Размер ответа и p50-задержка списка товаров с CompressionMiddleware и без.
+Список генерируется в памяти, база данных не нужна.
+
+Запуск из корня проекта:
+    python -m scripts.bench_compression --products 1000 --requests 200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from fastapi import FastAPI
+
+from app.core.middlewares import CompressionMiddleware
+from app.schemas.products import Product
+from scripts.asgi import make_scope, receive_empty_body
+
+
+def make_products(count: int) -> list[dict]:
+    rnd = random.Random(42)
+    words = ["smart", "phone", "case", "black", "pro", "mini", "cable", "usb"]
+    return [
+        {
+            "id": product_id,
+            "name": f"{' '.join(rnd.choices(words, k=3))} {product_id}",
+            "description": " ".join(rnd.choices(words, k=30)),
+            "price": round(rnd.uniform(1, 5000), 2),
+            "image_url": f"/static/images/{product_id}.jpg",
+            "rating": round(rnd.uniform(1, 5), 2),
+            "stock": rnd.randint(0, 500),
+            "category_id": rnd.randint(1, 50),
+            "is_active": True,
+        }
+        for product_id in range(1, count + 1)
+    ]
+
+
+def make_app(products: list[dict]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/products/", response_model=list[Product])
+    async def get_products():
+        return products
+
+    return app
+
+
+async def request(app, accept_encoding: str) -> tuple[int, float]:
+    size = 0
+
+    async def send(message):
+        nonlocal size
+        size += len(message.get("body", b""))
+
+    started = time.perf_counter()
+    await app(
+        make_scope("/products/", [(b"accept-encoding", accept_encoding.encode())]),
+        receive_empty_body,
+        send,
+    )
+    return size, time.perf_counter() - started
+
+
+async def main(product_count: int, requests: int) -> None:
+    inner = make_app(make_products(product_count))
+    compressed = CompressionMiddleware(inner)
+    cases = [("identity", inner, "identity")] + [
+        (encoding, compressed, encoding) for encoding in compressed.encoders
+    ]
+    print(f"{product_count} products, {requests} requests per case")
+    for name, app, accept_encoding in cases:
+        await request(app, accept_encoding)
+        results = [await request(app, accept_encoding) for _ in range(requests)]
+        size = results[0][0]
+        p50 = statistics.median(latency for _, latency in results) * 1000
+        print(f"{name:<9} {size:>10} bytes   p50 {p50:7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.products, args.requests))
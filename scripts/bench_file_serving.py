@@ -0,0 +1,90 @@
+"""
+Сравнение режимов отдачи файлов: старый генератор aiofiles (8KB чанки),
+ConditionalFileResponse в режиме "thread" и в режиме "mmap".
+
+Запуск из корня проекта:
+    python -m scripts.bench_file_serving --size-mb 256 --runs 5
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import aiofiles
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.files import ConditionalFileResponse
+from scripts.asgi import make_scope
+
+
+async def legacy_file_streamer(file_path: str, chunk_size: int = 8192):
+    async with aiofiles.open(file_path, mode="rb") as file:
+        while chunk := await file.read(chunk_size):
+            yield chunk
+
+
+async def receive() -> dict:
+    # Клиент не отключается до конца ответа
+    await asyncio.Event().wait()
+    return {"type": "http.disconnect"}
+
+
+async def serve(response_factory) -> int:
+    received = 0
+
+    async def send(message: dict) -> None:
+        nonlocal received
+        received += len(message.get("body", b""))
+
+    await response_factory()(make_scope("/bench"), receive, send)
+    return received
+
+
+async def measure(name: str, response_factory, runs: int, size: int) -> None:
+    await serve(response_factory)  # прогрев page cache
+    wall = cpu = 0.0
+    for _ in range(runs):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        served = await serve(response_factory)
+        wall += time.perf_counter() - wall_start
+        cpu += time.process_time() - cpu_start
+        assert served == size, f"{name}: served {served} of {size} bytes"
+    gigabytes = size * runs / 1024**3
+    print(
+        f"{name:<22} {size * runs / 1024**2 / wall:10.1f} MB/s"
+        f"   {cpu / gigabytes:8.3f} CPU-s/GB"
+    )
+
+
+async def main(size_mb: int, runs: int) -> None:
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        tmp.write(os.urandom(1024 * 1024) * size_mb)
+    size = size_mb * 1024 * 1024
+    stat_result = os.stat(tmp.name)
+
+    def file_response():
+        return ConditionalFileResponse(tmp.name, stat_result=stat_result)
+
+    try:
+        await measure(
+            "generator (aiofiles)",
+            lambda: StreamingResponse(legacy_file_streamer(tmp.name)),
+            runs,
+            size,
+        )
+        for mode in ("thread", "mmap"):
+            setattr(settings, "FILE_SERVING_MODE", mode)
+            await measure(f"FileResponse ({mode})", file_response, runs, size)
+    finally:
+        os.remove(tmp.name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.size_mb, args.runs))
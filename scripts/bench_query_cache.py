@@ -0,0 +1,105 @@
+"""
+Накладные расходы на вызов горячих запросов репозиториев: запрос, который
+собирается заново при каждом вызове, против заранее собранного шаблона с
+bindparam. Для каждого варианта печатается время на вызов и распределение
+результатов поиска в кэше компиляции SQLAlchemy.
+
+База по умолчанию - временный SQLite-файл (нужен aiosqlite). Для Postgres
+передайте URL одноразовой базы: таблицы будут созданы и заполнены, а размер
+кэша подготовленных выражений asyncpg возьмётся из настроек.
+
+Запуск из корня проекта:
+    python -m scripts.bench_query_cache --calls 5000
+"""
+
+# ruff: noqa: E712
+# pylint:disable=unused-argument,too-many-arguments,too-many-positional-arguments
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+from sqlalchemy import event, make_url, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import COMPILED_CACHE_RESULTS
+from app.models import Category, Product as ProductModel, User
+from app.repositories.products import ProductRepository
+from scripts.database import bench_engine
+
+
+async def seed(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    async with session_maker() as session:
+        session.add(User(id=1, email="bench@example.com", hashed_password="-"))
+        session.add(Category(id=1, name="Bench"))
+        await session.flush()
+        session.add(
+            ProductModel(
+                id=1,
+                name="Bench product",
+                price=10,
+                stock=1,
+                category_id=1,
+                seller_id=1,
+            )
+        )
+        await session.commit()
+
+
+async def inline_get_by_id(session: AsyncSession, product_id: int):
+    """Прежний вариант: запрос собирается при каждом вызове."""
+    result = await session.scalars(
+        select(ProductModel).where(
+            ProductModel.id == product_id, ProductModel.is_active == True
+        )
+    )
+    return result.first()
+
+
+async def template_get_by_id(session: AsyncSession, product_id: int):
+    return await ProductRepository(db=session).get_by_id(product_id)
+
+
+async def main(database_url: str | None, calls: int) -> None:
+    connect_args = {}
+    if database_url and make_url(database_url).get_driver_name() == "asyncpg":
+        connect_args["prepared_statement_cache_size"] = (
+            settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+        )
+    cache_results: Counter[str] = Counter()
+    async with bench_engine(
+        database_url,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        connect_args=connect_args,
+    ) as engine:
+
+        @event.listens_for(engine.sync_engine, "after_cursor_execute")
+        def count(conn, cursor, statement, parameters, context, executemany):
+            cache_results[COMPILED_CACHE_RESULTS.get(context.cache_hit, "no_key")] += 1
+
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        await seed(session_maker)
+        for name, get_by_id in (
+            ("inline", inline_get_by_id),
+            ("template", template_get_by_id),
+        ):
+            async with session_maker() as session:
+                await get_by_id(session, 1)
+                cache_results.clear()
+                started = time.perf_counter()
+                for _ in range(calls):
+                    await get_by_id(session, 1)
+                elapsed = time.perf_counter() - started
+            print(
+                f"{name:<9} {elapsed / calls * 1e6:8.1f} us/call  "
+                f"cache: {dict(cache_results)}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.calls))
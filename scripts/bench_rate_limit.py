@@ -0,0 +1,93 @@
+"""
+Накладные расходы RateLimit на запрос: один и тот же эндпоинт без лимита
+и с лимитом, вызовы напрямую через ASGI без сети. Лимит заведомо не
+исчерпывается, поэтому сравниваются только проверка и заголовки.
+
+По умолчанию корзины локальные (без Redis); с --redis-url замеряется
+Lua-скрипт в Redis, включая сетевой round-trip.
+
+Запуск из корня проекта:
+    python -m scripts.bench_rate_limit --requests 5000
+    python -m scripts.bench_rate_limit --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Optional
+
+from fastapi import Depends, FastAPI
+from redis.asyncio import Redis
+
+from app.core.middlewares import DeferredHeadersMiddleware
+from app.core.rate_limit import RateLimit, RateLimiter
+from scripts.asgi import make_scope, receive_empty_body
+
+
+def build_app(limiter: RateLimiter) -> FastAPI:
+    application = FastAPI()
+    application.add_middleware(DeferredHeadersMiddleware)
+    limit = RateLimit("bench", per_minute=10**9, limiter=limiter)
+
+    @application.get("/plain")
+    async def plain() -> dict:
+        return {"ok": True}
+
+    @application.get("/limited", dependencies=[Depends(limit)])
+    async def limited() -> dict:
+        return {"ok": True}
+
+    return application
+
+
+async def measure(application: FastAPI, path: str, requests: int) -> list[float]:
+    status = None
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    timings = []
+    for index in range(requests):
+        # Разные IP - разные корзины, как при реальном трафике
+        scope = make_scope(path)
+        scope["client"] = (f"10.0.{index // 256 % 256}.{index % 256}", 10000)
+        started = time.perf_counter()
+        await application(scope, receive_empty_body, send)
+        timings.append(time.perf_counter() - started)
+        assert status == 200, status
+    return timings
+
+
+async def main(requests: int, redis_url: Optional[str]) -> None:
+    redis = Redis.from_url(redis_url) if redis_url else None
+    limiter = RateLimiter(redis_factory=(lambda: redis) if redis else None)
+    application = build_app(limiter)
+    try:
+        # Прогрев: импорт-время маршрутов, регистрация скрипта в Redis
+        await measure(application, "/limited", 100)
+        plain = await measure(application, "/plain", requests)
+        limited = await measure(application, "/limited", requests)
+    finally:
+        if redis is not None:
+            await redis.aclose()
+
+    backend = "redis" if redis_url else "local"
+    for name, timings in (("plain", plain), (f"limited ({backend})", limited)):
+        timings.sort()
+        print(
+            f"{name:<18} p50 {statistics.median(timings) * 1e6:8.1f} us"
+            f"   p99 {timings[int(len(timings) * 0.99)] * 1e6:8.1f} us"
+        )
+    overhead = statistics.median(limited) - statistics.median(plain)
+    print(f"{'overhead':<18} p50 {overhead * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.redis_url))
@@ -0,0 +1,99 @@
+"""
+Пропускная способность (строк/с) списка товаров: ORM-объекты + валидация
+через response_model против Core-строк + JSONBytesResponse.
+
+База по умолчанию - временный SQLite-файл (нужен aiosqlite). Для Postgres
+передайте URL одноразовой базы: таблицы будут созданы и заполнены.
+
+Запуск из корня проекта:
+    python -m scripts.bench_serialization --rows 10000 --runs 10
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.responses import JSONBytesResponse
+from app.models import Category, Product as ProductModel, User
+from app.repositories.products import ProductRepository
+from app.schemas.products import Product
+from scripts.asgi import make_scope, receive_empty_body
+from scripts.database import bench_engine
+
+
+async def seed(session_maker: async_sessionmaker[AsyncSession], rows: int) -> None:
+    async with session_maker() as session:
+        session.add(User(id=1, email="bench@example.com", hashed_password="-"))
+        session.add(Category(id=1, name="Bench"))
+        await session.flush()
+        await session.execute(
+            insert(ProductModel),
+            [
+                {
+                    "name": f"Bench product {index}",
+                    "description": "Synthetic product used by the benchmark",
+                    "price": 10 + index % 1000,
+                    "image_url": f"/static/images/{index}.jpg",
+                    "stock": index % 100,
+                    "is_active": True,
+                    "category_id": 1,
+                    "rating": 4.25,
+                    "seller_id": 1,
+                }
+                for index in range(1, rows + 1)
+            ],
+        )
+        await session.commit()
+
+
+def make_app(session_maker: async_sessionmaker[AsyncSession]) -> FastAPI:
+    bench_app = FastAPI()
+
+    @bench_app.get("/orm", response_model=list[Product])
+    async def orm_products():
+        async with session_maker() as session:
+            return await ProductRepository(db=session).get_all()
+
+    @bench_app.get("/rows", response_model=list[Product])
+    async def row_products():
+        async with session_maker() as session:
+            return JSONBytesResponse(await ProductRepository(db=session).get_all_rows())
+
+    return bench_app
+
+
+async def request(bench_app: FastAPI, path: str) -> bytes:
+    chunks = []
+
+    async def send(message):
+        chunks.append(message.get("body", b""))
+
+    await bench_app(make_scope(path), receive_empty_body, send)
+    return b"".join(chunks)
+
+
+async def main(database_url: str | None, rows: int, runs: int) -> None:
+    async with bench_engine(database_url) as engine:
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        await seed(session_maker, rows)
+        bench_app = make_app(session_maker)
+        assert await request(bench_app, "/orm") == await request(bench_app, "/rows")
+        for path in ("/orm", "/rows"):
+            started = time.perf_counter()
+            for _ in range(runs):
+                await request(bench_app, path)
+            elapsed = time.perf_counter() - started
+            print(f"{path:<6} {rows * runs / elapsed:12.0f} rows/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.rows, args.runs))
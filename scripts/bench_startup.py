@@ -0,0 +1,78 @@
+"""
+Время старта приложения: импорт app.main, запуск lifespan и первый запрос
+(/metrics, без обращения к БД). Каждый замер - отдельный процесс Python,
+поэтому в него входят и импорты зависимостей; печатаются медианы.
+
+Нужны переменные окружения приложения (.env), подключение к БД и Redis
+не требуется.
+
+Запуск из корня проекта:
+    python -m scripts.bench_startup --runs 10
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from scripts.asgi import make_scope, receive_empty_body
+
+# Приложение тоже пишет в stdout, поэтому результат помечается префиксом
+RESULT_PREFIX = "bench_startup: "
+
+
+async def first_request(started: float) -> dict[str, float]:
+    # pylint:disable=import-outside-toplevel
+    from app.main import app
+
+    imported = time.perf_counter()
+    status = None
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        await app(make_scope("/metrics"), receive_empty_body, send)
+        responded = time.perf_counter()
+    assert status == 200, status
+    return {
+        "import": imported - started,
+        "startup": ready - imported,
+        "first_request": responded - started,
+    }
+
+
+def measure_once() -> dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-m", "scripts.bench_startup", "--child"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    line = next(line for line in output.splitlines() if line.startswith(RESULT_PREFIX))
+    return json.loads(line.removeprefix(RESULT_PREFIX))
+
+
+def main(runs: int) -> None:
+    samples = [measure_once() for _ in range(runs)]
+    for key in ("import", "startup", "first_request"):
+        median = statistics.median(sample[key] for sample in samples)
+        print(f"{key:<14} {median * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        result = asyncio.run(first_request(time.perf_counter()))
+        print(RESULT_PREFIX + json.dumps(result), flush=True)
+    else:
+        main(args.runs)
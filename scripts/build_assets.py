@@ -0,0 +1,83 @@
+"""
+Сборка статических ассетов: копии с отпечатком содержимого в имени,
+предсжатые варианты .gz и .br и манифест для static_url().
+
+Запуск из корня проекта (настройки приложения не нужны):
+    python -m scripts.build_assets
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+try:
+    import brotli
+except ImportError:  # brotli - необязательная зависимость
+    brotli = None
+
+from app.core.static import DIST_DIRECTORY, MANIFEST_FILE, STATIC_DIRECTORY
+
+
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".svg", ".json", ".txt", ".html"}
+HASH_LENGTH = 12
+
+
+def iter_source_files(static_dir: str):
+    for root, dirs, files in os.walk(static_dir):
+        if os.path.abspath(root) == os.path.abspath(static_dir):
+            dirs[:] = [name for name in dirs if name != DIST_DIRECTORY]
+        for name in sorted(files):
+            yield os.path.relpath(os.path.join(root, name), static_dir)
+
+
+def fingerprint(path: str) -> str:
+    with open(path, "rb") as source:
+        return hashlib.sha256(source.read()).hexdigest()[:HASH_LENGTH]
+
+
+def write_compressed(path: str) -> list[str]:
+    with open(path, "rb") as source:
+        data = source.read()
+    written = [f"{path}.gz"]
+    with open(f"{path}.gz", "wb") as target:
+        # mtime=0 делает результат воспроизводимым между сборками
+        target.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        written.append(f"{path}.br")
+        with open(f"{path}.br", "wb") as target:
+            target.write(brotli.compress(data, quality=11))
+    return written
+
+
+def build(static_dir: str) -> dict[str, str]:
+    dist_dir = os.path.join(static_dir, DIST_DIRECTORY)
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    manifest = {}
+    for relative in iter_source_files(static_dir):
+        stem, ext = os.path.splitext(relative)
+        hashed = f"{stem}.{fingerprint(os.path.join(static_dir, relative))}{ext}"
+        target = os.path.join(dist_dir, hashed)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(os.path.join(static_dir, relative), target)
+        outputs = [target]
+        if ext.lower() in COMPRESSIBLE_EXTENSIONS:
+            outputs += write_compressed(target)
+        manifest[relative.replace(os.sep, "/")] = (
+            f"{DIST_DIRECTORY}/{hashed.replace(os.sep, '/')}"
+        )
+        print(" ".join(os.path.relpath(path, static_dir) for path in outputs))
+    with open(os.path.join(dist_dir, MANIFEST_FILE), "w", encoding="utf-8") as out:
+        json.dump(manifest, out, indent=2, sort_keys=True)
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--static-dir", default=STATIC_DIRECTORY)
+    args = parser.parse_args()
+    if brotli is None:
+        print("brotli is not installed: .br variants are skipped")
+    build(args.static_dir)
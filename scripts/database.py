@@ -0,0 +1,34 @@
+"""Одноразовая база для бенчмарков."""
+
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.database import Base
+
+
+@asynccontextmanager
+async def bench_engine(
+    database_url: str | None, **engine_kwargs
+) -> AsyncIterator[AsyncEngine]:
+    """
+    Движок с созданными таблицами. Без URL используется временный SQLite-файл
+    (нужен aiosqlite), который удаляется по выходе.
+    """
+    tmp_path = None
+    if database_url is None:
+        descriptor, tmp_path = tempfile.mkstemp(suffix=".db")
+        os.close(descriptor)
+        database_url = f"sqlite+aiosqlite:///{tmp_path}"
+    engine = create_async_engine(database_url, **engine_kwargs)
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        yield engine
+    finally:
+        await engine.dispose()
+        if tmp_path is not None:
+            os.remove(tmp_path)
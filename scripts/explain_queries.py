@@ -0,0 +1,289 @@
+"""
+Планы запросов репозиториев. Каждый сценарий вызывает метод репозитория,
+его SQL перехватывается вместе с параметрами и прогоняется через
+EXPLAIN (FORMAT JSON) на том же соединении. Печатаются узлы плана с
+использованными индексами; Seq Scan по таблице больше --large-table-rows
+строк считается проблемой, и скрипт завершается с кодом 1.
+
+Нужен PostgreSQL с применёнными миграциями и данными: на пустых таблицах
+планировщик выбирает Seq Scan независимо от индексов. Транзакция в конце
+откатывается, поэтому с --analyze можно смотреть и на боевую копию.
+
+Запуск из корня проекта:
+    python -m scripts.explain_queries
+    python -m scripts.explain_queries --analyze --only reviews.
+"""
+
+# ruff: noqa: E712
+# pylint:disable=unused-argument,too-many-arguments,too-many-positional-arguments
+# pylint:disable=not-callable,too-many-instance-attributes
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.models import Category, Product, Review, User
+from app.repositories.categories import CategoryRepository
+from app.repositories.pagination import KeysetPage
+from app.repositories.products import ProductRepository
+from app.repositories.review_stats import ReviewStatsRepository
+from app.repositories.reviews import REVIEW_SORT_COLUMNS, ReviewRepository
+from app.repositories.users import UserRepository
+from app.schemas.reviews import ReviewSort
+
+PAGE_SIZE = 20
+
+
+class Sample:
+    """Существующие в базе значения, с которыми вызываются запросы."""
+
+    def __init__(self, row: Any):
+        self.review_id = row.review_id
+        self.review_grade = row.review_grade
+        self.review_date = row.review_date
+        self.product_id = row.product_id
+        self.product_name = row.product_name
+        self.category_id = row.category_id
+        self.parent_id = row.parent_id
+        self.user_id = row.user_id
+        self.email = row.email
+
+    def review_page(self, sort: ReviewSort, after_review: bool = False) -> KeysetPage:
+        """
+        Первая страница или следующая: с after_review ключом курсора служит
+        выбранный отзыв, и в запрос попадает условие по ключу, как при
+        переходе по next_cursor.
+        """
+        columns = REVIEW_SORT_COLUMNS[sort]
+        after = None
+        if after_review:
+            key = {
+                "grade": self.review_grade,
+                "comment_date": self.review_date,
+                "id": self.review_id,
+            }
+            after = tuple(key[column.key] for column in columns)
+        return KeysetPage(sort.value, columns, PAGE_SIZE, after)
+
+
+# Отзыв самого популярного товара: на нём видно, читает ли план индекс
+SELECT_SAMPLE = (
+    select(
+        Review.id.label("review_id"),
+        Review.grade.label("review_grade"),
+        Review.comment_date.label("review_date"),
+        Review.product_id,
+        Product.name.label("product_name"),
+        Product.category_id,
+        func.coalesce(Category.parent_id, Category.id).label("parent_id"),
+        Review.user_id,
+        User.email,
+    )
+    .join(Product, Product.id == Review.product_id)
+    .join(Category, Category.id == Product.category_id)
+    .join(User, User.id == Review.user_id)
+    .where(Review.is_active == True)
+    # id разрывает ничьи: снимки планов содержат значения из выборки
+    .order_by(func.count().over(partition_by=Review.product_id).desc(), Review.id)
+    .limit(1)
+)
+
+# Чтение всей таблицы: Seq Scan здесь ожидаем
+FULL_SCAN_QUERIES = frozenset({"products.get_all_rows", "categories.get_all_rows"})
+
+Query = Callable[[AsyncSession, Sample], Awaitable[Any]]
+
+
+def review_repository(db: AsyncSession) -> ReviewRepository:
+    return ReviewRepository(db, ReviewStatsRepository(db))
+
+
+QUERIES: dict[str, Query] = {
+    "products.get_all_rows": lambda db, s: ProductRepository(db).get_all_rows(),
+    "products.get_rows_by_category": lambda db, s: ProductRepository(
+        db
+    ).get_rows_by_category(s.category_id),
+    "products.get_row_by_id": lambda db, s: ProductRepository(db).get_row_by_id(
+        s.product_id
+    ),
+    "products.get_rows_by_ids": lambda db, s: ProductRepository(db).get_rows_by_ids(
+        [s.product_id]
+    ),
+    "products.get_by_name": lambda db, s: ProductRepository(db).get_by_name(
+        s.product_name
+    ),
+    "categories.get_all_rows": lambda db, s: CategoryRepository(db).get_all_rows(),
+    "categories.get_row_by_id": lambda db, s: CategoryRepository(db).get_row_by_id(
+        s.category_id
+    ),
+    "categories.get_rows_by_ids": lambda db, s: CategoryRepository(db).get_rows_by_ids(
+        [s.category_id, s.parent_id]
+    ),
+    "categories.get_parent_id": lambda db, s: CategoryRepository(db).get_parent_id(
+        s.parent_id
+    ),
+    "users.get_by_id": lambda db, s: UserRepository(db).get_by_id(s.user_id),
+    "users.get_user_by_email": lambda db, s: UserRepository(db).get_user_by_email(
+        s.email
+    ),
+    "users.get_by_emails": lambda db, s: UserRepository(db).get_by_emails([s.email]),
+    "reviews.get_by_id": lambda db, s: review_repository(db).get_by_id(s.review_id),
+    "reviews.get_rows_by_ids": lambda db, s: review_repository(db).get_rows_by_ids(
+        [s.review_id]
+    ),
+    "reviews.page": lambda db, s: review_repository(db).get_rows_page(
+        s.review_page(ReviewSort.NEWEST)
+    ),
+    "reviews.page_by_product": lambda db, s: review_repository(db).get_rows_page(
+        s.review_page(ReviewSort.NEWEST), product_id=s.product_id
+    ),
+    "reviews.page_by_product_grade": lambda db, s: review_repository(db).get_rows_page(
+        s.review_page(ReviewSort.GRADE), product_id=s.product_id
+    ),
+    "reviews.page_by_user": lambda db, s: review_repository(db).get_rows_page(
+        s.review_page(ReviewSort.NEWEST), user_id=s.user_id
+    ),
+    "reviews.page_next": lambda db, s: review_repository(db).get_rows_page(
+        s.review_page(ReviewSort.NEWEST, after_review=True)
+    ),
+    "reviews.page_by_product_next": lambda db, s: review_repository(db).get_rows_page(
+        s.review_page(ReviewSort.NEWEST, after_review=True), product_id=s.product_id
+    ),
+    "reviews.page_by_product_grade_next": lambda db, s: review_repository(
+        db
+    ).get_rows_page(
+        s.review_page(ReviewSort.GRADE, after_review=True), product_id=s.product_id
+    ),
+    "reviews.page_by_user_next": lambda db, s: review_repository(db).get_rows_page(
+        s.review_page(ReviewSort.NEWEST, after_review=True), user_id=s.user_id
+    ),
+    "reviews.check_existing": lambda db, s: review_repository(db).check_existing(
+        s.user_id, s.product_id
+    ),
+    "review_stats.get_summary": lambda db, s: ReviewStatsRepository(db).get_summary(
+        s.product_id
+    ),
+}
+
+
+async def capture_statements(
+    connection: AsyncConnection, query: Query, sample: Sample
+) -> list[tuple[str, Any]]:
+    """SQL и параметры, которые метод репозитория отправил драйверу."""
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    sync_connection = connection.sync_connection
+    event.listen(sync_connection, "before_cursor_execute", on_execute)
+    try:
+        await query(AsyncSession(bind=connection), sample)
+    finally:
+        event.remove(sync_connection, "before_cursor_execute", on_execute)
+    return statements
+
+
+async def explain(
+    connection: AsyncConnection, statement: str, parameters: Any, analyze: bool
+) -> dict[str, Any]:
+    """Корневой узел плана из EXPLAIN (FORMAT JSON)."""
+    if isinstance(parameters, list):
+        # Позиционные параметры: список exec_driver_sql принял бы за executemany
+        parameters = tuple(parameters)
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN ({options}) {statement}", parameters
+    )
+    document = result.scalar_one()
+    if isinstance(document, str):
+        document = json.loads(document)
+    return document[0]["Plan"]
+
+
+def plan_nodes(plan: dict[str, Any], depth: int = 0) -> Iterator[tuple[int, dict]]:
+    yield depth, plan
+    for child in plan.get("Plans", ()):
+        yield from plan_nodes(child, depth + 1)
+
+
+def describe_node(node: dict[str, Any]) -> str:
+    text = node["Node Type"]
+    if "Index Name" in node:
+        text += f" using {node['Index Name']}"
+    if "Relation Name" in node:
+        text += f" on {node['Relation Name']}"
+    text += f"  (rows={node['Plan Rows']} cost={node['Total Cost']}"
+    if "Actual Rows" in node:
+        text += f" actual={node['Actual Rows']} time={node['Actual Total Time']}ms"
+    return text + ")"
+
+
+async def table_sizes(connection: AsyncConnection) -> dict[str, float]:
+    """Оценка числа строк таблиц по статистике (после ANALYZE)."""
+    result = await connection.exec_driver_sql(
+        "SELECT relname, reltuples FROM pg_class "
+        "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+    )
+    return dict(result.all())
+
+
+async def main(
+    database_url: str, analyze: bool, only: Optional[str], large_table_rows: int
+) -> int:
+    engine = create_async_engine(database_url)
+    problems = []
+    try:
+        async with engine.connect() as connection:
+            sizes = await table_sizes(connection)
+            row = (await connection.execute(SELECT_SAMPLE)).first()
+            if row is None:
+                print("no active reviews: seed the database first")
+                return 1
+            sample = Sample(row)
+            for name, query in QUERIES.items():
+                if only and not name.startswith(only):
+                    continue
+                print(name)
+                for statement, parameters in await capture_statements(
+                    connection, query, sample
+                ):
+                    plan = await explain(connection, statement, parameters, analyze)
+                    for depth, node in plan_nodes(plan):
+                        print(f"  {'  ' * depth}{describe_node(node)}")
+                        relation = node.get("Relation Name")
+                        if (
+                            name not in FULL_SCAN_QUERIES
+                            and node["Node Type"] == "Seq Scan"
+                            and sizes.get(relation, 0) >= large_table_rows
+                        ):
+                            problems.append(f"{name}: Seq Scan on {relation}")
+            await connection.rollback()
+    finally:
+        await engine.dispose()
+
+    for problem in problems:
+        print(f"WARNING {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument(
+        "--analyze", action="store_true", help="EXPLAIN ANALYZE: запросы выполняются"
+    )
+    parser.add_argument("--only", default=None, help="префикс имени запроса")
+    parser.add_argument("--large-table-rows", type=int, default=10_000)
+    args = parser.parse_args()
+    sys.exit(
+        asyncio.run(
+            main(args.database_url, args.analyze, args.only, args.large_table_rows)
+        )
+    )
@@ -0,0 +1,307 @@
+"""
+Нагрузочный тест API по сценариям пользователя. Воркеры (--concurrency)
+в цикле выбирают сценарий по весам --mix и выполняют его запросы через
+общий пул соединений httpx. Для каждого сценария печатаются RPS,
+p50/p95/p99 времени сценария и доли ошибок и ответов 429.
+
+Сценарии:
+    browse        дерево категорий и товары случайной листовой категории
+    search        выдача из 20 товаров по ID (полнотекстового поиска в API
+                  нет, поэтому ищущий клиент гидрирует найденные ID батчем)
+    product_page  карточка товара со сводкой отзывов и первая страница отзывов
+    login         вход случайного пользователя
+    review_write  отзыв продавца о случайном товаре
+    upload        загрузка небольшого PNG
+
+Рассчитан на данные scripts.seed_data (email и пароль пользователей,
+размеры таблиц). Лимиты запросов с одного IP быстро срабатывают на login
+и upload: для замера пропускной способности запустите стек с
+RATE_LIMIT_ENABLED=false, иначе 429 покажут работу лимитера.
+
+Запуск из корня проекта против docker-compose стека:
+    python -m scripts.load_test --concurrency 50 --duration 60
+    python -m scripts.load_test --mix browse=50,product_page=40,review_write=10
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+import httpx
+
+from scripts.seed_data import (
+    DEFAULT_PRODUCTS,
+    DEFAULT_USERS,
+    LOAD_TEST_PASSWORD,
+    SELLER_EVERY,
+    user_email,
+)
+
+DEFAULT_MIX = "browse=35,search=15,product_page=35,login=5,review_write=7,upload=3"
+# 1x1 прозрачный PNG
+PNG_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+class RateLimited(Exception):
+    pass
+
+
+class UnexpectedStatus(Exception):
+    pass
+
+
+def expect(response: httpx.Response, *statuses: int) -> httpx.Response:
+    """Проверяет статус ответа; без statuses ожидается 200."""
+    if response.status_code == 429:
+        raise RateLimited()
+    if response.status_code not in (statuses or (200,)):
+        raise UnexpectedStatus(
+            f"{response.request.method} {response.request.url.path} "
+            f"-> {response.status_code}"
+        )
+    return response
+
+
+class LoadTestContext:
+    """Общее для воркеров: клиент, генератор и данные, найденные при старте."""
+
+    def __init__(self, client: httpx.AsyncClient, products: int, users: int, seed: int):
+        self.client = client
+        self.products = products
+        self.users = users
+        self.rng = random.Random(seed)
+        self.leaf_categories: list[int] = []
+        self.seller_tokens: list[str] = []
+
+    def product_id(self) -> int:
+        # Четверть запросов - к небольшому «горячему» набору, как в витрине
+        if self.rng.random() < 0.25:
+            return self.rng.randint(1, max(1, self.products // 1000))
+        return self.rng.randint(1, self.products)
+
+    async def setup(self, sellers: int) -> None:
+        response = expect(await self.client.get("/categories/"))
+        categories = response.json()
+        parents = {category["parent_id"] for category in categories}
+        self.leaf_categories = [
+            category["id"] for category in categories if category["id"] not in parents
+        ]
+        for index in range(1, sellers + 1):
+            response = await self.client.post(
+                "/users/token",
+                data={
+                    "username": user_email(index * SELLER_EVERY),
+                    "password": LOAD_TEST_PASSWORD,
+                },
+            )
+            self.seller_tokens.append(expect(response).json()["access_token"])
+
+
+async def browse(ctx: LoadTestContext) -> None:
+    expect(await ctx.client.get("/categories/"))
+    category_id = ctx.rng.choice(ctx.leaf_categories)
+    expect(await ctx.client.get(f"/products/category/{category_id}"), 200, 404)
+
+
+async def search(ctx: LoadTestContext) -> None:
+    ids = [ctx.product_id() for _ in range(20)]
+    expect(await ctx.client.get("/products/batch", params={"ids": ids}))
+
+
+async def product_page(ctx: LoadTestContext) -> None:
+    product_id = ctx.product_id()
+    # Неактивные товары (около 3% в синтетике) отдают 404, это не ошибка
+    response = expect(
+        await ctx.client.get(
+            f"/products/{product_id}", params={"embed": "review_summary"}
+        ),
+        200,
+        404,
+    )
+    if response.status_code == 200:
+        expect(
+            await ctx.client.get(
+                f"/products/{product_id}/reviews", params={"limit": 20}
+            )
+        )
+
+
+async def login(ctx: LoadTestContext) -> None:
+    response = await ctx.client.post(
+        "/users/token",
+        data={
+            "username": user_email(ctx.rng.randint(1, ctx.users)),
+            "password": LOAD_TEST_PASSWORD,
+        },
+    )
+    expect(response)
+
+
+async def review_write(ctx: LoadTestContext) -> None:
+    token = ctx.rng.choice(ctx.seller_tokens)
+    response = await ctx.client.post(
+        "/reviews",
+        json={
+            "product_id": ctx.product_id(),
+            "comment": "Load test review",
+            "grade": ctx.rng.randint(1, 5),
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    # 409 - продавец уже оставил отзыв, 404 - товар неактивен
+    expect(response, 201, 404, 409)
+
+
+async def upload(ctx: LoadTestContext) -> None:
+    # Ограниченный набор имён, чтобы тест не заполнял диск
+    filename = f"load-test-{ctx.rng.randint(0, 99)}.png"
+    response = await ctx.client.post(
+        "/uploadfile_async_save",
+        files=[("files", (filename, PNG_BYTES, "image/png"))],
+    )
+    expect(response)
+
+
+SCENARIOS: dict[str, Callable[[LoadTestContext], Awaitable[None]]] = {
+    "browse": browse,
+    "search": search,
+    "product_page": product_page,
+    "login": login,
+    "review_write": review_write,
+    "upload": upload,
+}
+
+
+class ScenarioStats:
+    __slots__ = ("timings", "errors", "rate_limited", "error_reasons")
+
+    def __init__(self):
+        self.timings: list[float] = []
+        self.errors = 0
+        self.rate_limited = 0
+        self.error_reasons: Counter[str] = Counter()
+
+    def add(self, other: "ScenarioStats") -> None:
+        self.timings += other.timings
+        self.errors += other.errors
+        self.rate_limited += other.rate_limited
+        self.error_reasons += other.error_reasons
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"unknown scenario {name!r}: {', '.join(SCENARIOS)}")
+        weights[name] = float(weight or 1)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def percentile(sorted_timings: list[float], fraction: float) -> float:
+    index = min(len(sorted_timings) - 1, int(len(sorted_timings) * fraction))
+    return sorted_timings[index]
+
+
+async def worker(
+    ctx: LoadTestContext,
+    weights: dict[str, float],
+    stats: dict[str, ScenarioStats],
+    measure_from: float,
+    deadline: float,
+) -> None:
+    names, name_weights = list(weights), list(weights.values())
+    while time.monotonic() < deadline:
+        name = ctx.rng.choices(names, name_weights)[0]
+        started = time.monotonic()
+        outcome: Optional[str] = None
+        try:
+            await SCENARIOS[name](ctx)
+        except RateLimited:
+            outcome = "rate_limited"
+        except (UnexpectedStatus, httpx.HTTPError) as exc:
+            outcome = str(exc) or type(exc).__name__
+        # Сценарии прогрева не попадают в статистику
+        if started < measure_from:
+            continue
+        scenario = stats[name]
+        scenario.timings.append(time.monotonic() - started)
+        if outcome == "rate_limited":
+            scenario.rate_limited += 1
+        elif outcome is not None:
+            scenario.errors += 1
+            scenario.error_reasons[outcome] += 1
+
+
+def report(stats: dict[str, ScenarioStats], duration: float) -> None:
+    print(
+        f"{'scenario':<14}{'count':>8}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'p99 ms':>9}{'errors':>9}{'429':>8}"
+    )
+    total = ScenarioStats()
+    rows = [(name, scenario) for name, scenario in stats.items() if scenario.timings]
+    for _, scenario in rows:
+        total.add(scenario)
+    for name, scenario in [*rows, ("total", total)]:
+        timings = sorted(scenario.timings)
+        if not timings:
+            continue
+        count = len(timings)
+        print(
+            f"{name:<14}{count:>8}{count / duration:>9.1f}"
+            f"{percentile(timings, 0.50) * 1000:>9.1f}"
+            f"{percentile(timings, 0.95) * 1000:>9.1f}"
+            f"{percentile(timings, 0.99) * 1000:>9.1f}"
+            f"{scenario.errors / count:>9.2%}{scenario.rate_limited / count:>8.2%}"
+        )
+    for reason, count in total.error_reasons.most_common(5):
+        print(f"  {count:>6} x {reason}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    weights = parse_mix(args.mix)
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        ctx = LoadTestContext(client, args.products, args.users, args.seed)
+        await ctx.setup(args.sellers if "review_write" in weights else 0)
+        stats = {name: ScenarioStats() for name in weights}
+        measure_from = time.monotonic() + args.warmup
+        deadline = measure_from + args.duration
+        await asyncio.gather(
+            *(
+                worker(ctx, weights, stats, measure_from, deadline)
+                for _ in range(args.concurrency)
+            )
+        )
+    report(stats, args.duration)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="сценарий=вес,...")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="секунды")
+    parser.add_argument("--warmup", type=float, default=5.0, help="секунды")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--products", type=int, default=DEFAULT_PRODUCTS)
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument(
+        "--sellers", type=int, default=5, help="продавцов для review_write"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
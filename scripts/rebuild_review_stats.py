@@ -0,0 +1,28 @@
+"""
+Пересборка product_review_stats и рейтингов товаров из таблицы reviews.
+Нужна после ручных правок reviews в обход API или при подозрении на
+расхождение сводки; запись отзывов на время пересборки ждёт блокировку.
+
+Запуск из корня проекта:
+    python -m scripts.rebuild_review_stats
+"""
+
+import asyncio
+
+from app.core.database import database
+from app.repositories.review_stats import ReviewStatsRepository
+
+
+async def main() -> None:
+    database.connect()
+    try:
+        async with database.session_maker() as session:
+            products = await ReviewStatsRepository(session).rebuild()
+            await session.commit()
+    finally:
+        await database.dispose()
+    print(f"review stats rebuilt for {products} products")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
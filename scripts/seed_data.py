@@ -0,0 +1,307 @@
+"""
+Синтетические данные для нагрузочного тестирования: дерево категорий,
+пользователи, товары и отзывы загружаются бинарным COPY через asyncpg,
+без ORM и построчных INSERT. Миллионы строк грузятся за минуты.
+
+Данные детерминированы (--seed): email пользователя - user{id}@example.com,
+пароль у всех LOAD_TEST_PASSWORD, каждый SELLER_EVERY-й пользователь -
+продавец. На этом построены сценарии scripts.load_test.
+
+Схема должна быть создана миграциями (alembic upgrade head). Непустые
+таблицы не трогаются без --truncate.
+
+Запуск из корня проекта против docker-compose стека:
+    python -m scripts.seed_data --products 1000000 --users 200000 --reviews 3000000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from app.auth.security import hash_password
+from app.core.config import settings
+from app.repositories.review_stats import ReviewStatsRepository
+
+LOAD_TEST_PASSWORD = "load-test-password"
+SELLER_EVERY = 20
+BATCH_SIZE = 50_000
+DEFAULT_USERS = 100_000
+DEFAULT_PRODUCTS = 1_000_000
+DEFAULT_REVIEWS = 3_000_000
+TABLES = ("product_review_stats", "reviews", "products", "categories", "users")
+
+ADJECTIVES = (
+    "Compact",
+    "Classic",
+    "Smart",
+    "Wireless",
+    "Portable",
+    "Premium",
+    "Eco",
+    "Ultra",
+    "Vintage",
+    "Modern",
+    "Solid",
+    "Light",
+    "Pro",
+    "Mini",
+    "Heavy",
+)
+NOUNS = (
+    "Lamp",
+    "Chair",
+    "Phone",
+    "Kettle",
+    "Backpack",
+    "Monitor",
+    "Jacket",
+    "Speaker",
+    "Camera",
+    "Watch",
+    "Desk",
+    "Blender",
+    "Drill",
+    "Tent",
+    "Mug",
+)
+COMMENTS = (
+    "Works as described",
+    "Great value",
+    "Broke after a week",
+    "Arrived late but fine",
+    "Would buy again",
+    "Not what I expected",
+    "Excellent quality",
+    "Average",
+    "Perfect gift",
+    "Too expensive",
+)
+# Оценки смещены к высоким, как в реальных отзывах
+GRADE_WEIGHTS = (5, 7, 15, 33, 40)
+
+
+def user_email(user_id: int) -> str:
+    return f"user{user_id}@example.com"
+
+
+def is_seller(user_id: int) -> bool:
+    return user_id % SELLER_EVERY == 0
+
+
+def category_tree(roots: int, rng: random.Random) -> list[tuple]:
+    """Три уровня: корни, 3-10 подкатегорий у каждого, 0-8 листьев у них."""
+    rows = []
+
+    def add(parent_id, name) -> int:
+        category_id = len(rows) + 1
+        rows.append((category_id, f"{name} {category_id}", parent_id, True))
+        return category_id
+
+    for root in range(roots):
+        root_id = add(None, NOUNS[root % len(NOUNS)] + "s")
+        for _ in range(rng.randint(3, 10)):
+            child_id = add(root_id, rng.choice(ADJECTIVES))
+            for _ in range(rng.randint(0, 8)):
+                add(child_id, f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}")
+    return rows
+
+
+def leaf_ids(categories: list[tuple]) -> list[int]:
+    parents = {parent_id for _, _, parent_id, _ in categories}
+    return [row[0] for row in categories if row[0] not in parents]
+
+
+def users(count: int, password_hash: str) -> Iterator[tuple]:
+    # bcrypt на строку занял бы часы: у всех пользователей один хэш
+    for user_id in range(1, count + 1):
+        role = "seller" if is_seller(user_id) else "buyer"
+        yield user_id, user_email(user_id), password_hash, True, role
+
+
+def products(
+    count: int, leaves: list[int], sellers: int, rng: random.Random
+) -> Iterator[tuple]:
+    for product_id in range(1, count + 1):
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {product_id}"
+        yield (
+            product_id,
+            name,
+            f"Synthetic {name.lower()}",
+            round(rng.lognormvariate(3.5, 1.0), 2) + 0.01,
+            None,
+            rng.randint(0, 500),
+            rng.random() > 0.03,
+            rng.choice(leaves),
+            Decimal(0),
+            SELLER_EVERY * rng.randint(1, sellers),
+        )
+
+
+def reviews(
+    count: int, product_count: int, user_count: int, rng: random.Random
+) -> Iterator[tuple]:
+    """
+    Популярность товаров по Парето: немного товаров собирают большую часть
+    отзывов. Пара (пользователь, товар) не повторяется: пользователи
+    товара идут с шагом, взаимно простым с числом пользователей.
+    """
+    now = datetime.now()
+    per_product: dict[int, int] = {}
+    stride = 7919 if user_count % 7919 else 7907
+    for review_id in range(1, count + 1):
+        product_id = min(product_count, int(rng.paretovariate(1.2)))
+        product_id = (product_id * 2_654_435_761) % product_count + 1
+        seen = per_product.get(product_id, 0)
+        while seen >= user_count:
+            product_id = rng.randint(1, product_count)
+            seen = per_product.get(product_id, 0)
+        per_product[product_id] = seen + 1
+        user_id = (product_id + seen * stride) % user_count + 1
+        yield (
+            review_id,
+            user_id,
+            product_id,
+            rng.choice(COMMENTS),
+            now - timedelta(seconds=rng.randint(0, 730 * 24 * 3600)),
+            rng.choices(range(1, 6), GRADE_WEIGHTS)[0],
+            rng.random() > 0.02,
+        )
+
+
+def batches(rows: Iterator[tuple], size: int = BATCH_SIZE) -> Iterator[list[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def copy_rows(
+    connection: AsyncConnection, table: str, columns: list[str], rows: Iterator[tuple]
+) -> int:
+    """COPY пачками: память ограничена размером пачки, а не таблицы."""
+    raw = await connection.get_raw_connection()
+    driver = raw.driver_connection
+    started = time.perf_counter()
+    total = 0
+    for batch in batches(rows):
+        await driver.copy_records_to_table(table, records=batch, columns=columns)
+        total += len(batch)
+    print(f"{table:<12} {total:>10} rows  {time.perf_counter() - started:7.1f}s")
+    return total
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    engine = create_async_engine(args.database_url)
+    try:
+        async with engine.begin() as connection:
+            counts = await connection.execute(
+                text(
+                    "SELECT (SELECT count(*) FROM users), (SELECT count(*) FROM products)"
+                )
+            )
+            if any(counts.one()) and not args.truncate:
+                raise SystemExit(
+                    "tables are not empty: pass --truncate to replace data"
+                )
+            if args.truncate:
+                await connection.execute(
+                    text(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+                )
+
+            categories = category_tree(args.category_roots, rng)
+            await copy_rows(
+                connection,
+                "categories",
+                ["id", "name", "parent_id", "is_active"],
+                iter(categories),
+            )
+            await copy_rows(
+                connection,
+                "users",
+                ["id", "email", "hashed_password", "is_active", "role"],
+                users(args.users, hash_password(LOAD_TEST_PASSWORD)),
+            )
+            await copy_rows(
+                connection,
+                "products",
+                [
+                    "id",
+                    "name",
+                    "description",
+                    "price",
+                    "image_url",
+                    "stock",
+                    "is_active",
+                    "category_id",
+                    "rating",
+                    "seller_id",
+                ],
+                products(
+                    args.products,
+                    leaf_ids(categories),
+                    args.users // SELLER_EVERY,
+                    rng,
+                ),
+            )
+            await copy_rows(
+                connection,
+                "reviews",
+                [
+                    "id",
+                    "user_id",
+                    "product_id",
+                    "comment",
+                    "comment_date",
+                    "grade",
+                    "is_active",
+                ],
+                reviews(args.reviews, args.products, args.users, rng),
+            )
+            # COPY с явными id не двигает последовательности
+            for table in ("categories", "users", "products", "reviews"):
+                await connection.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                        f"(SELECT max(id) FROM {table}))"
+                    )
+                )
+            started = time.perf_counter()
+            await ReviewStatsRepository(AsyncSession(bind=connection)).rebuild()
+            print(f"review stats rebuilt  {time.perf_counter() - started:7.1f}s")
+        async with engine.connect() as connection:
+            await connection.execution_options(isolation_level="AUTOCOMMIT")
+            await connection.execute(text("VACUUM ANALYZE"))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--category-roots", type=int, default=20)
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument("--products", type=int, default=DEFAULT_PRODUCTS)
+    parser.add_argument("--reviews", type=int, default=DEFAULT_REVIEWS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true")
+    arguments = parser.parse_args()
+    if arguments.users < SELLER_EVERY:
+        # Продавец - каждый SELLER_EVERY-й: без него товарам некого назначить
+        parser.error(f"--users must be at least {SELLER_EVERY}")
+    if arguments.reviews > arguments.products * arguments.users:
+        parser.error("more reviews than (user, product) pairs")
+    asyncio.run(main(arguments))